@@ -1,9 +1,27 @@
 from fastapi import FastAPI, Request
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import importlib.util
+import os
 import subprocess
+import threading
 import time
 
 app = FastAPI()
 
+# In-process mode keeps a warm VoiceConverter per worker thread instead of
+# spawning a fresh rvc.py (and reloading torch, HuBERT and the voice model)
+# for every inference request.
+in_process = os.environ.get("RVC_API_IN_PROCESS", "False") == "True"
+executor = (
+    ThreadPoolExecutor(
+        max_workers=max(1, int(os.environ.get("RVC_API_WORKERS", "1"))),
+        thread_name_prefix="rvc-infer",
+    )
+    if in_process
+    else None
+)
+
 
 # Helper function to execute commands
 def execute_command(command):
@@ -14,25 +32,101 @@ def execute_command(command):
         return {"error": str(e)}
 
 
+# The rvc.py command line, loaded once under its own name since "rvc" is the package
+cli = None
+cli_lock = threading.Lock()
+
+
+def load_cli():
+    global cli
+    with cli_lock:
+        if cli is None:
+            spec = importlib.util.spec_from_file_location(
+                "rvc_cli",
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), "rvc.py"),
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            cli = module
+        return cli
+
+
+# Helper function to run an rvc.py mode inside the resident worker pool
+def execute_in_process(mode, arguments):
+    try:
+        rvc_cli = load_cli()
+        scripts = {
+            "infer": rvc_cli.run_infer_script,
+            "batch_infer": rvc_cli.run_batch_infer_script,
+            "tts": rvc_cli.run_tts_script,
+        }
+        args = rvc_cli.parse_arguments([mode] + arguments)
+        params = {key: str(value) for key, value in vars(args).items()}
+        del params["mode"]
+        result = scripts[mode](**params)
+        return {"output": result, "error": ""}
+    except SystemExit:
+        return {"error": f"Invalid arguments for {mode}: {arguments}"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def dispatch(mode, request):
+    arguments = await request.json()
+    if executor is None:
+        return execute_command(["python", "rvc.py", mode] + arguments)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, execute_in_process, mode, arguments)
+
+
 # Infer
 @app.post("/infer")
 async def infer(request: Request):
-    command = ["python", "rvc.py", "infer"] + await request.json()
-    return execute_command(command)
+    return await dispatch("infer", request)
 
 
 # Batch Infer
 @app.post("/batch_infer")
 async def batch_infer(request: Request):
-    command = ["python", "rvc.py", "batch_infer"] + await request.json()
-    return execute_command(command)
+    return await dispatch("batch_infer", request)
 
 
 # TTS
 @app.post("/tts")
 async def tts(request: Request):
-    command = ["python", "rvc.py", "tts"] + await request.json()
-    return execute_command(command)
+    return await dispatch("tts", request)
+
+
+# Model cache statistics of the in-process workers
+@app.get("/model_cache")
+async def model_cache_stats():
+    from rvc.infer.model_cache import model_cache
+
+    return model_cache.stats()
+
+
+# Index cache statistics of the in-process workers
+@app.get("/index_cache")
+async def index_cache_stats():
+    from rvc.infer.index_cache import index_cache
+
+    return index_cache.stats()
+
+
+# Feature cache statistics of the in-process workers
+@app.get("/feature_cache")
+async def feature_cache_stats():
+    from rvc.infer.feature_cache import feature_cache
+
+    return feature_cache.stats()
+
+
+# F0 cache statistics of the in-process workers
+@app.get("/f0_cache")
+async def f0_cache_stats():
+    from rvc.infer.f0_cache import f0_cache
+
+    return f0_cache.stats()
 
 
 # Preprocess
@@ -1,13 +1,15 @@
 import os
 import sys
 import json
+import hashlib
 import argparse
+import threading
 import subprocess
 
 now_dir = os.getcwd()
 sys.path.append(now_dir)
 
-from rvc.configs.config import Config
+from rvc.configs.config import COMPILE_MODES, Config
 
 from rvc.lib.tools.prerequisites_download import prequisites_download_pipeline
 from rvc.train.extract.preparing_files import generate_config, generate_filelist
@@ -18,8 +20,27 @@ from rvc.train.process.model_information import model_information
 from rvc.train.process.extract_small_model import extract_small_model
 
 from rvc.infer.infer import VoiceConverter
+from rvc.infer.retrieval import RETRIEVAL_ENGINES, default_retrieval
+from rvc.infer.precision import CPU_PRECISIONS
+from rvc.infer.model_cache import model_cache
+from rvc.infer.index_cache import index_cache
+from rvc.infer.f0_cache import f0_cache
+from rvc.lib.utils import audio_cache
+
+# One resident VoiceConverter per thread, so worker pools (see api.py) keep
+# their models warm without sharing mutable converter state.
+converters = threading.local()
+
+
+def get_voice_converter():
+    if not hasattr(converters, "voice_converter"):
+        converters.voice_converter = VoiceConverter()
+    return converters.voice_converter
+
+
+def infer_pipeline(*args, **kwargs):
+    return get_voice_converter().infer_pipeline(*args, **kwargs)
 
-infer_pipeline = VoiceConverter().infer_pipeline
 
 from rvc.lib.tools.analyzer import analyze_audio
 
@@ -40,7 +61,33 @@ locales = list({voice["Locale"] for voice in voices_data})
 python = sys.executable
 
 
+# Cache sizes set by the RVC_*_CACHE_SIZE environment variables, the defaults of the
+# cache size options
+default_cache_sizes = {
+    "model": model_cache.max_models,
+    "index": index_cache.max_indexes,
+    "f0": f0_cache.max_entries,
+    "audio": audio_cache.max_entries,
+}
+
+
 # Infer
+def resize_caches(model_cache_size, index_cache_size, f0_cache_size, audio_cache_size):
+    model_cache.resize(int(model_cache_size))
+    index_cache.resize(int(index_cache_size))
+    f0_cache.resize(int(f0_cache_size))
+    audio_cache.resize(int(audio_cache_size))
+
+
+def retrieval_settings(index_engine, index_k, index_nprobe, index_ef_search):
+    return {
+        "engine": str(index_engine),
+        "k": int(index_k),
+        "nprobe": int(index_nprobe),
+        "ef_search": int(index_ef_search),
+    }
+
+
 def run_infer_script(
     f0_up_key,
     filter_radius,
@@ -62,11 +109,27 @@ def run_infer_script(
     embedder_model_custom,
     upscale_audio,
     f0_file,
+    index_engine=default_retrieval["engine"],
+    index_k=default_retrieval["k"],
+    index_nprobe=default_retrieval["nprobe"],
+    index_ef_search=default_retrieval["ef_search"],
+    f0_autotune_strength="1.0",
+    f0_autotune_smoothing="0",
+    cpu_precision=None,
+    inference_backend=None,
+    compile_mode=None,
+    model_cache_size=default_cache_sizes["model"],
+    index_cache_size=default_cache_sizes["index"],
+    f0_cache_size=default_cache_sizes["f0"],
+    audio_cache_size=default_cache_sizes["audio"],
 ):
     f0_autotune = "True" if str(f0_autotune) == "True" else "False"
     clean_audio = "True" if str(clean_audio) == "True" else "False"
     upscale_audio = "True" if str(upscale_audio) == "True" else "False"
-    infer_pipeline(
+    retrieval = retrieval_settings(index_engine, index_k, index_nprobe, index_ef_search)
+    get_voice_converter().configure(cpu_precision, inference_backend, compile_mode)
+    resize_caches(model_cache_size, index_cache_size, f0_cache_size, audio_cache_size)
+    converted_path = infer_pipeline(
         f0_up_key,
         filter_radius,
         index_rate,
@@ -87,10 +150,13 @@ def run_infer_script(
         embedder_model_custom,
         upscale_audio,
         f0_file,
+        retrieval,
+        float(f0_autotune_strength),
+        int(f0_autotune_smoothing),
     )
-    return f"File {input_path} inferred successfully.", output_path.replace(
-        ".wav", f".{export_format.lower()}"
-    )
+    if converted_path is None:
+        raise RuntimeError(f"Voice conversion of {input_path} failed.")
+    return f"File {input_path} inferred successfully.", converted_path
 
 
 # Batch infer
@@ -115,15 +181,33 @@ def run_batch_infer_script(
     embedder_model_custom,
     upscale_audio,
     f0_file,
+    batch_size="1",
+    f0_autotune_strength="1.0",
+    f0_autotune_smoothing="0",
+    index_engine=default_retrieval["engine"],
+    index_k=default_retrieval["k"],
+    index_nprobe=default_retrieval["nprobe"],
+    index_ef_search=default_retrieval["ef_search"],
+    cpu_precision=None,
+    inference_backend=None,
+    compile_mode=None,
+    model_cache_size=default_cache_sizes["model"],
+    index_cache_size=default_cache_sizes["index"],
+    f0_cache_size=default_cache_sizes["f0"],
+    audio_cache_size=default_cache_sizes["audio"],
 ):
     f0_autotune = "True" if str(f0_autotune) == "True" else "False"
     clean_audio = "True" if str(clean_audio) == "True" else "False"
     upscale_audio = "True" if str(upscale_audio) == "True" else "False"
+    retrieval = retrieval_settings(index_engine, index_k, index_nprobe, index_ef_search)
+    get_voice_converter().configure(cpu_precision, inference_backend, compile_mode)
+    resize_caches(model_cache_size, index_cache_size, f0_cache_size, audio_cache_size)
     audio_files = [
         f for f in os.listdir(input_folder) if f.endswith((".mp3", ".wav", ".flac"))
     ]
     print(f"Detected {len(audio_files)} audio files for inference.")
 
+    audio_pairs = []
     for audio_file in audio_files:
         if "_output" in audio_file:
             pass
@@ -134,31 +218,93 @@ def run_batch_infer_script(
                 output_folder,
                 f"{output_file_name}_output{os.path.splitext(audio_file)[1]}",
             )
-            print(f"Inferring {input_path}...")
-
-            infer_pipeline(
-                f0_up_key,
-                filter_radius,
-                index_rate,
-                rms_mix_rate,
-                protect,
-                hop_length,
-                f0_method,
-                input_path,
-                output_path,
-                pth_path,
-                index_path,
-                split_audio,
-                f0_autotune,
-                clean_audio,
-                clean_strength,
-                export_format,
-                embedder_model,
-                embedder_model_custom,
-                upscale_audio,
-                f0_file,
-            )
-
+            audio_pairs.append((input_path, output_path))
+
+    if split_audio != "True" and upscale_audio != "True":
+        # Settings digest, so a resumed run only skips files converted with the same settings.
+        settings = [
+            f0_up_key,
+            filter_radius,
+            index_rate,
+            rms_mix_rate,
+            protect,
+            hop_length,
+            f0_method,
+            pth_path,
+            index_path,
+            f0_autotune,
+            f0_autotune_strength,
+            f0_autotune_smoothing,
+            clean_audio,
+            clean_strength,
+            export_format,
+            embedder_model,
+            embedder_model_custom,
+            sorted(retrieval.items()),
+        ]
+        digest = hashlib.md5("|".join(map(str, settings)).encode()).hexdigest()[:8]
+        failed = get_voice_converter().infer_batch_pipeline(
+            f0_up_key,
+            filter_radius,
+            index_rate,
+            rms_mix_rate,
+            protect,
+            hop_length,
+            f0_method,
+            audio_pairs,
+            pth_path,
+            index_path,
+            f0_autotune,
+            clean_audio,
+            clean_strength,
+            export_format,
+            embedder_model,
+            embedder_model_custom,
+            f0_file,
+            progress_path=os.path.join(output_folder, f".batch_progress_{digest}"),
+            batch_size=int(batch_size),
+            f0_autotune_strength=float(f0_autotune_strength),
+            f0_autotune_smoothing=int(f0_autotune_smoothing),
+            retrieval=retrieval,
+        )
+        if failed:
+            raise RuntimeError(f"Voice conversion failed for {failed}.")
+        return f"Files from {input_folder} inferred successfully."
+
+    failed = []
+    for input_path, output_path in audio_pairs:
+        print(f"Inferring {input_path}...")
+
+        converted_path = infer_pipeline(
+            f0_up_key,
+            filter_radius,
+            index_rate,
+            rms_mix_rate,
+            protect,
+            hop_length,
+            f0_method,
+            input_path,
+            output_path,
+            pth_path,
+            index_path,
+            split_audio,
+            f0_autotune,
+            clean_audio,
+            clean_strength,
+            export_format,
+            embedder_model,
+            embedder_model_custom,
+            upscale_audio,
+            f0_file,
+            retrieval,
+            f0_autotune_strength=float(f0_autotune_strength),
+            f0_autotune_smoothing=int(f0_autotune_smoothing),
+        )
+        if converted_path is None:
+            failed.append(input_path)
+
+    if failed:
+        raise RuntimeError(f"Voice conversion failed for {failed}.")
     return f"Files from {input_folder} inferred successfully."
 
 
@@ -187,10 +333,26 @@ def run_tts_script(
     embedder_model_custom,
     upscale_audio,
     f0_file,
+    f0_autotune_strength="1.0",
+    f0_autotune_smoothing="0",
+    index_engine=default_retrieval["engine"],
+    index_k=default_retrieval["k"],
+    index_nprobe=default_retrieval["nprobe"],
+    index_ef_search=default_retrieval["ef_search"],
+    cpu_precision=None,
+    inference_backend=None,
+    compile_mode=None,
+    model_cache_size=default_cache_sizes["model"],
+    index_cache_size=default_cache_sizes["index"],
+    f0_cache_size=default_cache_sizes["f0"],
+    audio_cache_size=default_cache_sizes["audio"],
 ):
     f0_autotune = "True" if str(f0_autotune) == "True" else "False"
     clean_audio = "True" if str(clean_audio) == "True" else "False"
     upscale_audio = "True" if str(upscale_audio) == "True" else "False"
+    retrieval = retrieval_settings(index_engine, index_k, index_nprobe, index_ef_search)
+    get_voice_converter().configure(cpu_precision, inference_backend, compile_mode)
+    resize_caches(model_cache_size, index_cache_size, f0_cache_size, audio_cache_size)
     tts_script_path = os.path.join("rvc", "lib", "tools", "tts.py")
 
     if os.path.exists(output_tts_path):
@@ -206,7 +368,7 @@ def run_tts_script(
     ]
     subprocess.run(command_tts)
 
-    infer_pipeline(
+    converted_path = infer_pipeline(
         f0_up_key,
         filter_radius,
         index_rate,
@@ -227,11 +389,13 @@ def run_tts_script(
         embedder_model_custom,
         upscale_audio,
         f0_file,
+        retrieval,
+        f0_autotune_strength=float(f0_autotune_strength),
+        f0_autotune_smoothing=int(f0_autotune_smoothing),
     )
-
-    return f"Text {tts_text} synthesized successfully.", output_rvc_path.replace(
-        ".wav", f".{export_format.lower()}"
-    )
+    if converted_path is None:
+        raise RuntimeError(f"Voice conversion of {output_tts_path} failed.")
+    return f"Text {tts_text} synthesized successfully.", converted_path
 
 
 # Preprocess
@@ -436,6 +600,23 @@ def run_model_information_script(pth_path):
     print(model_information(pth_path))
 
 
+# ONNX export
+def run_export_onnx_script(pth_path, embedder_model, embedder_model_custom=None):
+    import torch
+    from rvc.lib.utils import load_embedding
+    from rvc.infer.onnx_backend import export_synthesizer, export_embedder
+
+    onnx_path = os.path.splitext(pth_path)[0] + ".onnx"
+    export_synthesizer(pth_path, onnx_path)
+    version = torch.load(pth_path, map_location="cpu").get("version", "v1")
+    output_layer = 9 if version == "v1" else 12
+    embedder_path = f"{VoiceConverter.embedder_onnx_base(embedder_model, embedder_model_custom)}_layer{output_layer}.onnx"
+    models, _, _ = load_embedding(embedder_model, embedder_model_custom)
+    export_embedder(models[0], output_layer, embedder_path)
+    print(f"Model exported to {onnx_path} and {embedder_path}")
+    return onnx_path, embedder_path
+
+
 # Model blender
 def run_model_blender_script(model_name, pth_path_1, pth_path_2, ratio):
     message, model_blended = model_blender(model_name, pth_path_1, pth_path_2, ratio)
@@ -470,7 +651,12 @@ def run_audio_analyzer_script(input_path, save_plot_path="logs/audio_analysis.pn
 
 
 # API
-def run_api_script(ip, port):
+def run_api_script(ip, port, in_process="False", workers="1"):
+    env = dict(
+        os.environ,
+        RVC_API_IN_PROCESS=str(in_process),
+        RVC_API_WORKERS=str(workers),
+    )
     command = [
         "env/Scripts/uvicorn.exe" if os.name == "nt" else "uvicorn",
         "api:app",
@@ -479,11 +665,94 @@ def run_api_script(ip, port):
         "--port",
         port,
     ]
-    subprocess.run(command)
+    subprocess.run(command, env=env)
+
+
+# Retrieval options shared by the infer, batch_infer and tts modes
+def add_retrieval_arguments(parser):
+    parser.add_argument(
+        "--index_engine",
+        type=str,
+        help="Retrieval engine for the index (auto searches small indexes exactly)",
+        choices=RETRIEVAL_ENGINES,
+        default=default_retrieval["engine"],
+    )
+    parser.add_argument(
+        "--index_k",
+        type=int,
+        help="Number of retrieved neighbours blended per frame",
+        default=default_retrieval["k"],
+    )
+    parser.add_argument(
+        "--index_nprobe",
+        type=int,
+        help="Inverted lists searched by IVF indexes",
+        default=default_retrieval["nprobe"],
+    )
+    parser.add_argument(
+        "--index_ef_search",
+        type=int,
+        help="Candidate list size of HNSW indexes",
+        default=default_retrieval["ef_search"],
+    )
+
+
+# Inference options shared by the infer, batch_infer and tts modes, the RVC_* environment
+# variables set their defaults
+def add_inference_arguments(parser):
+    parser.add_argument(
+        "--cpu_precision",
+        type=str,
+        help="Precision of CPU inference (int8 quantizes, bf16 needs native CPU support)",
+        choices=CPU_PRECISIONS,
+        default=config.cpu_precision,
+    )
+    parser.add_argument(
+        "--inference_backend",
+        type=str,
+        help="Backend running the embedder and synthesizer",
+        choices=["torch", "onnx"],
+        default=config.backend,
+    )
+    parser.add_argument(
+        "--compile_mode",
+        type=str,
+        help="Execution mode of the synthesizer with the torch backend",
+        choices=COMPILE_MODES,
+        default=config.compile_mode,
+    )
+
+
+# Cache sizes shared by the infer, batch_infer and tts modes
+def add_cache_arguments(parser):
+    parser.add_argument(
+        "--model_cache_size",
+        type=int,
+        help="Number of voice models kept loaded between conversions",
+        default=default_cache_sizes["model"],
+    )
+    parser.add_argument(
+        "--index_cache_size",
+        type=int,
+        help="Number of indexes kept loaded between conversions",
+        default=default_cache_sizes["index"],
+    )
+    parser.add_argument(
+        "--f0_cache_size",
+        type=int,
+        help="Number of F0 contours kept in memory (0 disables the memo)",
+        default=default_cache_sizes["f0"],
+    )
+    parser.add_argument(
+        "--audio_cache_size",
+        type=int,
+        help="Number of decoded input files kept in memory (0 disables the cache)",
+        default=default_cache_sizes["audio"],
+    )
 
 
 # Parse arguments
-def parse_arguments():
+def parse_arguments(argv=None):
     parser = argparse.ArgumentParser(
         description="Run the main.py script with specific parameters."
     )
@@ -576,6 +845,18 @@ def parse_arguments():
         choices=["True", "False"],
         default="False",
     )
+    infer_parser.add_argument(
+        "--f0_autotune_strength",
+        type=float,
+        help="Fraction of the autotune correction applied (below 1 only moves part of the way to the note)",
+        default=1.0,
+    )
+    infer_parser.add_argument(
+        "--f0_autotune_smoothing",
+        type=int,
+        help="Frames the autotune correction is averaged over, for continuous correction (0 snaps every frame)",
+        default=0,
+    )
     infer_parser.add_argument(
         "--clean_audio",
         type=str,
@@ -628,6 +909,9 @@ def parse_arguments():
         help="Path to the f0 file",
         default=None,
     )
+    add_retrieval_arguments(infer_parser)
+    add_inference_arguments(infer_parser)
+    add_cache_arguments(infer_parser)
 
     # Parser for 'batch_infer' mode
     batch_infer_parser = subparsers.add_parser(
@@ -718,6 +1002,21 @@ def parse_arguments():
         choices=["True", "False"],
         default="False",
     )
+    batch_infer_parser.add_argument(
+        "--f0_autotune_strength",
+        type=float,
+        help="Fraction of the autotune correction applied (below 1 only moves part of the way to the note)",
+        default=1.0,
+    )
+    batch_infer_parser.add_argument(
+        "--f0_autotune_smoothing",
+        type=int,
+        help="Frames the autotune correction is averaged over, for continuous correction (0 snaps every frame)",
+        default=0,
+    )
+    add_retrieval_arguments(batch_infer_parser)
+    add_inference_arguments(batch_infer_parser)
+    add_cache_arguments(batch_infer_parser)
     batch_infer_parser.add_argument(
         "--clean_audio",
         type=str,
@@ -770,6 +1069,12 @@ def parse_arguments():
         help="Path to the f0 file",
         default=None,
     )
+    batch_infer_parser.add_argument(
+        "--batch_size",
+        type=str,
+        help="Number of segments converted together across files",
+        default="1",
+    )
 
     # Parser for 'tts' mode
     tts_parser = subparsers.add_parser("tts", help="Run TTS")
@@ -874,6 +1179,21 @@ def parse_arguments():
         choices=["True", "False"],
         default="False",
     )
+    tts_parser.add_argument(
+        "--f0_autotune_strength",
+        type=float,
+        help="Fraction of the autotune correction applied (below 1 only moves part of the way to the note)",
+        default=1.0,
+    )
+    tts_parser.add_argument(
+        "--f0_autotune_smoothing",
+        type=int,
+        help="Frames the autotune correction is averaged over, for continuous correction (0 snaps every frame)",
+        default=0,
+    )
+    add_retrieval_arguments(tts_parser)
+    add_inference_arguments(tts_parser)
+    add_cache_arguments(tts_parser)
     tts_parser.add_argument(
         "--clean_audio",
         type=str,
@@ -1215,6 +1535,34 @@ def parse_arguments():
         help="Path to the .pth file",
     )
 
+    # Parser for 'export_onnx' mode
+    export_onnx_parser = subparsers.add_parser(
+        "export_onnx", help="Export a model and its embedder to ONNX"
+    )
+    export_onnx_parser.add_argument(
+        "--pth_path",
+        type=str,
+        help="Path to the .pth file",
+    )
+    export_onnx_parser.add_argument(
+        "--embedder_model",
+        type=str,
+        help="Embedder model",
+        choices=[
+            "contentvec",
+            "japanese-hubert-base",
+            "chinese-hubert-large",
+            "custom",
+        ],
+        default="contentvec",
+    )
+    export_onnx_parser.add_argument(
+        "--embedder_model_custom",
+        type=str,
+        help="Custom Embedder model",
+        default=None,
+    )
+
     # Parser for 'model_blender' mode
     model_blender_parser = subparsers.add_parser(
         "model_blender", help="Fuse two models"
@@ -1300,8 +1648,21 @@ def parse_arguments():
         "--host", type=str, help="Host address", default="127.0.0.1"
     )
     api_parser.add_argument("--port", type=str, help="Port", default="8000")
+    api_parser.add_argument(
+        "--in_process",
+        type=str,
+        help="Serve infer, batch_infer and tts from resident models instead of spawning rvc.py per request",
+        choices=["True", "False"],
+        default="False",
+    )
+    api_parser.add_argument(
+        "--workers",
+        type=str,
+        help="Number of in-process inference workers",
+        default="1",
+    )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def main():
@@ -1334,6 +1695,19 @@ def main():
                 str(args.embedder_model_custom),
                 str(args.upscale_audio),
                 str(args.f0_file),
+                str(args.index_engine),
+                args.index_k,
+                args.index_nprobe,
+                args.index_ef_search,
+                args.f0_autotune_strength,
+                args.f0_autotune_smoothing,
+                str(args.cpu_precision),
+                str(args.inference_backend),
+                str(args.compile_mode),
+                args.model_cache_size,
+                args.index_cache_size,
+                args.f0_cache_size,
+                args.audio_cache_size,
             )
         elif args.mode == "batch_infer":
             run_batch_infer_script(
@@ -1357,6 +1731,20 @@ def main():
                 str(args.embedder_model_custom),
                 str(args.upscale_audio),
                 str(args.f0_file),
+                str(args.batch_size),
+                args.f0_autotune_strength,
+                args.f0_autotune_smoothing,
+                str(args.index_engine),
+                args.index_k,
+                args.index_nprobe,
+                args.index_ef_search,
+                str(args.cpu_precision),
+                str(args.inference_backend),
+                str(args.compile_mode),
+                args.model_cache_size,
+                args.index_cache_size,
+                args.f0_cache_size,
+                args.audio_cache_size,
             )
         elif args.mode == "tts":
             run_tts_script(
@@ -1383,6 +1771,19 @@ def main():
                 str(args.embedder_model_custom),
                 str(args.upscale_audio),
                 str(args.f0_file),
+                args.f0_autotune_strength,
+                args.f0_autotune_smoothing,
+                str(args.index_engine),
+                args.index_k,
+                args.index_nprobe,
+                args.index_ef_search,
+                str(args.cpu_precision),
+                str(args.inference_backend),
+                str(args.compile_mode),
+                args.model_cache_size,
+                args.index_cache_size,
+                args.f0_cache_size,
+                args.audio_cache_size,
             )
         elif args.mode == "preprocess":
             run_preprocess_script(
@@ -1443,6 +1844,12 @@ def main():
             run_model_information_script(
                 str(args.pth_path),
             )
+        elif args.mode == "export_onnx":
+            run_export_onnx_script(
+                str(args.pth_path),
+                str(args.embedder_model),
+                args.embedder_model_custom,
+            )
         elif args.mode == "model_blender":
             run_model_blender_script(
                 str(args.model_name),
@@ -1471,6 +1878,8 @@ def main():
             run_api_script(
                 str(args.host),
                 str(args.port),
+                str(args.in_process),
+                str(args.workers),
             )
     except Exception as error:
         print(f"Error: {error}")
@@ -2,6 +2,7 @@ import torch
 import json
 import os
 
+from rvc.infer.precision import resolve_cpu_precision
 
 version_config_paths = [
     os.path.join("v1", "32000.json"),
@@ -12,6 +13,9 @@ version_config_paths = [
     os.path.join("v2", "32000.json"),
 ]
 
+# Synthesizer execution modes, see rvc.infer.compiled.
+COMPILE_MODES = ["eager", "script", "compile"]
+
 
 def singleton(cls):
     instances = {}
@@ -36,6 +40,24 @@ class Config:
         )
         self.json_config = self.load_config_json()
         self.gpu_mem = None
+        # Opt-in reduced precision for CPU inference ("fp32", "int8" or "bf16").
+        self.cpu_precision = os.environ.get("RVC_CPU_PRECISION", "fp32")
+        # Inference backend for the embedder and synthesizer ("torch" or "onnx").
+        self.backend = os.environ.get("RVC_INFERENCE_BACKEND", "torch")
+        # Synthesizer execution mode for the torch backend ("eager", "script" or "compile").
+        self.compile_mode = os.environ.get("RVC_COMPILE_MODE", "eager")
+        if self.compile_mode not in COMPILE_MODES:
+            print(f"Unknown compile mode {self.compile_mode}, using eager.")
+            self.compile_mode = "eager"
+        # Chunked RMVPE inference: inputs longer than max_frames (0 disables chunking) run
+        # chunk_batch_size chunks per forward pass.
+        rmvpe_max_frames = int(os.environ.get("RVC_RMVPE_MAX_FRAMES", "32000"))
+        self.rmvpe_options = {
+            "max_frames": rmvpe_max_frames or None,
+            "chunk_batch_size": int(os.environ.get("RVC_RMVPE_CHUNK_BATCH_SIZE", "1")),
+        }
+        # Feed the output encoder block by block instead of with the whole signal.
+        self.stream_encode = os.environ.get("RVC_STREAM_ENCODE", "False") == "True"
         self.x_pad, self.x_query, self.x_center, self.x_max = self.device_config()
 
     def load_config_json(self) -> dict:
@@ -85,14 +107,17 @@ class Config:
     def device_config(self) -> tuple:
         if self.device.startswith("cuda"):
             self.set_cuda_config()
+            self.cpu_precision = "fp32"
         elif self.has_mps():
             self.device = "mps"
+            self.cpu_precision = "fp32"
             self.is_half = False
             self.use_fp32_config()
         else:
             self.device = "cpu"
             self.is_half = False
             self.use_fp32_config()
+            self.cpu_precision = resolve_cpu_precision(self.cpu_precision)
 
         # Configuration for 6GB GPU memory
         x_pad, x_query, x_center, x_max = (
@@ -0,0 +1,94 @@
+import os
+
+import torch
+from torch.nn.utils import parametrize
+
+
+def fold_weight_norm(module):
+    """
+    Folds every weight-norm parametrization of a module into a plain weight, in place.
+
+    The synthesizers register weight norm through torch.nn.utils.parametrizations, which
+    recomputes each weight from its magnitude and direction on every forward; after
+    folding, inference reads the stored weights directly.
+    """
+    for submodule in module.modules():
+        if parametrize.is_parametrized(submodule, "weight"):
+            parametrize.remove_parametrizations(
+                submodule, "weight", leave_parametrized=True
+            )
+    return module
+
+
+def script_path(model_path, device, is_half, precision="fp32"):
+    """
+    Returns the path of the TorchScript cache of a model, next to its .pth.
+
+    Scripted graphs hold the weights in their final dtype and quantization, so the path
+    depends on the device type and precision.
+    """
+    dtype = "fp16" if is_half else precision
+    return f"{os.path.splitext(model_path)[0]}.{str(device).split(':')[0]}.{dtype}.ts"
+
+
+def script_network(net_g, model_path, device, is_half, precision="fp32"):
+    """
+    Returns the TorchScript version of a folded synthesizer, loaded from the cache next to
+    the .pth when it is up to date and scripted and saved otherwise.
+    """
+    path = script_path(model_path, device, is_half, precision)
+    if os.path.isfile(path) and os.path.getmtime(path) >= os.path.getmtime(model_path):
+        return torch.jit.load(path, map_location=device)
+    scripted = torch.jit.script(net_g)
+    torch.jit.save(scripted, path)
+    return scripted
+
+
+def compile_network(net_g, model_path):
+    """
+    Compiles a folded synthesizer's infer with torch.compile, with dynamic lengths.
+
+    Compiled kernels are kept in an inductor cache next to the .pth, so later processes
+    skip most of the compilation; the FX graph cache is enabled on torch versions that have it.
+    """
+    # Imported here so loading the config or the other modes never pulls in inductor.
+    import torch._inductor.config
+
+    os.environ.setdefault(
+        "TORCHINDUCTOR_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(model_path)), ".inductor_cache"),
+    )
+    if hasattr(torch._inductor.config, "fx_graph_cache"):
+        torch._inductor.config.fx_graph_cache = True
+    net_g.infer = torch.compile(net_g.infer, dynamic=True)
+    return net_g
+
+
+def warm_up(net_g, cpt, device, is_half, seconds):
+    """
+    Runs inference on dummy inputs of the given lengths, so scripting profiles and
+    compilation happen before the first real segment.
+
+    Args:
+        net_g: The synthesizer.
+        cpt: The model checkpoint (only its metadata is used).
+        device: Device of the synthesizer.
+        is_half: Whether the synthesizer runs in half precision.
+        seconds: Segment lengths to warm up, in seconds of 16 kHz input.
+    """
+    channels = 256 if cpt.get("version", "v1") == "v1" else 768
+    dtype = torch.float16 if is_half else torch.float32
+    with torch.no_grad():
+        for length in seconds:
+            frames = int(length * 100)
+            phone = torch.zeros(1, frames, channels, dtype=dtype, device=device)
+            phone_lengths = torch.tensor([frames], device=device).long()
+            sid = torch.tensor([0], device=device).long()
+            # The profiling executor optimizes a scripted graph on its second run.
+            for _ in range(2):
+                if cpt.get("f0", 1):
+                    pitch = torch.full((1, frames), 100, device=device).long()
+                    pitchf = torch.full((1, frames), 200.0, device=device)
+                    net_g.infer(phone, phone_lengths, pitch, pitchf, sid)
+                else:
+                    net_g.infer(phone, phone_lengths, sid)
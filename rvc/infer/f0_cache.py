@@ -0,0 +1,111 @@
+import os
+import threading
+from collections import OrderedDict
+
+from rvc.infer.feature_cache import FeatureCache
+
+
+class F0Cache:
+    """
+    A thread-safe, size-bounded in-memory LRU memo of F0 contours, keyed by a digest of
+    the audio content and the estimation parameters.
+    """
+
+    def __init__(self, max_entries=32, max_bytes=None):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries: Maximum number of contours kept.
+            max_bytes: Optional memory budget for all cached contours.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, audio, params, compute, *args):
+        """
+        Returns the memoized contour for an input, computing and storing it on a miss.
+
+        Args:
+            audio: The analysed audio as a NumPy array.
+            params: A tuple of parameters the contour depends on.
+            compute: Function returning the contour as a NumPy array.
+            *args: Arguments passed to compute.
+
+        Returns:
+            The contour, as a read-only array.
+        """
+        if self.max_entries <= 0:
+            return compute(*args)
+        key = FeatureCache.make_key(audio, params)
+        with self.lock:
+            f0 = self.entries.get(key)
+            if f0 is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return f0
+            self.misses += 1
+        # Computed outside the lock, concurrent misses on the same key only duplicate work.
+        f0 = compute(*args)
+        f0.flags.writeable = False
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = f0
+                self.nbytes += f0.nbytes
+                self.evict()
+        return f0
+
+    def evict(self):
+        # The most recently added entry is always kept, even if it alone exceeds the budget.
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_entries
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, f0 = self.entries.popitem(last=False)
+            self.nbytes -= f0.nbytes
+            self.evictions += 1
+
+    def resize(self, max_entries):
+        """
+        Changes the maximum number of contours kept (0 disables the memo), evicting the least
+        recently used ones.
+        """
+        with self.lock:
+            self.max_entries = max_entries
+            self.evict()
+            if max_entries <= 0:
+                self.evictions += len(self.entries)
+                self.entries.clear()
+                self.nbytes = 0
+
+    def clear(self):
+        with self.lock:
+            self.evictions += len(self.entries)
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Returns the cache counters and current occupancy.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.nbytes,
+            }
+
+
+f0_cache_mb = os.environ.get("RVC_F0_CACHE_MB")
+f0_cache = F0Cache(
+    max_entries=int(os.environ.get("RVC_F0_CACHE_SIZE", "32")),
+    max_bytes=int(float(f0_cache_mb) * 1024**2) if f0_cache_mb else None,
+)
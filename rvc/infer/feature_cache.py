@@ -0,0 +1,153 @@
+import os
+import hashlib
+import threading
+
+import numpy as np
+
+
+class FeatureCache:
+    """
+    A size-bounded on-disk cache of per-input analysis results (raw F0 contours and
+    HuBERT features), keyed by a digest of the audio content and the analysis parameters.
+
+    Entries are stored as .npy files and read back memory-mapped. When the cache grows
+    past its budget, the least recently used files are removed.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """
+        Initializes the cache.
+
+        Args:
+            cache_dir: Directory holding the cached arrays. The cache is disabled when None.
+            max_bytes: Optional disk budget for all cached arrays.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.nbytes = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.cache_dir is not None
+
+    @staticmethod
+    def make_key(audio, params):
+        """
+        Returns the content digest of an audio array combined with analysis parameters.
+
+        Args:
+            audio: The analysed audio as a NumPy array.
+            params: A tuple of parameters the result depends on.
+        """
+        audio = np.ascontiguousarray(audio)
+        digest = hashlib.sha1(audio.view(np.uint8).data)
+        digest.update(repr((audio.dtype.str, audio.shape, params)).encode())
+        return digest.hexdigest()
+
+    def path(self, kind, key):
+        return os.path.join(self.cache_dir, kind, f"{key}.npy")
+
+    def get_or_compute(self, kind, audio, params, compute, *args):
+        """
+        Returns the cached result for an input, computing and storing it on a miss.
+
+        Args:
+            kind: The kind of result ("f0" or "features"), used as a subdirectory.
+            audio: The analysed audio as a NumPy array.
+            params: A tuple of parameters the result depends on.
+            compute: Function returning the result as a NumPy array.
+            *args: Arguments passed to compute.
+
+        Returns:
+            The result, as a read-only memory-mapped array on a hit.
+        """
+        if not self.enabled:
+            return compute(*args)
+        path = self.path(kind, self.make_key(audio, params))
+        try:
+            array = np.load(path, mmap_mode="r")
+            os.utime(path)
+            with self.lock:
+                self.hits += 1
+            return array
+        except (OSError, ValueError):
+            pass
+        array = compute(*args)
+        with self.lock:
+            self.misses += 1
+        self.put(path, np.asarray(array))
+        return array
+
+    def put(self, path, array):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial array.
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(temp_path, path)
+        with self.lock:
+            if self.nbytes is None:
+                self.nbytes = sum(size for _, size, _ in self.files())
+            else:
+                self.nbytes += os.path.getsize(path)
+            self.evict()
+
+    def files(self):
+        for kind in os.listdir(self.cache_dir):
+            kind_dir = os.path.join(self.cache_dir, kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            for name in os.listdir(kind_dir):
+                if name.endswith(".npy"):
+                    stat = os.stat(os.path.join(kind_dir, name))
+                    yield stat.st_mtime, stat.st_size, os.path.join(kind_dir, name)
+
+    def evict(self):
+        if self.max_bytes is None or self.nbytes <= self.max_bytes:
+            return
+        # Rescan, other processes may share the directory.
+        files = sorted(self.files())
+        self.nbytes = sum(size for _, size, _ in files)
+        # The most recently written file is always kept, even if it alone exceeds the budget.
+        for _, size, path in files[:-1]:
+            if self.nbytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        if not self.enabled or not os.path.isdir(self.cache_dir):
+            return
+        with self.lock:
+            for _, _, path in list(self.files()):
+                os.remove(path)
+                self.evictions += 1
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Returns the cache counters and current occupancy.
+        """
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self.nbytes or 0,
+            }
+
+
+feature_cache_mb = os.environ.get("RVC_FEATURE_CACHE_MB", "2048")
+feature_cache = FeatureCache(
+    cache_dir=os.environ.get("RVC_FEATURE_CACHE_DIR") or None,
+    max_bytes=int(float(feature_cache_mb) * 1024**2) if feature_cache_mb else None,
+)
@@ -0,0 +1,164 @@
+import os
+import threading
+from collections import OrderedDict
+
+import faiss
+
+from rvc.infer.retrieval import EXACT_MAX_VECTORS, IndexEmbeddings, build_engine
+
+
+class IndexCache:
+    """
+    A thread-safe LRU cache of FAISS indexes and their reconstructed embedding matrices,
+    keyed by index path and modification time, along with the retrieval engines built
+    over them.
+    """
+
+    def __init__(self, max_indexes=8, max_bytes=None, mmap=False):
+        """
+        Initializes the cache.
+
+        Args:
+            max_indexes: Maximum number of indexes kept loaded.
+            max_bytes: Optional memory budget for the reconstructed embedding matrices.
+            mmap: Whether to memory-map index files (faiss.IO_FLAG_MMAP) instead of reading them into RAM.
+                Embeddings of memory-mapped indexes are then reconstructed per query (see
+                IndexEmbeddings), except for the exact, hnsw and ivfpq engines, which are
+                built from, and hold, the full matrix.
+        """
+        self.max_indexes = max_indexes
+        self.max_bytes = max_bytes
+        self.mmap = mmap
+        self.entries = OrderedDict()
+        self.engines = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def read_index(self, file_index):
+        if self.mmap:
+            return faiss.read_index(file_index, faiss.IO_FLAG_MMAP)
+        return faiss.read_index(file_index)
+
+    def get(self, file_index):
+        """
+        Returns the index and its reconstructed embeddings, loading them on first use.
+
+        Args:
+            file_index: Path to the .index file.
+
+        Returns:
+            A tuple (index, big_npy).
+        """
+        file_index = os.path.abspath(file_index)
+        key = (file_index, os.path.getmtime(file_index))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            index = self.read_index(file_index)
+            if self.mmap:
+                big_npy = IndexEmbeddings(index)
+            else:
+                big_npy = index.reconstruct_n(0, index.ntotal)
+            # Drop stale versions of the same file.
+            for stale_key in [k for k in self.entries if k[0] == file_index]:
+                self.remove(stale_key)
+                self.evictions += 1
+            entry = self.entries[key] = (index, big_npy)
+            self.evict()
+            return entry
+
+    def evict(self):
+        # The most recently added entry is always kept, even if it alone exceeds the budget.
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_indexes
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            self.remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def resize(self, max_indexes):
+        """
+        Changes the maximum number of indexes kept loaded, evicting the least recently used ones.
+        """
+        with self.lock:
+            self.max_indexes = max_indexes
+            self.evict()
+
+    def remove(self, key):
+        del self.entries[key]
+        for engine_key in [k for k in self.engines if k[:2] == key]:
+            del self.engines[engine_key]
+
+    def get_engine(self, file_index, engine):
+        """
+        Returns the search index of a retrieval engine and the embeddings it searches,
+        building the engine on first use.
+
+        Args:
+            file_index: Path to the .index file.
+            engine: One of rvc.infer.retrieval.RETRIEVAL_ENGINES.
+
+        Returns:
+            A tuple (search_index, big_npy).
+        """
+        index, big_npy = self.get(file_index)
+        if engine == "auto":
+            engine = "exact" if index.ntotal <= EXACT_MAX_VECTORS else "index"
+        if engine == "index":
+            return index, big_npy
+        file_index = os.path.abspath(file_index)
+        key = (file_index, os.path.getmtime(file_index), engine)
+        with self.lock:
+            search_index = self.engines.get(key)
+        if search_index is None:
+            # Built outside the lock, concurrent first uses only duplicate work.
+            search_index = build_engine(
+                engine,
+                file_index,
+                (
+                    big_npy.materialize()
+                    if isinstance(big_npy, IndexEmbeddings)
+                    else big_npy
+                ),
+            )
+            with self.lock:
+                if key[:2] in self.entries:
+                    self.engines[key] = search_index
+        return search_index, big_npy
+
+    @property
+    def nbytes(self):
+        return sum(big_npy.nbytes for _, big_npy in self.entries.values())
+
+    def clear(self):
+        with self.lock:
+            self.evictions += len(self.entries)
+            self.entries.clear()
+            self.engines.clear()
+
+    def stats(self):
+        """
+        Returns the cache counters and current occupancy.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "indexes": len(self.entries),
+                "bytes": self.nbytes,
+            }
+
+
+index_cache_mb = os.environ.get("RVC_INDEX_CACHE_MB")
+index_cache = IndexCache(
+    max_indexes=int(os.environ.get("RVC_INDEX_CACHE_SIZE", "8")),
+    max_bytes=int(float(index_cache_mb) * 1024**2) if index_cache_mb else None,
+    mmap=os.environ.get("RVC_INDEX_MMAP", "False") == "True",
+)
@@ -1,22 +1,32 @@
 import os
+import copy
 import time
+import queue
+import threading
 import torch
 import numpy as np
 import soundfile as sf
-import librosa
-import noisereduce as nr
-from scipy.io import wavfile
 from rvc.infer.pipeline import Pipeline as VC
+from rvc.infer.model_cache import CachedModel, model_cache
+from rvc.infer.stream import StreamingConverter
+from rvc.infer.postprocess import post_process_audio
+from rvc.infer.precision import (
+    quantize_hubert,
+    quantize_synthesizer,
+    resolve_cpu_precision,
+)
+from rvc.infer.compiled import (
+    fold_weight_norm,
+    script_network,
+    compile_network,
+    warm_up,
+)
+from rvc.infer.onnx_backend import OnnxEmbedder, OnnxSynthesizer, export_synthesizer
 from audio_upscaler import upscale
 from rvc.lib.utils import load_audio, load_embedding
 from rvc.lib.tools.split_audio import process_audio, merge_audio
-from rvc.lib.algorithm.synthesizers import (
-    SynthesizerV1_F0,
-    SynthesizerV1_NoF0,
-    SynthesizerV2_F0,
-    SynthesizerV2_NoF0,
-)
-from rvc.configs.config import Config
+from rvc.lib.algorithm.synthesizers import SynthesizerV1_NoF0, synthesizer_classes
+from rvc.configs.config import COMPILE_MODES, Config
 
 import logging
 
@@ -33,92 +43,104 @@ class VoiceConverter:
         """
         Initializes the VoiceConverter with default configuration, and sets up models and parameters.
         """
-        self.config = Config()  # Load RVC configuration
+        # Per-converter copy of the RVC configuration, see configure
+        self.config = copy.copy(Config())
         self.hubert_model = (
             None  # Initialize the Hubert model (for embedding extraction)
         )
+        self.hubert_embedder = None  # Embedder the loaded Hubert model came from
         self.tgt_sr = None  # Target sampling rate for the output audio
         self.net_g = None  # Generator network for voice conversion
         self.vc = None  # Voice conversion pipeline instance
         self.cpt = None  # Checkpoint for loading model weights
+        self.model_path = None  # Path of the loaded model weight file
         self.version = None  # Model version
         self.n_spk = None  # Number of speakers in the model
 
-    def load_hubert(self, embedder_model, embedder_model_custom):
+    def configure(self, cpu_precision=None, backend=None, compile_mode=None):
         """
-        Loads the HuBERT model for speaker embedding extraction.
+        Sets the inference options of this converter, the config (RVC_* environment
+        variables) provides the ones that are None.
 
         Args:
-            embedder_model: Path to the pre-trained embedder model.
-            embedder_model_custom: Path to a custom embedder model (if any).
+            cpu_precision: CPU precision ("fp32", "int8" or "bf16"), ignored on GPU.
+            backend: Inference backend ("torch" or "onnx").
+            compile_mode: Synthesizer execution mode ("eager", "script" or "compile").
         """
-        models, _, _ = load_embedding(embedder_model, embedder_model_custom)
-        self.hubert_model = models[0].to(self.config.device)
-        self.hubert_model = (
-            self.hubert_model.half()
-            if self.config.is_half
-            else self.hubert_model.float()
+        defaults = Config()
+        cpu_precision = cpu_precision or defaults.cpu_precision
+        backend = backend or defaults.backend
+        compile_mode = compile_mode or defaults.compile_mode
+        if self.config.device != "cpu":
+            cpu_precision = "fp32"
+        elif cpu_precision != self.config.cpu_precision:
+            cpu_precision = resolve_cpu_precision(cpu_precision)
+        if compile_mode not in COMPILE_MODES:
+            print(f"Unknown compile mode {compile_mode}, using eager.")
+            compile_mode = "eager"
+        options = (cpu_precision, backend, compile_mode)
+        if options != self.model_variant():
+            (
+                self.config.cpu_precision,
+                self.config.backend,
+                self.config.compile_mode,
+            ) = options
+            # The embedder is reloaded, voice models come from the cache entry of the new options.
+            self.hubert_model = None
+
+    def model_variant(self):
+        """
+        Returns the options a loaded voice model depends on, part of its model cache key.
+        """
+        return (
+            self.config.cpu_precision,
+            self.config.backend,
+            self.config.compile_mode,
         )
-        self.hubert_model.eval()
 
-    @staticmethod
-    def remove_audio_noise(input_audio_path, reduction_strength=0.7):
+    def load_hubert(self, embedder_model, embedder_model_custom):
         """
-        Removes noise from an audio file using the NoiseReduce library.
+        Loads the HuBERT model for speaker embedding extraction.
 
         Args:
-            input_audio_path: Path to the input audio file.
-            reduction_strength: Strength of noise reduction (0.0 to 1.0).
-
-        Returns:
-            The audio data with noise reduced, or None if an error occurs.
+            embedder_model: Path to the pre-trained embedder model.
+            embedder_model_custom: Path to a custom embedder model (if any).
         """
-        try:
-            rate, data = wavfile.read(input_audio_path)
-            reduced_noise = nr.reduce_noise(
-                y=data, sr=rate, prop_decrease=reduction_strength
+        embedder_key = (
+            f"custom:{os.path.abspath(embedder_model_custom)}"
+            if embedder_model == "custom" and embedder_model_custom
+            else embedder_model
+        )
+        if self.config.backend == "onnx":
+            self.hubert_model = OnnxEmbedder(
+                self.embedder_onnx_base(embedder_model, embedder_model_custom),
+                lambda: load_embedding(embedder_model, embedder_model_custom)[0][0],
+                self.config.device,
             )
-            return reduced_noise
-        except Exception as error:
-            print(f"Error cleaning audio: {error}")
-            return None
+            embedder_key += ":onnx"
+        else:
+            models, _, _ = load_embedding(embedder_model, embedder_model_custom)
+            self.hubert_model = models[0].to(self.config.device)
+            self.hubert_model = (
+                self.hubert_model.half()
+                if self.config.is_half
+                else self.hubert_model.float()
+            )
+            self.hubert_model.eval()
+            if self.config.cpu_precision == "int8":
+                self.hubert_model = quantize_hubert(self.hubert_model)
+        self.hubert_embedder = (embedder_model, embedder_model_custom)
+        # Identifies the embedder in feature cache keys.
+        self.hubert_model.embedder_key = embedder_key
 
     @staticmethod
-    def convert_audio_format(input_path, output_path, output_format):
+    def embedder_onnx_base(embedder_model, embedder_model_custom):
         """
-        Converts an audio file to a specified output format.
-
-        Args:
-            input_path: Path to the input audio file.
-            output_path: Path for the output audio file.
-            output_format: Desired output format (e.g., "MP3", "WAV").
-
-        Returns:
-            The path to the converted audio file, or None if conversion fails.
+        Returns the path prefix of the exported ONNX graphs of an embedder, next to its weights.
         """
-        try:
-            if output_format != "WAV":
-                print(f"Converting audio to {output_format} format...")
-                audio, sample_rate = librosa.load(input_path, sr=None)
-                common_sample_rates = [
-                    8000,
-                    11025,
-                    12000,
-                    16000,
-                    22050,
-                    24000,
-                    32000,
-                    44100,
-                    48000,
-                ]
-                target_sr = min(common_sample_rates, key=lambda x: abs(x - sample_rate))
-                audio = librosa.resample(
-                    audio, orig_sr=sample_rate, target_sr=target_sr
-                )
-                sf.write(output_path, audio, target_sr, format=output_format.lower())
-            return output_path
-        except Exception as error:
-            print(f"Failed to convert audio to {output_format} format: {error}")
+        if embedder_model == "custom" and embedder_model_custom:
+            return os.path.splitext(embedder_model_custom)[0]
+        return os.path.join("rvc", "models", "embedders", embedder_model)
 
     def voice_conversion(
         self,
@@ -139,6 +161,9 @@ class VoiceConverter:
         filter_radius=None,
         embedder_model=None,
         embedder_model_custom=None,
+        retrieval=None,
+        f0_autotune_strength=1.0,
+        f0_autotune_smoothing=0,
     ):
         """
         Performs voice conversion on the input audio using the loaded model and settings.
@@ -161,6 +186,9 @@ class VoiceConverter:
             filter_radius: Radius for median filtering of the F0 contour.
             embedder_model: Path to the embedder model.
             embedder_model_custom: Path to a custom embedder model.
+            retrieval: Optional retrieval settings (engine, k, nprobe, ef_search).
+            f0_autotune_strength: Fraction of the autotune correction applied (0.0 to 1.0).
+            f0_autotune_smoothing: Frames the autotune correction is averaged over (0 snaps every frame).
 
         Returns:
             A tuple containing the target sampling rate and the converted audio data,
@@ -174,7 +202,10 @@ class VoiceConverter:
             if audio_max > 1:
                 audio /= audio_max
 
-            if not self.hubert_model:
+            if not self.hubert_model or self.hubert_embedder != (
+                embedder_model,
+                embedder_model_custom,
+            ):
                 self.load_hubert(embedder_model, embedder_model_custom)
             if_f0 = self.cpt.get("f0", 1)
 
@@ -190,51 +221,49 @@ class VoiceConverter:
                 self.tgt_sr = resample_sr
 
             if split_audio == "True":
-                result, new_dir_path = process_audio(input_audio_path)
-                if result == "Error":
-                    return "Error with Split Audio", None
-
-                dir_path = (
-                    new_dir_path.strip().strip('"').strip("\n").strip('"').strip()
-                )
-                if dir_path:
-                    paths = [
-                        os.path.join(root, name)
-                        for root, _, files in os.walk(dir_path, topdown=False)
-                        for name in files
-                        if name.endswith(".wav") and root == dir_path
-                    ]
-                try:
-                    for path in paths:
-                        self.voice_conversion(
-                            sid,
-                            path,
-                            f0_up_key,
-                            None,
-                            f0_method,
-                            file_index,
-                            index_rate,
-                            resample_sr,
-                            rms_mix_rate,
-                            protect,
-                            hop_length,
-                            path,
-                            False,
-                            f0_autotune,
-                            filter_radius,
-                            embedder_model,
-                            embedder_model_custom,
-                        )
-                except Exception as error:
-                    print(error)
-                    return f"Error {error}"
-                print("Finished processing segmented audio, now merging audio...")
-                merge_timestamps_file = os.path.join(
-                    os.path.dirname(new_dir_path),
-                    f"{os.path.basename(input_audio_path).split('.')[0]}_timestamps.txt",
+                # Non-silent segments are converted as views of the loaded input and merged
+                # back into one buffer.
+                segments = process_audio(audio, 16000)
+                index, big_npy = self.vc.load_index(file_index, index_rate, retrieval)
+                prepared_list = [
+                    self.vc.prepare(
+                        audio[start:end],
+                        input_audio_path,
+                        f0_up_key,
+                        f0_method,
+                        if_f0,
+                        filter_radius,
+                        hop_length,
+                        f0_autotune,
+                        None,
+                        f0_autotune_strength,
+                        f0_autotune_smoothing,
+                    )
+                    for start, end in segments
+                ]
+                outputs = self.vc.convert_batch(
+                    self.hubert_model,
+                    self.net_g,
+                    sid,
+                    prepared_list,
+                    index,
+                    big_npy,
+                    index_rate,
+                    self.tgt_sr,
+                    resample_sr,
+                    rms_mix_rate,
+                    self.version,
+                    protect,
+                    # Only equal-length segments share a batch, so every segment converts
+                    # exactly as it would on its own.
+                    bucket_ratio=1,
                 )
-                self.tgt_sr, audio_opt = merge_audio(merge_timestamps_file)
-                os.remove(merge_timestamps_file)
+                if outputs:
+                    audio_opt = merge_audio(segments, outputs, 16000, self.tgt_sr)
+                else:
+                    audio_opt = np.zeros(
+                        audio.shape[0] * self.tgt_sr // 16000, dtype=np.int16
+                    )
             else:
                 audio_opt = self.vc.pipeline(
                     self.hubert_model,
@@ -256,6 +285,9 @@ class VoiceConverter:
                     hop_length,
                     f0_autotune,
                     f0_file=f0_file,
+                    retrieval=retrieval,
+                    f0_autotune_strength=f0_autotune_strength,
+                    f0_autotune_smoothing=f0_autotune_smoothing,
                 )
 
             if output_path:
@@ -270,20 +302,54 @@ class VoiceConverter:
         """
         Loads the voice conversion model and sets up the pipeline.
 
+        Models are served from the shared model cache when the same file (path and
+        modification time) was loaded before, skipping torch.load and network setup.
+
         Args:
             weight_root: Path to the model weight file.
             sid: Speaker ID (currently not used).
         """
         if sid == "" or sid == []:
             self.cleanup_model()
+            model_cache.clear()
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
 
+        if not os.path.isfile(weight_root):
+            self.cpt = None
+            return
+
+        cached = model_cache.get(weight_root, self.model_variant())
+        if cached is not None:
+            self.net_g = cached.net_g
+            self.vc = cached.vc
+            self.cpt = cached.cpt
+            self.tgt_sr = cached.tgt_sr
+            self.version = cached.version
+            self.n_spk = cached.n_spk
+            return
+
         self.load_model(weight_root)
 
         if self.cpt is not None:
             self.setup_network()
             self.setup_vc_instance()
+            # The weights now live in net_g, keep only the checkpoint metadata.
+            self.cpt = {
+                key: value for key, value in self.cpt.items() if key != "weight"
+            }
+            model_cache.put(
+                weight_root,
+                self.model_variant(),
+                CachedModel(
+                    self.net_g,
+                    self.vc,
+                    self.cpt,
+                    self.tgt_sr,
+                    self.version,
+                    self.n_spk,
+                ),
+            )
 
     def cleanup_model(self):
         if self.hubert_model is not None:
@@ -299,6 +365,7 @@ class VoiceConverter:
         self.cpt = None
 
     def load_model(self, weight_root):
+        self.model_path = weight_root
         self.cpt = (
             torch.load(weight_root, map_location="cpu")
             if os.path.isfile(weight_root)
@@ -312,22 +379,80 @@ class VoiceConverter:
             if_f0 = self.cpt.get("f0", 1)
 
             self.version = self.cpt.get("version", "v1")
-            synthesizer_class = {
-                ("v1", 0): SynthesizerV1_NoF0,
-                ("v1", 1): SynthesizerV1_F0,
-                ("v2", 0): SynthesizerV2_NoF0,
-                ("v2", 1): SynthesizerV2_F0,
-            }.get((self.version, if_f0), SynthesizerV1_NoF0)
+            if self.config.backend == "onnx":
+                self.net_g = self.setup_onnx_network(if_f0)
+                return
+            synthesizer_class = synthesizer_classes.get(
+                (self.version, if_f0), SynthesizerV1_NoF0
+            )
 
             self.net_g = synthesizer_class(
                 *self.cpt["config"], is_half=self.config.is_half
             )
             del self.net_g.enc_q
             self.net_g.load_state_dict(self.cpt["weight"], strict=False)
+            fold_weight_norm(self.net_g)
             self.net_g.eval().to(self.config.device)
             self.net_g = (
                 self.net_g.half() if self.config.is_half else self.net_g.float()
             )
+            if self.config.cpu_precision == "int8":
+                self.net_g = quantize_synthesizer(self.net_g)
+            if self.config.compile_mode != "eager":
+                self.net_g = self.setup_compiled_network(self.net_g)
+
+    def setup_compiled_network(self, net_g):
+        """
+        Scripts or compiles the synthesizer and warms it up on the pipeline's segment lengths,
+        falling back to eager execution when this fails.
+        """
+        mode = self.config.compile_mode
+        try:
+            if mode == "script":
+                compiled = script_network(
+                    net_g,
+                    self.model_path,
+                    self.config.device,
+                    self.config.is_half,
+                    self.config.cpu_precision,
+                )
+            else:
+                compiled = compile_network(net_g, self.model_path)
+            x_pad, x_query, x_center = (
+                self.config.x_pad,
+                self.config.x_query,
+                self.config.x_center,
+            )
+            warm_up(
+                compiled,
+                self.cpt,
+                self.config.device,
+                self.config.is_half,
+                [2 * x_pad + x_query, 2 * x_pad + x_center],
+            )
+            return compiled
+        except Exception as error:
+            print(
+                f"Could not {mode} the model, running it eagerly: "
+                f"{type(error).__name__}: {error}"
+            )
+            # compile_network replaces infer on the instance, restore the class method.
+            net_g.__dict__.pop("infer", None)
+            return net_g
+
+    def setup_onnx_network(self, if_f0):
+        """
+        Loads the ONNX export of the current model, exporting it next to the .pth on first use.
+        """
+        onnx_path = os.path.splitext(self.model_path)[0] + ".onnx"
+        if not os.path.isfile(onnx_path) or os.path.getmtime(
+            onnx_path
+        ) < os.path.getmtime(self.model_path):
+            print(f"Exporting {self.model_path} to {onnx_path}...")
+            export_synthesizer(self.model_path, onnx_path)
+        return OnnxSynthesizer(
+            onnx_path, self.config.device, if_f0, self.cpt["config"][2]
+        )
 
     def setup_vc_instance(self):
         if self.cpt is not None:
@@ -356,6 +481,9 @@ class VoiceConverter:
         embedder_model_custom,
         upscale_audio,
         f0_file,
+        retrieval=None,
+        f0_autotune_strength=1.0,
+        f0_autotune_smoothing=0,
     ):
         """
         Main inference pipeline for voice conversion.
@@ -380,6 +508,13 @@ class VoiceConverter:
             embedder_model: Embedder model path.
             embedder_model_custom: Custom embedder model path.
             upscale_audio: Whether to upscale audio.
+            f0_file: Path to an external F0 file for pitch guidance.
+            retrieval: Optional retrieval settings (engine, k, nprobe, ef_search).
+            f0_autotune_strength: Fraction of the autotune correction applied (0.0 to 1.0).
+            f0_autotune_smoothing: Frames the autotune correction is averaged over (0 snaps every frame).
+
+        Returns:
+            The path to the final output file, or None if conversion failed.
         """
         self.get_vc(model_path, 0)
 
@@ -389,7 +524,7 @@ class VoiceConverter:
             if upscale_audio == "True":
                 upscale(audio_input_path, audio_input_path)
 
-            self.voice_conversion(
+            result = self.voice_conversion(
                 sid=0,
                 input_audio_path=audio_input_path,
                 f0_up_key=f0_up_key,
@@ -400,34 +535,332 @@ class VoiceConverter:
                 rms_mix_rate=float(rms_mix_rate),
                 protect=float(protect),
                 hop_length=hop_length,
-                output_path=audio_output_path,
                 split_audio=split_audio,
                 f0_autotune=f0_autotune,
                 filter_radius=filter_radius,
                 embedder_model=embedder_model,
                 embedder_model_custom=embedder_model_custom,
+                retrieval=retrieval,
+                f0_autotune_strength=float(f0_autotune_strength),
+                f0_autotune_smoothing=int(f0_autotune_smoothing),
             )
+            if result is None:
+                return None
 
-            if clean_audio == "True":
-                cleaned_audio = self.remove_audio_noise(
-                    audio_output_path, clean_strength
-                )
-                if cleaned_audio is not None:
-                    sf.write(
-                        audio_output_path, cleaned_audio, self.tgt_sr, format="WAV"
-                    )
-
-            output_path_format = audio_output_path.replace(
-                ".wav", f".{export_format.lower()}"
-            )
-            audio_output_path = self.convert_audio_format(
-                audio_output_path, output_path_format, export_format
+            audio_output_path = self.post_process(
+                result[1], audio_output_path, clean_audio, clean_strength, export_format
             )
 
             elapsed_time = time.time() - start_time
             print(
                 f"Conversion completed at '{audio_output_path}' in {elapsed_time:.2f} seconds."
             )
+            return audio_output_path
 
         except Exception as error:
             print(f"Voice conversion failed: {error}")
+            return None
+
+    def post_process(
+        self, audio, audio_output_path, clean_audio, clean_strength, export_format
+    ):
+        """
+        Applies optional noise reduction to converted audio and writes it once in the export format.
+
+        Args:
+            audio: The converted audio.
+            audio_output_path: Output WAV path, its extension is replaced by the export format's.
+            clean_audio: Whether to apply noise reduction.
+            clean_strength: Noise reduction strength.
+            export_format: Output audio format.
+
+        Returns:
+            The path to the final output file.
+        """
+        return post_process_audio(
+            audio,
+            self.tgt_sr,
+            audio_output_path.replace(".wav", f".{export_format.lower()}"),
+            clean_audio == "True",
+            float(clean_strength),
+            export_format,
+            self.config.stream_encode,
+        )
+
+    def infer_batch_pipeline(
+        self,
+        f0_up_key,
+        filter_radius,
+        index_rate,
+        rms_mix_rate,
+        protect,
+        hop_length,
+        f0_method,
+        audio_files,
+        model_path,
+        index_path,
+        f0_autotune,
+        clean_audio,
+        clean_strength,
+        export_format,
+        embedder_model,
+        embedder_model_custom,
+        f0_file,
+        progress_path=None,
+        queue_size=4,
+        batch_size=1,
+        f0_autotune_strength=1.0,
+        f0_autotune_smoothing=0,
+        retrieval=None,
+    ):
+        """
+        Batch inference pipeline that loads the model, index and embedder once and overlaps
+        decoding, F0 estimation, synthesis and output writing across files.
+
+        Each stage runs on its own thread and hands work to the next through a bounded queue,
+        so at most queue_size files are held in memory per stage. Completed inputs are appended
+        to progress_path, and inputs already listed there are skipped, which makes interrupted
+        runs resumable.
+
+        Args:
+            f0_up_key: Pitch shift value.
+            filter_radius: Filter radius for F0 smoothing.
+            index_rate: Speaker embedding retrieval rate.
+            rms_mix_rate: RMS mixing ratio.
+            protect: Pitch protection level.
+            hop_length: Hop length for F0 estimation.
+            f0_method: F0 estimation method.
+            audio_files: List of (input path, output WAV path) pairs.
+            model_path: Model weight file path.
+            index_path: FAISS index file path.
+            f0_autotune: Whether to apply autotune.
+            clean_audio: Whether to apply noise reduction.
+            clean_strength: Noise reduction strength.
+            export_format: Output audio format.
+            embedder_model: Embedder model path.
+            embedder_model_custom: Custom embedder model path.
+            f0_file: Path to an external F0 file for pitch guidance.
+            progress_path: Optional file recording completed inputs.
+            queue_size: Maximum number of files buffered between two stages.
+            batch_size: Maximum number of segments, across files, converted in one forward pass.
+            f0_autotune_strength: Fraction of the autotune correction applied (0.0 to 1.0).
+            f0_autotune_smoothing: Frames the autotune correction is averaged over (0 snaps every frame).
+            retrieval: Optional retrieval settings (engine, k, nprobe, ef_search).
+
+        Returns:
+            The input paths that could not be converted.
+        """
+        self.get_vc(model_path, 0)
+        if self.cpt is None:
+            print(f"Model '{model_path}' not found.")
+            return [input_path for input_path, _ in audio_files]
+        if not self.hubert_model or self.hubert_embedder != (
+            embedder_model,
+            embedder_model_custom,
+        ):
+            self.load_hubert(embedder_model, embedder_model_custom)
+
+        f0_up_key = int(f0_up_key)
+        index_rate = float(index_rate)
+        rms_mix_rate = float(rms_mix_rate)
+        protect = float(protect)
+        f0_autotune_strength = float(f0_autotune_strength)
+        f0_autotune_smoothing = int(f0_autotune_smoothing)
+        if_f0 = self.cpt.get("f0", 1)
+        tgt_sr = self.tgt_sr
+        vc = self.vc
+        file_index = (
+            index_path.strip()
+            .strip('"')
+            .strip("\n")
+            .strip('"')
+            .strip()
+            .replace("trained", "added")
+        )
+        index, big_npy = vc.load_index(file_index, index_rate, retrieval)
+
+        completed = set()
+        if progress_path and os.path.exists(progress_path):
+            with open(progress_path, "r") as f:
+                completed = set(f.read().splitlines())
+        pending = [item for item in audio_files if item[0] not in completed]
+        print(
+            f"Converting {len(pending)} files ({len(audio_files) - len(pending)} already done)..."
+        )
+
+        failed = []
+        done = object()
+        decoded_queue = queue.Queue(maxsize=queue_size)
+        prepared_queue = queue.Queue(maxsize=max(queue_size, batch_size))
+        converted_queue = queue.Queue(maxsize=queue_size)
+
+        def decode():
+            for input_path, output_path in pending:
+                try:
+                    audio = load_audio(input_path, 16000)
+                    audio_max = np.abs(audio).max() / 0.95
+                    if audio_max > 1:
+                        audio /= audio_max
+                    decoded_queue.put((input_path, output_path, audio))
+                except Exception as error:
+                    print(f"Failed to load '{input_path}': {error}")
+                    failed.append(input_path)
+            decoded_queue.put(done)
+
+        def prepare():
+            for item in iter(decoded_queue.get, done):
+                input_path, output_path, audio = item
+                try:
+                    prepared = vc.prepare(
+                        audio,
+                        input_path,
+                        f0_up_key,
+                        f0_method,
+                        if_f0,
+                        filter_radius,
+                        hop_length,
+                        f0_autotune,
+                        f0_file,
+                        f0_autotune_strength,
+                        f0_autotune_smoothing,
+                    )
+                    prepared_queue.put((input_path, output_path, prepared))
+                except Exception as error:
+                    print(f"Failed to analyze '{input_path}': {error}")
+                    failed.append(input_path)
+            prepared_queue.put(done)
+
+        def write():
+            for item in iter(converted_queue.get, done):
+                input_path, output_path, audio_opt, start_time = item
+                try:
+                    output_path = self.post_process(
+                        audio_opt,
+                        output_path,
+                        clean_audio,
+                        clean_strength,
+                        export_format,
+                    )
+                    if progress_path:
+                        with open(progress_path, "a") as f:
+                            f.write(f"{input_path}\n")
+                    print(
+                        f"Conversion completed at '{output_path}' in {time.time() - start_time:.2f} seconds."
+                    )
+                except Exception as error:
+                    print(f"Failed to write '{output_path}': {error}")
+                    failed.append(input_path)
+
+        workers = [
+            threading.Thread(target=decode, daemon=True),
+            threading.Thread(target=prepare, daemon=True),
+            threading.Thread(target=write, daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+
+        finished = False
+        while not finished:
+            # Take whatever is ready, up to batch_size inputs, without waiting for more.
+            items = [prepared_queue.get()]
+            while items[-1] is not done and len(items) < batch_size:
+                try:
+                    items.append(prepared_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if items[-1] is done:
+                finished = True
+                items.pop()
+            if not items:
+                continue
+            start_time = time.time()
+            for input_path, _, _ in items:
+                print(f"Converting audio '{input_path}'...")
+            try:
+                args = (
+                    index,
+                    big_npy,
+                    index_rate,
+                    tgt_sr,
+                    0,
+                    rms_mix_rate,
+                    self.version,
+                    protect,
+                )
+                if batch_size > 1:
+                    audio_opts = vc.convert_batch(
+                        self.hubert_model,
+                        self.net_g,
+                        0,
+                        [prepared for _, _, prepared in items],
+                        *args,
+                        batch_size=batch_size,
+                    )
+                else:
+                    audio_opts = [
+                        vc.convert(self.hubert_model, self.net_g, 0, items[0][2], *args)
+                    ]
+                for (input_path, output_path, _), audio_opt in zip(items, audio_opts):
+                    converted_queue.put(
+                        (input_path, output_path, audio_opt, start_time)
+                    )
+            except Exception as error:
+                print(
+                    f"Voice conversion failed for {[item[0] for item in items]}: {error}"
+                )
+                failed.extend(item[0] for item in items)
+        converted_queue.put(done)
+
+        for worker in workers:
+            worker.join()
+        return failed
+
+    def create_stream(
+        self,
+        model_path,
+        index_path="",
+        index_rate=0,
+        embedder_model="contentvec",
+        embedder_model_custom=None,
+        sid=0,
+        retrieval=None,
+        **kwargs,
+    ):
+        """
+        Loads a model and returns a StreamingConverter for real-time, block-wise conversion.
+
+        Args:
+            model_path: Model weight file path.
+            index_path: FAISS index file path.
+            index_rate: Speaker embedding retrieval rate.
+            embedder_model: Embedder model path.
+            embedder_model_custom: Custom embedder model path.
+            sid: Speaker ID for the target voice.
+            retrieval: Optional retrieval settings (engine, k, nprobe, ef_search).
+            **kwargs: Streaming options passed to StreamingConverter (f0_method, f0_up_key, block_time, ...).
+
+        Returns:
+            A StreamingConverter consuming 16 kHz PCM and producing audio at the model sampling rate.
+        """
+        self.get_vc(model_path, sid)
+        if self.cpt is None:
+            raise FileNotFoundError(f"Model '{model_path}' not found.")
+        if not self.hubert_model or self.hubert_embedder != (
+            embedder_model,
+            embedder_model_custom,
+        ):
+            self.load_hubert(embedder_model, embedder_model_custom)
+        index, big_npy = self.vc.load_index(index_path, float(index_rate), retrieval)
+        return StreamingConverter(
+            self.vc,
+            self.hubert_model,
+            self.net_g,
+            sid,
+            self.version,
+            self.tgt_sr,
+            pitch_guidance=self.cpt.get("f0", 1),
+            index=index,
+            big_npy=big_npy,
+            index_rate=float(index_rate),
+            **kwargs,
+        )
@@ -0,0 +1,158 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class CachedModel:
+    """
+    A loaded voice model: the constructed synthesizer, its pipeline and the checkpoint metadata.
+    """
+
+    def __init__(self, net_g, vc, cpt, tgt_sr, version, n_spk):
+        """
+        Initializes a cache entry for a loaded voice model.
+
+        Args:
+            net_g: The synthesizer network, already on its inference device.
+            vc: The Pipeline instance built for the model's sampling rate.
+            cpt: The checkpoint without its weight tensors ("config", "f0", "version", ...).
+            tgt_sr: The model's output sampling rate.
+            version: The model version ("v1" or "v2").
+            n_spk: The number of speakers in the model.
+        """
+        self.net_g = net_g
+        self.vc = vc
+        self.cpt = cpt
+        self.tgt_sr = tgt_sr
+        self.version = version
+        self.n_spk = n_spk
+        self.nbytes = self.model_nbytes(net_g)
+
+    @staticmethod
+    def model_nbytes(net_g):
+        """
+        Estimates the memory held by a network's parameters and buffers.
+
+        Args:
+            net_g: A torch module, or a runtime wrapper reporting its own nbytes.
+
+        Returns:
+            The size in bytes of all parameters and buffers.
+        """
+        if hasattr(net_g, "nbytes"):
+            return net_g.nbytes
+        tensors = list(net_g.parameters()) + list(net_g.buffers())
+        return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+class ModelCache:
+    """
+    A thread-safe LRU cache of loaded voice models, keyed by model path, modification time
+    and the inference options the model was set up with.
+    """
+
+    def __init__(self, max_models=8, max_bytes=None):
+        """
+        Initializes the cache.
+
+        Args:
+            max_models: Maximum number of models kept loaded.
+            max_bytes: Optional memory budget (RAM or VRAM, depending on the device) for all cached networks.
+        """
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(model_path, variant=()):
+        model_path = os.path.abspath(model_path)
+        return model_path, os.path.getmtime(model_path), tuple(variant)
+
+    @property
+    def nbytes(self):
+        return sum(entry.nbytes for entry in self.entries.values())
+
+    def get(self, model_path, variant=()):
+        """
+        Returns the cached model for a path, or None if it is not loaded or the file has changed.
+
+        Args:
+            model_path: Path to the .pth model file.
+            variant: The inference options (precision, backend, ...) the model is set up with.
+        """
+        key = self.make_key(model_path, variant)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, model_path, variant, entry):
+        """
+        Adds a loaded model to the cache, evicting least recently used models to respect the limits.
+
+        Args:
+            model_path: Path to the .pth model file.
+            variant: The inference options (precision, backend, ...) the model is set up with.
+            entry: The CachedModel to store.
+        """
+        key = self.make_key(model_path, variant)
+        with self.lock:
+            # Drop stale versions of the same file.
+            for stale_key in [
+                k for k in self.entries if k[0] == key[0] and k[1] != key[1]
+            ]:
+                del self.entries[stale_key]
+                self.evictions += 1
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.evict()
+
+    def evict(self):
+        # The most recently added entry is always kept, even if it alone exceeds the budget.
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_models
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, max_models):
+        """
+        Changes the maximum number of models kept loaded, evicting the least recently used ones.
+        """
+        with self.lock:
+            self.max_models = max_models
+            self.evict()
+
+    def clear(self):
+        with self.lock:
+            self.evictions += len(self.entries)
+            self.entries.clear()
+
+    def stats(self):
+        """
+        Returns the cache counters and current occupancy.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "models": len(self.entries),
+                "bytes": self.nbytes,
+            }
+
+
+model_cache_mb = os.environ.get("RVC_MODEL_CACHE_MB")
+model_cache = ModelCache(
+    max_models=int(os.environ.get("RVC_MODEL_CACHE_SIZE", "8")),
+    max_bytes=int(float(model_cache_mb) * 1024**2) if model_cache_mb else None,
+)
@@ -0,0 +1,270 @@
+import os
+
+import numpy as np
+import torch
+import onnxruntime as ort
+
+from rvc.infer.compiled import fold_weight_norm
+from rvc.lib.algorithm.synthesizers import synthesizer_classes
+
+ONNX_OPSET = 17
+
+
+class EmbedderExport(torch.nn.Module):
+    """
+    Wraps a HuBERT model so one output layer (projected for layer 9, as used by v1 models) is exported.
+    """
+
+    def __init__(self, model, output_layer):
+        super().__init__()
+        self.model = model
+        self.output_layer = output_layer
+
+    def forward(self, source):
+        logits = self.model.extract_features(
+            source=source, padding_mask=None, output_layer=self.output_layer
+        )
+        if self.output_layer == 9:
+            return self.model.final_proj(logits[0])
+        return logits[0]
+
+
+class SynthesizerExport(torch.nn.Module):
+    """
+    Wraps a synthesizer's inference path for export, taking the prior noise as an input
+    so exported and eager models can be compared on identical inputs.
+    """
+
+    def __init__(self, net_g, pitch_guidance):
+        super().__init__()
+        self.net_g = net_g
+        self.pitch_guidance = pitch_guidance
+
+    def forward(self, phone, phone_lengths, *args):
+        if self.pitch_guidance:
+            pitch, pitchf, sid, rnd = args
+        else:
+            pitch = pitchf = None
+            sid, rnd = args
+        g = self.net_g.emb_g(sid).unsqueeze(-1)
+        m_p, logs_p, x_mask = self.net_g.enc_p(phone, pitch, phone_lengths)
+        z_p = (m_p + torch.exp(logs_p) * rnd * 0.66666) * x_mask
+        z = self.net_g.flow(z_p, x_mask, g=g, reverse=True)
+        if self.pitch_guidance:
+            return self.net_g.dec(z * x_mask, pitchf, g=g)
+        return self.net_g.dec(z * x_mask, g=g)
+
+
+def load_synthesizer(model_path):
+    """
+    Builds the fp32 CPU synthesizer of a .pth model with weight norm folded.
+
+    Returns:
+        A tuple (net_g, cpt).
+    """
+    cpt = torch.load(model_path, map_location="cpu")
+    cpt["config"][-3] = cpt["weight"]["emb_g.weight"].shape[0]
+    version = cpt.get("version", "v1")
+    pitch_guidance = cpt.get("f0", 1)
+    net_g = synthesizer_classes[(version, pitch_guidance)](
+        *cpt["config"], is_half=False
+    )
+    del net_g.enc_q
+    net_g.load_state_dict(cpt["weight"], strict=False)
+    fold_weight_norm(net_g)
+    net_g.eval().float()
+    return net_g, cpt
+
+
+def synthesizer_inputs(cpt, frames=200):
+    # Dummy inputs for export and parity checks; lengths must exceed the attention window.
+    channels = 256 if cpt.get("version", "v1") == "v1" else 768
+    return {
+        "phone": torch.randn(1, frames, channels),
+        "phone_lengths": torch.tensor([frames]).long(),
+        "pitch": torch.randint(1, 255, (1, frames)).long(),
+        "pitchf": torch.rand(1, frames) * 400 + 100,
+        "sid": torch.tensor([0]).long(),
+        "rnd": torch.randn(1, cpt["config"][2], frames),
+    }
+
+
+def export_synthesizer(model_path, onnx_path):
+    """
+    Exports the synthesizer of a .pth model to ONNX with dynamic batch and length axes.
+
+    The graph takes phone, phone_lengths, pitch, pitchf, sid and rnd (the prior noise), and
+    returns audio of shape (batch, 1, samples). pitch and pitchf are absent for models without
+    pitch guidance.
+
+    Args:
+        model_path: Path to the .pth model.
+        onnx_path: Output path of the .onnx graph.
+    """
+    net_g, cpt = load_synthesizer(model_path)
+    pitch_guidance = cpt.get("f0", 1)
+    inputs = synthesizer_inputs(cpt)
+    if not pitch_guidance:
+        del inputs["pitch"], inputs["pitchf"]
+    module = SynthesizerExport(net_g, pitch_guidance)
+    dynamic_axes = {
+        "phone": {0: "batch", 1: "frames"},
+        "phone_lengths": {0: "batch"},
+        "pitch": {0: "batch", 1: "frames"},
+        "pitchf": {0: "batch", 1: "frames"},
+        "sid": {0: "batch"},
+        "rnd": {0: "batch", 2: "frames"},
+        "audio": {0: "batch", 2: "samples"},
+    }
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            tuple(inputs.values()),
+            onnx_path,
+            input_names=list(inputs),
+            output_names=["audio"],
+            dynamic_axes={name: dynamic_axes[name] for name in [*inputs, "audio"]},
+            opset_version=ONNX_OPSET,
+            do_constant_folding=True,
+        )
+
+
+def export_embedder(model, output_layer, onnx_path):
+    """
+    Exports one output layer of a HuBERT model to ONNX with dynamic batch and length axes.
+
+    Args:
+        model: The fairseq HuBERT model (moved to fp32 on the CPU).
+        output_layer: 9 (with final projection, for v1 models) or 12 (for v2 models).
+        onnx_path: Output path of the .onnx graph.
+    """
+    module = EmbedderExport(model.float().cpu().eval(), output_layer)
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            (torch.randn(1, 32000),),
+            onnx_path,
+            input_names=["source"],
+            output_names=["feats"],
+            dynamic_axes={
+                "source": {0: "batch", 1: "samples"},
+                "feats": {0: "batch", 1: "frames"},
+            },
+            opset_version=ONNX_OPSET,
+            do_constant_folding=True,
+        )
+
+
+def create_session(onnx_path, device):
+    """
+    Creates an onnxruntime session with full graph optimizations.
+
+    Intra-op threads come from RVC_ORT_THREADS (0 lets onnxruntime use one per physical
+    core); inter-op parallelism is disabled since the graphs are sequential.
+    """
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.intra_op_num_threads = int(os.environ.get("RVC_ORT_THREADS", "0"))
+    options.inter_op_num_threads = 1
+    options.log_severity_level = 3
+    providers = ["CPUExecutionProvider"]
+    if (
+        str(device).startswith("cuda")
+        and "CUDAExecutionProvider" in ort.get_available_providers()
+    ):
+        device_id = int(str(device).split(":")[-1]) if ":" in str(device) else 0
+        providers.insert(0, ("CUDAExecutionProvider", {"device_id": device_id}))
+    return ort.InferenceSession(onnx_path, sess_options=options, providers=providers)
+
+
+class OnnxEmbedder(torch.nn.Module):
+    """
+    Runs exported HuBERT layers through onnxruntime behind the extract_features/final_proj
+    interface the pipeline uses with the torch model.
+
+    Graphs are stored as <base_path>_layer9.onnx / <base_path>_layer12.onnx and exported on first use.
+
+    Args:
+        base_path: Path prefix of the exported graphs.
+        load_model: Function returning the torch HuBERT model, only called to export a missing graph.
+        device: Device the pipeline runs on.
+    """
+
+    def __init__(self, base_path, load_model, device):
+        super().__init__()
+        self.base_path = base_path
+        self.load_model = load_model
+        self.device = device
+        self.sessions = {}
+        # The projection is part of the exported layer 9 graph.
+        self.final_proj = torch.nn.Identity()
+
+    def session(self, output_layer):
+        if output_layer not in self.sessions:
+            onnx_path = f"{self.base_path}_layer{output_layer}.onnx"
+            if not os.path.exists(onnx_path):
+                print(f"Exporting embedder layer {output_layer} to {onnx_path}...")
+                export_embedder(self.load_model(), output_layer, onnx_path)
+            self.sessions[output_layer] = create_session(onnx_path, self.device)
+        return self.sessions[output_layer]
+
+    def extract_features(self, source, padding_mask=None, output_layer=12):
+        session = self.session(output_layer)
+        dtype, device = source.dtype, source.device
+        source = source.float().cpu().numpy()
+        if padding_mask is None or not padding_mask.any():
+            feats = session.run(["feats"], {"source": source})[0]
+            return torch.from_numpy(feats).to(device, dtype), None
+        # Padded batches run item by item, the graph has no padding mask input.
+        lengths = (~padding_mask).sum(-1).tolist()
+        outputs = [
+            session.run(["feats"], {"source": source[i : i + 1, :length]})[0][0]
+            for i, length in enumerate(lengths)
+        ]
+        frames = max(output.shape[0] for output in outputs)
+        feats = np.zeros((len(outputs), frames, outputs[0].shape[1]), np.float32)
+        mask = torch.ones(len(outputs), frames, dtype=torch.bool)
+        for i, output in enumerate(outputs):
+            feats[i, : output.shape[0]] = output
+            mask[i, : output.shape[0]] = False
+        return torch.from_numpy(feats).to(device, dtype), mask.to(device)
+
+
+class OnnxSynthesizer(torch.nn.Module):
+    """
+    Runs an exported synthesizer through onnxruntime behind the infer interface of the
+    torch Synthesizer* classes.
+
+    Args:
+        onnx_path: Path of the exported graph.
+        device: Device the pipeline runs on.
+        pitch_guidance: Whether the model uses pitch guidance.
+        inter_channels: Channels of the prior noise.
+    """
+
+    def __init__(self, onnx_path, device, pitch_guidance, inter_channels):
+        super().__init__()
+        self.session = create_session(onnx_path, device)
+        self.pitch_guidance = pitch_guidance
+        self.inter_channels = inter_channels
+        self.nbytes = os.path.getsize(onnx_path)
+
+    def infer(self, phone, phone_lengths, *args):
+        if self.pitch_guidance:
+            pitch, pitchf, sid = args
+        else:
+            (sid,) = args
+        inputs = {
+            "phone": phone.float().cpu().numpy(),
+            "phone_lengths": phone_lengths.cpu().numpy(),
+            "sid": sid.cpu().numpy(),
+            "rnd": torch.randn(
+                phone.shape[0], self.inter_channels, phone.shape[1]
+            ).numpy(),
+        }
+        if self.pitch_guidance:
+            inputs["pitch"] = pitch.cpu().numpy()
+            inputs["pitchf"] = pitchf.float().cpu().numpy()
+        audio = self.session.run(["audio"], inputs)[0]
+        return torch.from_numpy(audio).to(phone.device), None, None
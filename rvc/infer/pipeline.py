@@ -1,23 +1,25 @@
 import os
-import gc
 import re
 import sys
+import time
 import torch
 import torch.nn.functional as F
 import parselmouth
-import torchcrepe
-import pyworld
-import faiss
 import librosa
 import numpy as np
 from scipy import signal
-from functools import lru_cache
-from torch import Tensor
+from concurrent.futures import ThreadPoolExecutor
 
 now_dir = os.getcwd()
 sys.path.append(now_dir)
-from rvc.lib.predictors.RMVPE import RMVPE0Predictor
-from rvc.lib.predictors.FCPE import FCPEF0Predictor
+from rvc.lib.predictors.PredictorRegistry import predictor_registry
+from rvc.lib.predictors.World import world_extractor
+from rvc.lib.predictors.TorchF0 import crepe_f0, torch_f0_workers
+from rvc.infer.index_cache import index_cache
+from rvc.infer.retrieval import Retriever, blend_neighbors, default_retrieval
+from rvc.infer.feature_cache import feature_cache
+from rvc.infer.f0_cache import f0_cache
+from rvc.infer.precision import autocast
 
 
 # Constants for high-pass filter
@@ -28,7 +30,7 @@ bh, ah = signal.butter(
     N=FILTER_ORDER, Wn=CUTOFF_FREQUENCY, btype="high", fs=SAMPLE_RATE
 )
 
-input_audio_path2wav = {}
+TORCH_F0_METHODS = ["crepe", "crepe-tiny", "rmvpe", "fcpe"]
 
 
 class AudioProcessor:
@@ -36,57 +38,90 @@ class AudioProcessor:
     A class for processing audio signals, specifically for adjusting RMS levels.
     """
 
+    def rms_envelope(audio: np.ndarray, hop_length: int, chunk_size: int = 1 << 20):
+        """
+        Computes the RMS envelope of a signal over frames of 2 * hop_length samples.
+
+        Equivalent to librosa.feature.rms with center=True and zero padding, but built from
+        per-hop sums of squares accumulated chunk by chunk, without a framed copy of the signal.
+
+        Args:
+            audio: The audio signal as a NumPy array.
+            hop_length: Hop between frames in samples (the frame length is twice the hop).
+            chunk_size: Number of samples squared at a time.
+
+        Returns:
+            The RMS of each of the 1 + len(audio) // hop_length frames.
+        """
+        n = audio.shape[0]
+        chunk_size = max(hop_length, chunk_size // hop_length * hop_length)
+        # blocks[m] is the energy of padded block m; block 0 is the zero padding.
+        blocks = np.zeros(n // hop_length + 3)
+        for start in range(0, n, chunk_size):
+            part = np.square(audio[start : start + chunk_size], dtype=np.float64)
+            count = -(-part.shape[0] // hop_length)
+            part = np.pad(part, (0, count * hop_length - part.shape[0]))
+            first = start // hop_length + 1
+            blocks[first : first + count] = part.reshape(count, hop_length).sum(axis=1)
+        frames = 1 + n // hop_length
+        energy = blocks[:frames] + blocks[1 : frames + 1]
+        return np.sqrt(energy / (2 * hop_length))
+
+    def interpolate_envelope(envelope: np.ndarray, start: int, end: int, size: int):
+        """
+        Linearly interpolates an envelope to samples start:end of a signal of the given size.
+
+        Matches F.interpolate(mode="linear", align_corners=False) evaluated on that range only.
+        """
+        scale = envelope.shape[0] / size
+        position = np.maximum((np.arange(start, end) + 0.5) * scale - 0.5, 0)
+        index = position.astype(np.int64)
+        weight = position - index
+        upper = np.minimum(index + 1, envelope.shape[0] - 1)
+        return envelope[index] * (1 - weight) + envelope[upper] * weight
+
     def change_rms(
         source_audio: np.ndarray,
         source_rate: int,
         target_audio: np.ndarray,
         target_rate: int,
         rate: float,
+        out: np.ndarray = None,
+        chunk_size: int = 1 << 16,
     ) -> np.ndarray:
         """
         Adjust the RMS level of target_audio to match the RMS of source_audio, with a given blending rate.
 
+        The envelopes (two values per second) are interpolated and applied chunk by chunk, so no
+        full-length envelope is ever materialized.
+
         Args:
             source_audio: The source audio signal as a NumPy array.
             source_rate: The sampling rate of the source audio.
             target_audio: The target audio signal to adjust.
             target_rate: The sampling rate of the target audio.
             rate: The blending rate between the source and target RMS levels.
+            out: Optional array receiving the result; may be target_audio itself.
+            chunk_size: Number of samples adjusted at a time.
 
         Returns:
             The adjusted target audio signal with RMS level modified to match the source audio.
         """
-        # Calculate RMS of both audio data
-        rms1 = librosa.feature.rms(
-            y=source_audio,
-            frame_length=source_rate // 2 * 2,
-            hop_length=source_rate // 2,
-        )
-        rms2 = librosa.feature.rms(
-            y=target_audio,
-            frame_length=target_rate // 2 * 2,
-            hop_length=target_rate // 2,
-        )
+        rms1 = AudioProcessor.rms_envelope(source_audio, source_rate // 2)
+        rms2 = AudioProcessor.rms_envelope(target_audio, target_rate // 2)
+        if out is None:
+            out = np.empty_like(target_audio)
 
-        # Interpolate RMS to match target audio length
-        rms1 = F.interpolate(
-            torch.from_numpy(rms1).float().unsqueeze(0),
-            size=target_audio.shape[0],
-            mode="linear",
-        ).squeeze()
-        rms2 = F.interpolate(
-            torch.from_numpy(rms2).float().unsqueeze(0),
-            size=target_audio.shape[0],
-            mode="linear",
-        ).squeeze()
-        rms2 = torch.maximum(rms2, torch.zeros_like(rms2) + 1e-6)
-
-        # Adjust target audio RMS based on the source audio RMS
-        adjusted_audio = (
-            target_audio
-            * (torch.pow(rms1, 1 - rate) * torch.pow(rms2, rate - 1)).numpy()
-        )
-        return adjusted_audio
+        size = target_audio.shape[0]
+        for start in range(0, size, chunk_size):
+            end = min(start + chunk_size, size)
+            gain1 = AudioProcessor.interpolate_envelope(rms1, start, end, size)
+            gain2 = AudioProcessor.interpolate_envelope(rms2, start, end, size)
+            gain2 = np.maximum(gain2, 1e-6)
+            out[start:end] = target_audio[start:end] * (
+                np.power(gain1, 1 - rate) * np.power(gain2, rate - 1)
+            )
+        return out
 
 
 class Autotune:
@@ -122,21 +157,54 @@ class Autotune:
         note_dict.append(self.ref_freqs[-1])
         return note_dict
 
-    def autotune_f0(self, f0):
+    def autotune_f0(self, f0, strength=1.0, smoothing=0):
         """
         Autotunes a given F0 contour by snapping each frequency to the closest reference frequency.
 
+        With the defaults every frame is hard-snapped to its nearest note. A strength below 1
+        only moves part of the way to the note, and smoothing > 0 averages the pitch correction
+        over that many frames for a continuous, less robotic result; in that mode unvoiced
+        frames are left untouched.
+
         Args:
             f0: The input F0 contour as a NumPy array.
+            strength: Fraction of the correction applied (0.0 to 1.0).
+            smoothing: Length in frames of the moving average applied to the correction.
 
         Returns:
             The autotuned F0 contour.
         """
-        autotuned_f0 = np.zeros_like(f0)
-        for i, freq in enumerate(f0):
-            closest_note = min(self.note_dict, key=lambda x: abs(x - freq))
-            autotuned_f0[i] = closest_note
-        return autotuned_f0
+        autotuned_f0 = self.snap_to_notes(np.asarray(f0))
+        if strength >= 1 and smoothing <= 1:
+            return autotuned_f0
+
+        voiced = f0 > 0
+        correction = np.zeros_like(f0, dtype=np.float64)
+        correction[voiced] = np.log2(autotuned_f0[voiced] / f0[voiced])
+        if smoothing > 1:
+            kernel = np.ones(int(smoothing)) / int(smoothing)
+            weight = np.convolve(voiced.astype(np.float64), kernel, mode="same")
+            correction = np.convolve(correction, kernel, mode="same") / np.maximum(
+                weight, 1e-6
+            )
+        return np.where(voiced, f0 * np.exp2(strength * correction), f0).astype(
+            f0.dtype
+        )
+
+    def snap_to_notes(self, f0):
+        """
+        Returns the closest entry of note_dict for every frame (ties go to the lower note).
+
+        Args:
+            f0: The input F0 contour as a NumPy array.
+        """
+        notes = np.asarray(self.note_dict, dtype=np.float64)
+        upper = np.clip(np.searchsorted(notes, f0), 1, len(notes) - 1)
+        lower = upper - 1
+        closest = np.where(
+            np.abs(notes[upper] - f0) < np.abs(notes[lower] - f0), upper, lower
+        )
+        return notes[closest].astype(f0.dtype)
 
 
 class Pipeline:
@@ -172,6 +240,8 @@ class Pipeline:
         self.f0_mel_min = 1127 * np.log(1 + self.f0_min / 700)
         self.f0_mel_max = 1127 * np.log(1 + self.f0_max / 700)
         self.device = config.device
+        self.cpu_precision = config.cpu_precision
+        self.rmvpe_options = config.rmvpe_options
         self.ref_freqs = [
             65.41,
             82.41,
@@ -189,13 +259,12 @@ class Pipeline:
         self.note_dict = self.autotune.note_dict
 
     @staticmethod
-    @lru_cache
-    def get_f0_harvest(input_audio_path, fs, f0max, f0min, frame_period):
+    def get_f0_harvest(audio, fs, f0max, f0min, frame_period):
         """
-        Estimates the fundamental frequency (F0) of a given audio file using the Harvest algorithm.
+        Estimates the fundamental frequency (F0) of a given audio signal using the Harvest algorithm.
 
         Args:
-            input_audio_path: Path to the input audio file.
+            audio: The input audio signal as a float64 NumPy array.
             fs: Sampling rate of the audio file.
             f0max: Maximum F0 value to consider.
             f0min: Minimum F0 value to consider.
@@ -204,16 +273,9 @@ class Pipeline:
         Returns:
             The estimated F0 contour as a NumPy array.
         """
-        audio = input_audio_path2wav[input_audio_path]
-        f0, t = pyworld.harvest(
-            audio,
-            fs=fs,
-            f0_ceil=f0max,
-            f0_floor=f0min,
-            frame_period=frame_period,
+        return world_extractor.compute_f0(
+            "harvest", audio, fs, f0min, f0max, frame_period
         )
-        f0 = pyworld.stonemask(audio, f0, t, fs)
-        return f0
 
     def get_f0_crepe(
         self,
@@ -238,34 +300,7 @@ class Pipeline:
         Returns:
             The estimated F0 contour as a NumPy array.
         """
-        x = x.astype(np.float32)
-        x /= np.quantile(np.abs(x), 0.999)
-        audio = torch.from_numpy(x).to(self.device, copy=True)
-        audio = torch.unsqueeze(audio, dim=0)
-        if audio.ndim == 2 and audio.shape[0] > 1:
-            audio = torch.mean(audio, dim=0, keepdim=True).detach()
-        audio = audio.detach()
-        pitch: Tensor = torchcrepe.predict(
-            audio,
-            self.sample_rate,
-            hop_length,
-            f0_min,
-            f0_max,
-            model,
-            batch_size=hop_length * 2,
-            device=self.device,
-            pad=True,
-        )
-        p_len = p_len or x.shape[0] // hop_length
-        source = np.array(pitch.squeeze(0).cpu().float().numpy())
-        source[source < 0.001] = np.nan
-        target = np.interp(
-            np.arange(0, len(source) * p_len, len(source)) / p_len,
-            np.arange(0, len(source)),
-            source,
-        )
-        f0 = np.nan_to_num(target)
-        return f0
+        return crepe_f0(x, f0_min, f0_max, p_len, hop_length, model, self.device)
 
     def get_f0_hybrid(
         self,
@@ -275,10 +310,14 @@ class Pipeline:
         f0_max,
         p_len,
         hop_length,
+        filter_radius=3,
     ):
         """
         Estimates the fundamental frequency (F0) using a hybrid approach combining multiple methods.
 
+        The methods run concurrently (see TorchF0Workers for the neural ones on CPU) and
+        their contours are aligned to p_len before taking the median.
+
         Args:
             methods_str: A string specifying the methods to combine (e.g., "hybrid[crepe+rmvpe]").
             x: The input audio signal as a NumPy array.
@@ -286,6 +325,7 @@ class Pipeline:
             f0_max: Maximum F0 value to consider.
             p_len: Desired length of the F0 output.
             hop_length: Hop length for F0 estimation methods.
+            filter_radius: Radius for median filtering the pm/harvest/dio contours.
 
         Returns:
             The estimated F0 contour as a NumPy array, obtained by combining the specified methods.
@@ -293,77 +333,107 @@ class Pipeline:
         methods_str = re.search("hybrid\[(.+)\]", methods_str)
         if methods_str:
             methods = [method.strip() for method in methods_str.group(1).split("+")]
-        f0_computation_stack = []
         print(f"Calculating f0 pitch estimations for methods {str(methods)}")
         x = x.astype(np.float32)
         x /= np.quantile(np.abs(x), 0.999)
-        for method in methods:
-            f0 = None
-            if method == "crepe":
-                f0 = self.get_f0_crepe_computation(
-                    x, f0_min, f0_max, p_len, int(hop_length)
-                )
-            elif method == "rmvpe":
-                self.model_rmvpe = RMVPE0Predictor(
-                    os.path.join("rvc", "models", "predictors", "rmvpe.pt"),
-                    is_half=self.is_half,
-                    device=self.device,
-                )
-                f0 = self.model_rmvpe.infer_from_audio(x, thred=0.03)
-                f0 = f0[1:]
-            elif method == "fcpe":
-                self.model_fcpe = FCPEF0Predictor(
-                    os.path.join("rvc", "models", "predictors", "fcpe.pt"),
-                    f0_min=int(f0_min),
-                    f0_max=int(f0_max),
-                    dtype=torch.float32,
-                    device=self.device,
-                    sampling_rate=self.sample_rate,
-                    threshold=0.03,
+        args = (x, f0_min, f0_max, p_len, hop_length, filter_radius)
+
+        torch_methods = [
+            i for i, method in enumerate(methods) if method in TORCH_F0_METHODS
+        ]
+        if str(self.device) != "cpu" or not torch_f0_workers.enabled(
+            len(torch_methods)
+        ):
+            torch_methods = []
+        # On CPU the neural estimators run in worker processes, each with its share of the
+        # intra-op threads, and the others on threads of this process.
+        threads = torch_f0_workers.threads_per_method(max(1, len(torch_methods)))
+        with ThreadPoolExecutor(max_workers=len(methods)) as pool:
+            futures = [
+                (
+                    torch_f0_workers.submit(
+                        method, threads, *args[:5], self.rmvpe_options
+                    )
+                    if i in torch_methods
+                    else pool.submit(self.get_f0_hybrid_method, method, *args)
                 )
-                f0 = self.model_fcpe.compute_f0(x, p_len=p_len)
-                del self.model_fcpe
-                gc.collect()
-            f0_computation_stack.append(f0)
+                for i, method in enumerate(methods)
+            ]
+            results = [future.result() for future in futures]
+
+        f0_computation_stack = []
+        for method, (f0, elapsed) in zip(methods, results):
+            print(f"{method} f0 estimation took {elapsed:.2f} s")
+            if f0 is not None:
+                f0 = np.asarray(f0, dtype=np.float64)[:p_len]
+                # Short contours are padded with NaN so they do not bias the median.
+                f0 = np.pad(f0, (0, p_len - f0.shape[0]), constant_values=np.nan)
+                f0_computation_stack.append(f0)
 
-        f0_computation_stack = [fc for fc in f0_computation_stack if fc is not None]
         f0_median_hybrid = None
         if len(f0_computation_stack) == 1:
             f0_median_hybrid = f0_computation_stack[0]
         else:
             f0_median_hybrid = np.nanmedian(f0_computation_stack, axis=0)
-        return f0_median_hybrid
+        return np.nan_to_num(f0_median_hybrid)
 
-    def get_f0(
-        self,
-        input_audio_path,
-        x,
-        p_len,
-        f0_up_key,
-        f0_method,
-        filter_radius,
-        hop_length,
-        f0_autotune,
-        inp_f0=None,
+    def get_f0_hybrid_method(
+        self, method, x, f0_min, f0_max, p_len, hop_length, filter_radius
     ):
         """
-        Estimates the fundamental frequency (F0) of a given audio signal using various methods.
+        Runs a single estimator of a hybrid F0 method.
+
+        Returns:
+            A tuple (f0, elapsed) of the contour (None for unknown methods) and the time taken in seconds.
+        """
+        start = time.perf_counter()
+        f0 = None
+        if method in ["crepe", "crepe-tiny"]:
+            f0 = self.get_f0_crepe(
+                x,
+                f0_min,
+                f0_max,
+                p_len,
+                int(hop_length),
+                "tiny" if method == "crepe-tiny" else "full",
+            )
+        elif method == "rmvpe":
+            model_rmvpe = predictor_registry.get(
+                "rmvpe", self.device, is_half=self.is_half, **self.rmvpe_options
+            )
+            f0 = model_rmvpe.infer_from_audio(x, thred=0.03)
+            f0 = f0[1:]
+        elif method == "fcpe":
+            model_fcpe = predictor_registry.get(
+                "fcpe",
+                self.device,
+                f0_min=int(f0_min),
+                f0_max=int(f0_max),
+                sampling_rate=self.sample_rate,
+                threshold=0.03,
+            )
+            f0 = model_fcpe.compute_f0(x, p_len=p_len)
+        elif method in ["pm", "harvest", "dio"]:
+            f0 = self.compute_f0(None, x, p_len, method, filter_radius, hop_length)
+        return f0, time.perf_counter() - start
+
+    def compute_f0(
+        self, input_audio_path, x, p_len, f0_method, filter_radius, hop_length
+    ):
+        """
+        Estimates the raw F0 contour of an audio signal, before pitch shifting and autotune.
 
         Args:
             input_audio_path: Path to the input audio file.
             x: The input audio signal as a NumPy array.
             p_len: Desired length of the F0 output.
-            f0_up_key: Key to adjust the pitch of the F0 contour.
             f0_method: Method to use for F0 estimation (e.g., "pm", "harvest", "crepe").
             filter_radius: Radius for median filtering the F0 contour.
             hop_length: Hop length for F0 estimation methods.
-            f0_autotune: Whether to apply autotune to the F0 contour.
-            inp_f0: Optional input F0 contour to use instead of estimating.
 
         Returns:
-            A tuple containing the quantized F0 contour and the original F0 contour.
+            The F0 contour in Hz.
         """
-        global input_audio_path2wav
         if f0_method == "pm":
             f0 = (
                 parselmouth.Sound(x, self.sample_rate)
@@ -381,21 +451,16 @@ class Pipeline:
                     f0, [[pad_size, p_len - len(f0) - pad_size]], mode="constant"
                 )
         elif f0_method == "harvest":
-            input_audio_path2wav[input_audio_path] = x.astype(np.double)
-            f0 = self.get_f0_harvest(
-                input_audio_path, self.sample_rate, self.f0_max, self.f0_min, 10
+            params = ("harvest", self.sample_rate, self.f0_max, self.f0_min, 10)
+            f0 = f0_cache.get_or_compute(
+                x, params, self.get_f0_harvest, x.astype(np.double), *params[1:]
             )
             if int(filter_radius) > 2:
                 f0 = signal.medfilt(f0, 3)
         elif f0_method == "dio":
-            f0, t = pyworld.dio(
-                x.astype(np.double),
-                fs=self.sample_rate,
-                f0_ceil=self.f0_max,
-                f0_floor=self.f0_min,
-                frame_period=10,
+            f0 = world_extractor.compute_f0(
+                "dio", x, self.sample_rate, self.f0_min, self.f0_max, 10
             )
-            f0 = pyworld.stonemask(x.astype(np.double), f0, t, self.sample_rate)
             f0 = signal.medfilt(f0, 3)
         elif f0_method == "crepe":
             f0 = self.get_f0_crepe(x, self.f0_min, self.f0_max, p_len, int(hop_length))
@@ -404,27 +469,21 @@ class Pipeline:
                 x, self.f0_min, self.f0_max, p_len, int(hop_length), "tiny"
             )
         elif f0_method == "rmvpe":
-            self.model_rmvpe = RMVPE0Predictor(
-                os.path.join("rvc", "models", "predictors", "rmvpe.pt"),
-                is_half=self.is_half,
-                device=self.device,
+            model_rmvpe = predictor_registry.get(
+                "rmvpe", self.device, is_half=self.is_half, **self.rmvpe_options
             )
-            f0 = self.model_rmvpe.infer_from_audio(x, thred=0.03)
+            f0 = model_rmvpe.infer_from_audio(x, thred=0.03)
         elif f0_method == "fcpe":
-            self.model_fcpe = FCPEF0Predictor(
-                os.path.join("rvc", "models", "predictors", "fcpe.pt"),
+            model_fcpe = predictor_registry.get(
+                "fcpe",
+                self.device,
                 f0_min=int(self.f0_min),
                 f0_max=int(self.f0_max),
-                dtype=torch.float32,
-                device=self.device,
                 sampling_rate=self.sample_rate,
                 threshold=0.03,
             )
-            f0 = self.model_fcpe.compute_f0(x, p_len=p_len)
-            del self.model_fcpe
-            gc.collect()
+            f0 = model_fcpe.compute_f0(x, p_len=p_len)
         elif "hybrid" in f0_method:
-            input_audio_path2wav[input_audio_path] = x.astype(np.double)
             f0 = self.get_f0_hybrid(
                 f0_method,
                 x,
@@ -432,10 +491,59 @@ class Pipeline:
                 self.f0_max,
                 p_len,
                 hop_length,
+                filter_radius,
             )
 
+        return f0
+
+    def get_f0(
+        self,
+        input_audio_path,
+        x,
+        p_len,
+        f0_up_key,
+        f0_method,
+        filter_radius,
+        hop_length,
+        f0_autotune,
+        inp_f0=None,
+        use_cache=True,
+        f0_autotune_strength=1.0,
+        f0_autotune_smoothing=0,
+    ):
+        """
+        Estimates the fundamental frequency (F0) of a given audio signal using various methods.
+
+        Args:
+            input_audio_path: Path to the input audio file.
+            x: The input audio signal as a NumPy array.
+            p_len: Desired length of the F0 output.
+            f0_up_key: Key to adjust the pitch of the F0 contour.
+            f0_method: Method to use for F0 estimation (e.g., "pm", "harvest", "crepe").
+            filter_radius: Radius for median filtering the F0 contour.
+            hop_length: Hop length for F0 estimation methods.
+            f0_autotune: Whether to apply autotune to the F0 contour.
+            inp_f0: Optional input F0 contour to use instead of estimating.
+            use_cache: Whether to look up the raw F0 contour in the feature cache.
+            f0_autotune_strength: Fraction of the autotune correction applied (0.0 to 1.0).
+            f0_autotune_smoothing: Frames the autotune correction is averaged over (0 snaps every frame).
+
+        Returns:
+            A tuple containing the quantized F0 contour and the original F0 contour.
+        """
+        args = (input_audio_path, x, p_len, f0_method, filter_radius, hop_length)
+        if use_cache:
+            params = (f0_method, int(hop_length), int(filter_radius), p_len)
+            f0 = feature_cache.get_or_compute("f0", x, params, self.compute_f0, *args)
+        else:
+            f0 = self.compute_f0(*args)
+        # Copy, the contour is modified in place below and cached arrays are read-only.
+        f0 = np.array(f0)
+
         if f0_autotune == "True":
-            f0 = Autotune.autotune_f0(self, f0)
+            f0 = self.autotune.autotune_f0(
+                f0, f0_autotune_strength, f0_autotune_smoothing
+            )
 
         f0 *= pow(2, f0_up_key / 12)
         tf0 = self.sample_rate // self.window
@@ -450,7 +558,7 @@ class Pipeline:
             f0[self.x_pad * tf0 : self.x_pad * tf0 + len(replace_f0)] = replace_f0[
                 :shape
             ]
-        f0bak = f0.copy()
+        f0bak = f0.astype(np.float32)
         f0_mel = 1127 * np.log(1 + f0 / 700)
         f0_mel[f0_mel > 0] = (f0_mel[f0_mel > 0] - self.f0_mel_min) * 254 / (
             self.f0_mel_max - self.f0_mel_min
@@ -461,6 +569,98 @@ class Pipeline:
 
         return f0_coarse, f0bak
 
+    def embed(self, model, audio0, version):
+        feats = torch.from_numpy(audio0)
+        if self.is_half:
+            feats = feats.half()
+        else:
+            feats = feats.float()
+        if feats.dim() == 2:
+            feats = feats.mean(-1)
+        assert feats.dim() == 1, feats.dim()
+        feats = feats.view(1, -1)
+        padding_mask = torch.BoolTensor(feats.shape).to(self.device).fill_(False)
+
+        inputs = {
+            "source": feats.to(self.device),
+            "padding_mask": padding_mask,
+            "output_layer": 9 if version == "v1" else 12,
+        }
+        with autocast(self.cpu_precision):
+            logits = model.extract_features(**inputs)
+            feats = model.final_proj(logits[0]) if version == "v1" else logits[0]
+        # Bring bf16 autocast outputs back to the pipeline dtype.
+        return feats.half() if self.is_half else feats.float()
+
+    def embed_batch(self, model, audios, version):
+        """
+        Extracts the HuBERT features of several audio segments, one extract_features pass per
+        segment length.
+
+        The convolutional front-end normalizes over the whole time axis, so padding would
+        change the features; segments of equal length are stacked instead, and each segment
+        gets the features it would get on its own.
+
+        Args:
+            model: The feature extractor model.
+            audios: The audio segments.
+            version: Model version ("v1" or "v2").
+
+        Returns:
+            A tuple (features, frames): a (batch, frames, channels) tensor on the pipeline
+            device, zero past the end of shorter segments, and the number of valid frames of
+            each segment.
+        """
+        dtype = torch.float16 if self.is_half else torch.float32
+        groups = {}
+        for i, audio0 in enumerate(audios):
+            groups.setdefault(audio0.shape[0], []).append(i)
+        outputs = [None] * len(audios)
+        with autocast(self.cpu_precision):
+            for indices in groups.values():
+                source = torch.from_numpy(np.stack([audios[i] for i in indices]))
+                source = source.to(self.device, dtype)
+                logits = model.extract_features(
+                    source=source,
+                    padding_mask=torch.zeros(
+                        source.shape, dtype=torch.bool, device=self.device
+                    ),
+                    output_layer=9 if version == "v1" else 12,
+                )
+                feats = model.final_proj(logits[0]) if version == "v1" else logits[0]
+                for i, feat in zip(indices, feats):
+                    outputs[i] = feat
+        n_frames = [output.shape[0] for output in outputs]
+        feats = outputs[0].new_zeros(len(audios), max(n_frames), outputs[0].shape[1])
+        for i, output in enumerate(outputs):
+            feats[i, : n_frames[i]] = output
+        return feats.to(dtype), n_frames
+
+    def extract_features(self, model, audio0, version, use_cache=True):
+        """
+        Extracts the HuBERT features of an audio segment (layer 9 projected for v1, layer 12 for v2).
+
+        Args:
+            model: The feature extractor model.
+            audio0: The input audio segment.
+            version: Model version ("v1" or "v2").
+            use_cache: Whether to look up the features in the feature cache.
+
+        Returns:
+            The features as a (1, frames, channels) tensor on the pipeline device.
+        """
+        embedder = getattr(model, "embedder_key", None)
+        if not use_cache or embedder is None or not feature_cache.enabled:
+            return self.embed(model, audio0, version)
+
+        def compute():
+            return self.embed(model, audio0, version)[0].float().cpu().numpy()
+
+        params = (embedder, 9 if version == "v1" else 12, version, self.cpu_precision)
+        feats = feature_cache.get_or_compute("features", audio0, params, compute)
+        feats = torch.from_numpy(np.array(feats)).unsqueeze(0).to(self.device)
+        return feats.half() if self.is_half else feats
+
     def voice_conversion(
         self,
         model,
@@ -474,6 +674,7 @@ class Pipeline:
         index_rate,
         version,
         protect,
+        use_cache=True,
     ):
         """
         Performs voice conversion on a given audio segment.
@@ -485,34 +686,18 @@ class Pipeline:
             audio0: The input audio segment.
             pitch: Quantized F0 contour for pitch guidance.
             pitchf: Original F0 contour for pitch guidance.
-            index: FAISS index for speaker embedding retrieval.
+            index: Retriever for speaker embedding retrieval.
             big_npy: Speaker embeddings stored in a NumPy array.
             index_rate: Blending rate for speaker embedding retrieval.
             version: Model version ("v1" or "v2").
             protect: Protection level for preserving the original pitch.
+            use_cache: Whether to look up the HuBERT features in the feature cache.
 
         Returns:
             The voice-converted audio segment.
         """
-        feats = torch.from_numpy(audio0)
-        if self.is_half:
-            feats = feats.half()
-        else:
-            feats = feats.float()
-        if feats.dim() == 2:
-            feats = feats.mean(-1)
-        assert feats.dim() == 1, feats.dim()
-        feats = feats.view(1, -1)
-        padding_mask = torch.BoolTensor(feats.shape).to(self.device).fill_(False)
-
-        inputs = {
-            "source": feats.to(self.device),
-            "padding_mask": padding_mask,
-            "output_layer": 9 if version == "v1" else 12,
-        }
         with torch.no_grad():
-            logits = model.extract_features(**inputs)
-            feats = model.final_proj(logits[0]) if version == "v1" else logits[0]
+            feats = self.extract_features(model, audio0, version, use_cache)
         if protect < 0.5 and pitch != None and pitchf != None:
             feats0 = feats.clone()
         if (
@@ -524,10 +709,8 @@ class Pipeline:
             if self.is_half:
                 npy = npy.astype("float32")
 
-            score, ix = index.search(npy, k=8)
-            weight = np.square(1 / score)
-            weight /= weight.sum(axis=1, keepdims=True)
-            npy = np.sum(big_npy[ix] * np.expand_dims(weight, axis=2), axis=1)
+            score, ix = index.search(npy)
+            npy = blend_neighbors(big_npy, score, ix)
 
             if self.is_half:
                 npy = npy.astype("float16")
@@ -556,7 +739,7 @@ class Pipeline:
             feats = feats * pitchff + feats0 * (1 - pitchff)
             feats = feats.to(feats0.dtype)
         p_len = torch.tensor([p_len], device=self.device).long()
-        with torch.no_grad():
+        with torch.no_grad(), autocast(self.cpu_precision):
             if pitch != None and pitchf != None:
                 audio1 = (
                     (net_g.infer(feats, p_len, pitch, pitchf, sid)[0][0, 0])
@@ -568,7 +751,7 @@ class Pipeline:
                 audio1 = (
                     (net_g.infer(feats, p_len, sid)[0][0, 0]).data.cpu().float().numpy()
                 )
-        del feats, p_len, padding_mask
+        del feats, p_len
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
         return audio1
@@ -594,6 +777,9 @@ class Pipeline:
         hop_length,
         f0_autotune,
         f0_file,
+        retrieval=None,
+        f0_autotune_strength=1.0,
+        f0_autotune_smoothing=0,
     ):
         """
         The main pipeline function for performing voice conversion.
@@ -618,39 +804,146 @@ class Pipeline:
             hop_length: Hop length for F0 estimation methods.
             f0_autotune: Whether to apply autotune to the F0 contour.
             f0_file: Path to a file containing an F0 contour to use.
+            retrieval: Optional retrieval settings (engine, k, nprobe, ef_search) overriding the defaults.
+            f0_autotune_strength: Fraction of the autotune correction applied (0.0 to 1.0).
+            f0_autotune_smoothing: Frames the autotune correction is averaged over (0 snaps every frame).
 
         Returns:
             The voice-converted audio signal.
         """
+        index, big_npy = self.load_index(file_index, index_rate, retrieval)
+        prepared = self.prepare(
+            audio,
+            input_audio_path,
+            f0_up_key,
+            f0_method,
+            pitch_guidance,
+            filter_radius,
+            hop_length,
+            f0_autotune,
+            f0_file,
+            f0_autotune_strength,
+            f0_autotune_smoothing,
+        )
+        return self.convert(
+            model,
+            net_g,
+            sid,
+            prepared,
+            index,
+            big_npy,
+            index_rate,
+            tgt_sr,
+            resample_sr,
+            rms_mix_rate,
+            version,
+            protect,
+        )
+
+    @staticmethod
+    def load_index(file_index, index_rate, retrieval=None):
+        """
+        Loads the retrieval engine over a FAISS index and its reconstructed embeddings from the shared index cache.
+
+        Args:
+            file_index: Path to the FAISS index file.
+            index_rate: Blending rate for speaker embedding retrieval.
+            retrieval: Optional dict of retrieval settings (engine, k, nprobe, ef_search) overriding default_retrieval.
+
+        Returns:
+            A tuple (retriever, big_npy), or (None, None) if no index is used.
+        """
         if file_index != "" and os.path.exists(file_index) == True and index_rate != 0:
+            params = {**default_retrieval, **(retrieval or {})}
             try:
-                index = faiss.read_index(file_index)
-                big_npy = index.reconstruct_n(0, index.ntotal)
+                search_index, big_npy = index_cache.get_engine(
+                    file_index, params["engine"]
+                )
+                return (
+                    Retriever(
+                        search_index,
+                        int(params["k"]),
+                        int(params["nprobe"]),
+                        int(params["ef_search"]),
+                    ),
+                    big_npy,
+                )
             except Exception as error:
                 print(error)
-                index = big_npy = None
-        else:
-            index = big_npy = None
-        audio = signal.filtfilt(bh, ah, audio)
-        audio_pad = np.pad(audio, (self.window // 2, self.window // 2), mode="reflect")
+        return None, None
+
+    def split_points(self, audio):
+        """
+        Finds the sample positions where a long input is cut into segments.
+
+        Around every multiple of t_center, the cut is placed where the sum of the signal over
+        one window is closest to zero, within t_query samples on either side.
+
+        Args:
+            audio: The filtered input audio signal.
+
+        Returns:
+            A list of cut positions in samples (empty when the input fits in one segment).
+        """
+        if audio.shape[0] + self.window <= self.t_max:
+            return []
+        n = audio.shape[0]
+        half = self.window // 2
         opt_ts = []
-        if audio_pad.shape[0] > self.t_max:
-            audio_sum = np.zeros_like(audio)
-            for i in range(self.window):
-                audio_sum += audio_pad[i : i - self.window]
-            for t in range(self.t_center, audio.shape[0], self.t_center):
-                opt_ts.append(
-                    t
-                    - self.t_query
-                    + np.where(
-                        np.abs(audio_sum[t - self.t_query : t + self.t_query])
-                        == np.abs(audio_sum[t - self.t_query : t + self.t_query]).min()
-                    )[0][0]
-                )
-        s = 0
-        audio_opt = []
-        t = None
+        # Only the query windows are analysed, so memory does not grow with the input length.
+        for t in range(self.t_center, n, self.t_center):
+            start, end = t - self.t_query, min(t + self.t_query, n)
+            # Samples of the input reflect-padded by half a window on both sides.
+            idx = np.arange(start - half, end + self.window - half - 1)
+            idx = np.abs(idx)
+            idx = np.where(idx > n - 1, 2 * (n - 1) - idx, idx)
+            # Box filter of length window via a cumulative sum.
+            cumsum = np.concatenate([[0.0], np.cumsum(audio[idx])])
+            audio_sum = np.abs(cumsum[self.window :] - cumsum[: -self.window])
+            opt_ts.append(start + int(audio_sum.argmin()))
+        return opt_ts
+
+    def prepare(
+        self,
+        audio,
+        input_audio_path,
+        f0_up_key,
+        f0_method,
+        pitch_guidance,
+        filter_radius,
+        hop_length,
+        f0_autotune,
+        f0_file,
+        f0_autotune_strength=1.0,
+        f0_autotune_smoothing=0,
+    ):
+        """
+        Runs the CPU-side analysis of an input signal: filtering, split-point search and F0 estimation.
+
+        The result is consumed by convert, which lets batch inference overlap the analysis of
+        one file with the synthesis of another.
+
+        Args:
+            audio: The input audio signal.
+            input_audio_path: Path to the input audio file.
+            f0_up_key: Key to adjust the pitch of the F0 contour.
+            f0_method: Method to use for F0 estimation.
+            pitch_guidance: Whether to use pitch guidance during voice conversion.
+            filter_radius: Radius for median filtering the F0 contour.
+            hop_length: Hop length for F0 estimation methods.
+            f0_autotune: Whether to apply autotune to the F0 contour.
+            f0_file: Path to a file containing an F0 contour to use.
+            f0_autotune_strength: Fraction of the autotune correction applied (0.0 to 1.0).
+            f0_autotune_smoothing: Frames the autotune correction is averaged over (0 snaps every frame).
+
+        Returns:
+            A tuple (audio, audio_pad, opt_ts, pitch, pitchf).
+        """
+        audio = signal.filtfilt(bh, ah, audio)
+        opt_ts = self.split_points(audio)
         audio_pad = np.pad(audio, (self.t_pad, self.t_pad), mode="reflect")
+        # Keep a view instead of a second full-length copy of the filtered input.
+        audio = audio_pad[self.t_pad : audio_pad.shape[0] - self.t_pad]
         p_len = audio_pad.shape[0] // self.window
         inp_f0 = None
         if hasattr(f0_file, "name") == True:
@@ -663,7 +956,6 @@ class Pipeline:
                 inp_f0 = np.array(inp_f0, dtype="float32")
             except Exception as error:
                 print(error)
-        sid = torch.tensor(sid, device=self.device).unsqueeze(0).long()
         pitch, pitchf = None, None
         if pitch_guidance == 1:
             pitch, pitchf = self.get_f0(
@@ -676,6 +968,8 @@ class Pipeline:
                 hop_length,
                 f0_autotune,
                 inp_f0,
+                f0_autotune_strength=f0_autotune_strength,
+                f0_autotune_smoothing=f0_autotune_smoothing,
             )
             pitch = pitch[:p_len]
             pitchf = pitchf[:p_len]
@@ -683,77 +977,319 @@ class Pipeline:
                 pitchf = pitchf.astype(np.float32)
             pitch = torch.tensor(pitch, device=self.device).unsqueeze(0).long()
             pitchf = torch.tensor(pitchf, device=self.device).unsqueeze(0).float()
+        return audio, audio_pad, opt_ts, pitch, pitchf
+
+    def segments(self, prepared):
+        """
+        Splits a prepared signal into the padded segments converted by voice_conversion.
+
+        Args:
+            prepared: The tuple returned by prepare.
+
+        Returns:
+            A list of (audio segment, pitch, pitchf) tuples; pitch and pitchf are None without pitch guidance.
+        """
+        audio, audio_pad, opt_ts, pitch, pitchf = prepared
+        segments = []
+        s = 0
+        t = None
         for t in opt_ts:
             t = t // self.window * self.window
-            if pitch_guidance == 1:
-                audio_opt.append(
-                    self.voice_conversion(
-                        model,
-                        net_g,
-                        sid,
-                        audio_pad[s : t + self.t_pad2 + self.window],
-                        pitch[:, s // self.window : (t + self.t_pad2) // self.window],
-                        pitchf[:, s // self.window : (t + self.t_pad2) // self.window],
-                        index,
-                        big_npy,
-                        index_rate,
-                        version,
-                        protect,
-                    )[self.t_pad_tgt : -self.t_pad_tgt]
-                )
-            else:
-                audio_opt.append(
-                    self.voice_conversion(
-                        model,
-                        net_g,
-                        sid,
-                        audio_pad[s : t + self.t_pad2 + self.window],
-                        None,
-                        None,
-                        index,
-                        big_npy,
-                        index_rate,
-                        version,
-                        protect,
-                    )[self.t_pad_tgt : -self.t_pad_tgt]
+            segments.append(
+                (
+                    audio_pad[s : t + self.t_pad2 + self.window],
+                    (
+                        pitch[:, s // self.window : (t + self.t_pad2) // self.window]
+                        if pitch is not None
+                        else None
+                    ),
+                    (
+                        pitchf[:, s // self.window : (t + self.t_pad2) // self.window]
+                        if pitchf is not None
+                        else None
+                    ),
                 )
+            )
             s = t
-        if pitch_guidance == 1:
-            audio_opt.append(
-                self.voice_conversion(
-                    model,
-                    net_g,
-                    sid,
-                    audio_pad[t:],
-                    pitch[:, t // self.window :] if t is not None else pitch,
-                    pitchf[:, t // self.window :] if t is not None else pitchf,
-                    index,
-                    big_npy,
-                    index_rate,
-                    version,
-                    protect,
-                )[self.t_pad_tgt : -self.t_pad_tgt]
+        segments.append(
+            (
+                audio_pad[t:],
+                (
+                    pitch[:, t // self.window :]
+                    if t is not None and pitch is not None
+                    else pitch
+                ),
+                (
+                    pitchf[:, t // self.window :]
+                    if t is not None and pitchf is not None
+                    else pitchf
+                ),
             )
-        else:
-            audio_opt.append(
-                self.voice_conversion(
+        )
+        return segments
+
+    def convert(
+        self,
+        model,
+        net_g,
+        sid,
+        prepared,
+        index,
+        big_npy,
+        index_rate,
+        tgt_sr,
+        resample_sr,
+        rms_mix_rate,
+        version,
+        protect,
+    ):
+        """
+        Converts a prepared signal segment by segment and post-processes the result.
+
+        Args:
+            model: The feature extractor model.
+            net_g: The generative model for synthesizing speech.
+            sid: Speaker ID for the target voice.
+            prepared: The tuple returned by prepare.
+            index: Retriever for speaker embedding retrieval.
+            big_npy: Speaker embeddings stored in a NumPy array.
+            index_rate: Blending rate for speaker embedding retrieval.
+            tgt_sr: Target sampling rate for the output audio.
+            resample_sr: Resampling rate for the output audio.
+            rms_mix_rate: Blending rate for adjusting the RMS level of the output audio.
+            version: Model version.
+            protect: Protection level for preserving the original pitch.
+
+        Returns:
+            The voice-converted audio signal.
+        """
+        sid = torch.tensor(sid, device=self.device).unsqueeze(0).long()
+        # Converted segments are written into one buffer sized for the whole input
+        # instead of being collected and concatenated.
+        audio_opt = np.empty(
+            prepared[0].shape[0] // self.window * (tgt_sr // 100), dtype=np.float32
+        )
+        offset = 0
+        for audio0, pitch, pitchf in self.segments(prepared):
+            audio1 = self.voice_conversion(
+                model,
+                net_g,
+                sid,
+                audio0,
+                pitch,
+                pitchf,
+                index,
+                big_npy,
+                index_rate,
+                version,
+                protect,
+            )[self.t_pad_tgt : -self.t_pad_tgt]
+            if offset + audio1.shape[0] > audio_opt.shape[0]:
+                audio_opt = np.resize(audio_opt, offset + audio1.shape[0])
+            audio_opt[offset : offset + audio1.shape[0]] = audio1
+            offset += audio1.shape[0]
+        return self.finalize(
+            prepared[0], audio_opt[:offset], tgt_sr, resample_sr, rms_mix_rate
+        )
+
+    def convert_batch(
+        self,
+        model,
+        net_g,
+        sid,
+        prepared_list,
+        index,
+        big_npy,
+        index_rate,
+        tgt_sr,
+        resample_sr,
+        rms_mix_rate,
+        version,
+        protect,
+        batch_size=8,
+        bucket_ratio=1.25,
+    ):
+        """
+        Converts several prepared signals at once, batching their segments across inputs.
+
+        Segments are sorted by length and grouped into buckets whose longest member is at most
+        bucket_ratio times the shortest, so padding waste stays bounded. Segments of equal
+        length share a feature extraction pass (see embed_batch), each bucket runs as one
+        synthesis call, and the results are scattered back per input.
+
+        Args:
+            model: The feature extractor model.
+            net_g: The generative model for synthesizing speech.
+            sid: Speaker ID for the target voice.
+            prepared_list: A list of tuples returned by prepare.
+            index: Retriever for speaker embedding retrieval.
+            big_npy: Speaker embeddings stored in a NumPy array.
+            index_rate: Blending rate for speaker embedding retrieval.
+            tgt_sr: Target sampling rate for the output audio.
+            resample_sr: Resampling rate for the output audio.
+            rms_mix_rate: Blending rate for adjusting the RMS level of the output audio.
+            version: Model version.
+            protect: Protection level for preserving the original pitch.
+            batch_size: Maximum number of segments per forward pass.
+            bucket_ratio: Maximum ratio between the longest and shortest segment of a bucket.
+
+        Returns:
+            A list with the voice-converted audio signal of each input.
+        """
+        segments_list = [self.segments(prepared) for prepared in prepared_list]
+        jobs = [
+            (i, j, segment)
+            for i, segments in enumerate(segments_list)
+            for j, segment in enumerate(segments)
+        ]
+        jobs.sort(key=lambda job: job[2][0].shape[0])
+        outputs = [[None] * len(segments) for segments in segments_list]
+
+        bucket = []
+        for job in jobs + [None]:
+            if bucket and (
+                job is None
+                or len(bucket) == batch_size
+                or job[2][0].shape[0] > bucket[0][2][0].shape[0] * bucket_ratio
+            ):
+                results = self.voice_conversion_batch(
                     model,
                     net_g,
                     sid,
-                    audio_pad[t:],
-                    None,
-                    None,
+                    [segment for _, _, segment in bucket],
                     index,
                     big_npy,
                     index_rate,
                     version,
                     protect,
-                )[self.t_pad_tgt : -self.t_pad_tgt]
+                )
+                for (i, j, _), audio1 in zip(bucket, results):
+                    outputs[i][j] = audio1[self.t_pad_tgt : -self.t_pad_tgt]
+                bucket = []
+            if job is not None:
+                bucket.append(job)
+
+        return [
+            self.finalize(prepared[0], audio_opt, tgt_sr, resample_sr, rms_mix_rate)
+            for prepared, audio_opt in zip(prepared_list, outputs)
+        ]
+
+    def voice_conversion_batch(
+        self,
+        model,
+        net_g,
+        sid,
+        segments,
+        index,
+        big_npy,
+        index_rate,
+        version,
+        protect,
+    ):
+        """
+        Performs voice conversion on several audio segments in one padded batch.
+
+        Args:
+            model: The feature extractor model.
+            net_g: The generative model for synthesizing speech.
+            sid: Speaker ID for the target voice.
+            segments: A list of (audio segment, pitch, pitchf) tuples as returned by segments.
+            index: Retriever for speaker embedding retrieval.
+            big_npy: Speaker embeddings stored in a NumPy array.
+            index_rate: Blending rate for speaker embedding retrieval.
+            version: Model version ("v1" or "v2").
+            protect: Protection level for preserving the original pitch.
+
+        Returns:
+            A list with the voice-converted audio of each segment.
+        """
+        batch = len(segments)
+        lengths = [audio0.shape[0] for audio0, _, _ in segments]
+        pitch_guidance = segments[0][1] is not None and segments[0][2] is not None
+
+        with torch.no_grad():
+            feats, n_frames = self.embed_batch(
+                model, [audio0 for audio0, _, _ in segments], version
+            )
+
+        if protect < 0.5 and pitch_guidance:
+            feats0 = feats.clone()
+        if index is not None and big_npy is not None and index_rate != 0:
+            # One retrieval over the valid frames of every segment.
+            npy = torch.cat([feats[i, : n_frames[i]] for i in range(batch)])
+            npy = npy.cpu().numpy().astype("float32")
+            score, ix = index.search(npy)
+            npy = blend_neighbors(big_npy, score, ix)
+            retrieved = torch.zeros_like(feats)
+            offset = 0
+            for i in range(batch):
+                retrieved[i, : n_frames[i]] = torch.from_numpy(
+                    npy[offset : offset + n_frames[i]]
+                ).to(feats.dtype)
+                offset += n_frames[i]
+            feats = retrieved.to(self.device) * index_rate + (1 - index_rate) * feats
+
+        feats = F.interpolate(feats.permute(0, 2, 1), scale_factor=2).permute(0, 2, 1)
+        if protect < 0.5 and pitch_guidance:
+            feats0 = F.interpolate(feats0.permute(0, 2, 1), scale_factor=2).permute(
+                0, 2, 1
             )
-        audio_opt = np.concatenate(audio_opt)
+        p_lens = [min(lengths[i] // self.window, 2 * n_frames[i]) for i in range(batch)]
+        if pitch_guidance:
+            p_lens = [min(p_lens[i], segments[i][1].shape[1]) for i in range(batch)]
+        max_p_len = max(p_lens)
+        feats = feats[:, :max_p_len]
+
+        pitch = pitchf = None
+        if pitch_guidance:
+            pitch = torch.zeros(batch, max_p_len, dtype=torch.long, device=self.device)
+            pitchf = torch.zeros(batch, max_p_len, device=self.device)
+            for i, (_, pitch_i, pitchf_i) in enumerate(segments):
+                pitch[i, : p_lens[i]] = pitch_i[0, : p_lens[i]]
+                pitchf[i, : p_lens[i]] = pitchf_i[0, : p_lens[i]]
+
+        if protect < 0.5 and pitch_guidance:
+            feats0 = feats0[:, :max_p_len]
+            pitchff = pitchf.clone()
+            pitchff[pitchf > 0] = 1
+            pitchff[pitchf < 1] = protect
+            pitchff = pitchff.unsqueeze(-1)
+            feats = feats * pitchff + feats0 * (1 - pitchff)
+            feats = feats.to(feats0.dtype)
+
+        sid = torch.full((batch,), int(sid), device=self.device).long()
+        p_len = torch.tensor(p_lens, device=self.device).long()
+        with torch.no_grad(), autocast(self.cpu_precision):
+            if pitch_guidance:
+                audio1 = net_g.infer(feats, p_len, pitch, pitchf, sid)[0]
+            else:
+                audio1 = net_g.infer(feats, p_len, sid)[0]
+            audio1 = audio1[:, 0].data.cpu().float().numpy()
+        upp = audio1.shape[1] // max_p_len
+        del feats, p_len
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        return [audio1[i, : p_lens[i] * upp] for i in range(batch)]
+
+    def finalize(self, audio, audio_opt, tgt_sr, resample_sr, rms_mix_rate):
+        """
+        Joins converted segments and applies RMS matching, resampling and int16 conversion.
+
+        Args:
+            audio: The filtered input signal returned by prepare.
+            audio_opt: The converted audio, or the list of converted segments.
+            tgt_sr: Target sampling rate for the output audio.
+            resample_sr: Resampling rate for the output audio.
+            rms_mix_rate: Blending rate for adjusting the RMS level of the output audio.
+
+        Returns:
+            The voice-converted audio signal.
+        """
+        if isinstance(audio_opt, list):
+            audio_opt = np.concatenate(audio_opt)
         if rms_mix_rate != 1:
             audio_opt = AudioProcessor.change_rms(
-                audio, self.sample_rate, audio_opt, tgt_sr, rms_mix_rate
+                audio, self.sample_rate, audio_opt, tgt_sr, rms_mix_rate, out=audio_opt
             )
         if resample_sr >= self.sample_rate and tgt_sr != resample_sr:
             audio_opt = librosa.resample(
@@ -763,8 +1299,7 @@ class Pipeline:
         max_int16 = 32768
         if audio_max > 1:
             max_int16 /= audio_max
-        audio_opt = (audio_opt * max_int16).astype(np.int16)
-        del pitch, pitchf, sid
+        audio_opt = np.multiply(audio_opt, max_int16, out=audio_opt).astype(np.int16)
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
         return audio_opt
@@ -0,0 +1,118 @@
+import numpy as np
+import soundfile as sf
+import noisereduce as nr
+
+from rvc.lib.utils import resample_audio
+
+# Rates the lossy and lossless export formats are written at, converted audio is
+# resampled to the nearest one.
+COMMON_SAMPLE_RATES = [8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000]
+# Frames per block when stream-encoding.
+STREAM_BLOCK_SIZE = 1 << 16
+
+
+def to_float(audio):
+    """
+    Returns a float32 copy of a signal with full scale at 1.0, scaling integer PCM by its range.
+    """
+    output = audio.astype(np.float32)
+    if np.issubdtype(audio.dtype, np.integer):
+        output /= -np.iinfo(audio.dtype).min
+    return output
+
+
+def remove_audio_noise(audio, sr, reduction_strength=0.7):
+    """
+    Removes noise from a signal using the NoiseReduce library.
+
+    Args:
+        audio (np.ndarray): The float signal.
+        sr (int): Sampling rate of the signal.
+        reduction_strength (float, optional): Strength of noise reduction (0.0 to 1.0).
+
+    Returns:
+        np.ndarray: The denoised signal, or the input signal if noise reduction fails.
+    """
+    try:
+        return nr.reduce_noise(y=audio, sr=sr, prop_decrease=reduction_strength)
+    except Exception as error:
+        print(f"Error cleaning audio: {error}")
+        return audio
+
+
+def export_sample_rate(sr, export_format):
+    """
+    Returns the rate a signal is written at, the nearest common rate for non-WAV formats.
+    """
+    if export_format == "WAV":
+        return sr
+    return min(COMMON_SAMPLE_RATES, key=lambda rate: abs(rate - sr))
+
+
+def normalize(audio, peak=0.99):
+    """
+    Scales a float signal down in place if denoising or resampling pushed it above peak.
+    """
+    audio_max = np.abs(audio).max(initial=0) / peak
+    if audio_max > 1:
+        audio /= audio_max
+    return audio
+
+
+def encode_audio(audio, sr, output_path, export_format, stream=False):
+    """
+    Writes a float signal to its final format.
+
+    Args:
+        audio (np.ndarray): The float signal.
+        sr (int): Sampling rate of the signal.
+        output_path (str): Path of the output file.
+        export_format (str): Output format (e.g. "WAV", "MP3", "FLAC").
+        stream (bool, optional): Feed the encoder block by block through one open file
+            instead of handing it the whole signal at once.
+    """
+    if not stream:
+        sf.write(output_path, audio, sr, format=export_format.lower())
+        return
+    with sf.SoundFile(
+        output_path, "w", samplerate=sr, channels=1, format=export_format.lower()
+    ) as output:
+        for start in range(0, audio.shape[0], STREAM_BLOCK_SIZE):
+            output.write(audio[start : start + STREAM_BLOCK_SIZE])
+
+
+def post_process_audio(
+    audio,
+    sr,
+    output_path,
+    clean_audio=False,
+    clean_strength=0.7,
+    export_format="WAV",
+    stream=False,
+):
+    """
+    Runs the post-processing chain (denoise, resample, normalize, encode) on a converted
+    signal in memory and writes the result once, with no intermediate WAV.
+
+    Args:
+        audio (np.ndarray): The converted signal, as returned by Pipeline.pipeline.
+        sr (int): Sampling rate of the signal.
+        output_path (str): Path of the output file, in the export format.
+        clean_audio (bool, optional): Whether to apply noise reduction.
+        clean_strength (float, optional): Noise reduction strength.
+        export_format (str, optional): Output format. Defaults to "WAV".
+        stream (bool, optional): Whether to stream-encode the output.
+
+    Returns:
+        str: The path of the written file.
+    """
+    audio = to_float(audio)
+    if clean_audio:
+        audio = remove_audio_noise(audio, sr, clean_strength)
+    target_sr = export_sample_rate(sr, export_format)
+    if target_sr != sr:
+        print(f"Converting audio to {export_format} format...")
+        audio = resample_audio(audio, sr, target_sr)
+    audio = normalize(np.asarray(audio, dtype=np.float32))
+    encode_audio(audio, target_sr, output_path, export_format, stream)
+    return output_path
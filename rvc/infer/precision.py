@@ -0,0 +1,85 @@
+import re
+
+import torch
+from torch.ao.nn.quantized import dynamic as nnqd
+
+CPU_PRECISIONS = ["fp32", "int8", "bf16"]
+
+
+def bf16_supported():
+    """
+    Returns whether the CPU has native bfloat16 support (AVX512-BF16 / AMX) in oneDNN.
+    """
+    try:
+        return torch.backends.mkldnn.is_available() and bool(
+            torch.ops.mkldnn._is_mkldnn_bf16_supported()
+        )
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def resolve_cpu_precision(precision):
+    """
+    Validates a requested CPU precision, falling back to fp32 when it cannot be used.
+
+    Args:
+        precision (str): One of CPU_PRECISIONS.
+
+    Returns:
+        str: The precision that will actually be used.
+    """
+    if precision not in CPU_PRECISIONS:
+        print(f"Unknown CPU precision {precision}, using fp32.")
+        return "fp32"
+    if precision == "bf16" and not bf16_supported():
+        print("This CPU has no native bfloat16 support, using fp32.")
+        return "fp32"
+    if (
+        precision == "int8"
+        and "fbgemm" not in torch.backends.quantized.supported_engines
+    ):
+        if "qnnpack" not in torch.backends.quantized.supported_engines:
+            print("No quantized engine available, using fp32.")
+            return "fp32"
+        torch.backends.quantized.engine = "qnnpack"
+    return precision
+
+
+def quantize_hubert(model):
+    """
+    Dynamically quantizes the feed-forward linear layers of a HuBERT model to int8, in place.
+
+    The convolutional waveform front-end is left in fp32, and so are the attention
+    projections: fairseq's MultiheadAttention reads q/k/v_proj.weight and .bias as tensors,
+    which quantized linear layers expose as methods.
+    """
+    qconfig_spec = {
+        name: torch.ao.quantization.default_dynamic_qconfig
+        for name, module in model.named_modules()
+        if re.fullmatch(r"(.+\.)?encoder\.layers\.\d+\.fc[12]", name)
+        and isinstance(module, torch.nn.Linear)
+    }
+    return torch.ao.quantization.quantize_dynamic(
+        model, qconfig_spec, dtype=torch.qint8, inplace=True
+    )
+
+
+def quantize_synthesizer(net_g):
+    """
+    Dynamically quantizes the linear and 1-D convolution layers of a synthesizer's text
+    encoder to int8, in place. The flow and the NSF decoder stay in fp32.
+    """
+    return torch.ao.quantization.quantize_dynamic(
+        net_g,
+        {"enc_p": torch.ao.quantization.default_dynamic_qconfig},
+        # Dynamic Conv1d is not in torch's default mapping, so it is listed explicitly.
+        mapping={torch.nn.Linear: nnqd.Linear, torch.nn.Conv1d: nnqd.Conv1d},
+        inplace=True,
+    )
+
+
+def autocast(precision):
+    """
+    Returns the autocast context for a CPU precision (bfloat16 autocast for "bf16", a no-op otherwise).
+    """
+    return torch.autocast("cpu", dtype=torch.bfloat16, enabled=precision == "bf16")
@@ -0,0 +1,206 @@
+import os
+
+import faiss
+import numpy as np
+
+RETRIEVAL_ENGINES = ["index", "auto", "exact", "hnsw", "ivfpq"]
+
+# Defaults for requests that do not set their own retrieval parameters.
+default_retrieval = {
+    "engine": os.environ.get("RVC_INDEX_ENGINE", "index"),
+    "k": int(os.environ.get("RVC_INDEX_K", "8")),
+    "nprobe": int(os.environ.get("RVC_INDEX_NPROBE", "1")),
+    "ef_search": int(os.environ.get("RVC_INDEX_EF_SEARCH", "64")),
+}
+# Largest embedding set the "auto" engine searches exhaustively.
+EXACT_MAX_VECTORS = int(os.environ.get("RVC_INDEX_EXACT_MAX", "10000"))
+# Smallest embedding set an IVF-PQ index is trained on, smaller sets are searched exactly.
+IVFPQ_MIN_VECTORS = 10000
+
+
+class ExactSearch:
+    """
+    Exhaustive L2 search over an embedding matrix, with distances computed as one matrix
+    product per block of queries.
+
+    Returns the same squared distances as the FAISS L2 indexes, so retrieval weights are
+    computed the same way for every engine.
+    """
+
+    def __init__(self, big_npy, block_elements=1 << 24):
+        self.big_npy = big_npy
+        self.norms = np.einsum("ij,ij->i", big_npy, big_npy)
+        self.ntotal = big_npy.shape[0]
+        # Queries per block, bounding the distance matrix to block_elements entries.
+        self.block_size = max(1, block_elements // self.ntotal)
+
+    def search(self, x, k, params=None):
+        k = min(k, self.ntotal)
+        scores = np.empty((x.shape[0], k), np.float32)
+        ids = np.empty((x.shape[0], k), np.int64)
+        for start in range(0, x.shape[0], self.block_size):
+            block = x[start : start + self.block_size]
+            distances = block @ self.big_npy.T
+            distances *= -2
+            distances += self.norms
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1)
+            rows = slice(start, start + block.shape[0])
+            ids[rows] = np.take_along_axis(nearest, order, axis=1)
+            scores[rows] = np.take_along_axis(nearest_distances, order, axis=1)
+            scores[rows] += np.einsum("ij,ij->i", block, block)[:, None]
+        np.maximum(scores, 0, out=scores)
+        return scores, ids
+
+
+class IndexEmbeddings:
+    """
+    The embeddings of a memory-mapped FAISS index, reconstructed per query instead of being
+    copied into RAM. Only the neighbours a query retrieves are read from the index file.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            # Reconstructing single ids from inverted lists needs an id -> list map.
+            ivf.make_direct_map()
+        self.shape = (index.ntotal, index.d)
+        self.dtype = np.dtype(np.float32)
+        self.nbytes = 0
+
+    def reconstruct(self, ids):
+        ids = np.ascontiguousarray(ids, dtype=np.int64)
+        if hasattr(self.index, "reconstruct_batch"):
+            return self.index.reconstruct_batch(ids)
+        return np.stack([self.index.reconstruct(int(i)) for i in ids])
+
+    def materialize(self):
+        # Engines other than the index itself are built from the full matrix.
+        return self.index.reconstruct_n(0, self.index.ntotal)
+
+
+def build_hnsw(big_npy):
+    index = faiss.IndexHNSWFlat(big_npy.shape[1], 32)
+    index.hnsw.efConstruction = 80
+    index.add(big_npy)
+    return index
+
+
+def build_ivfpq(big_npy):
+    # Same list count heuristic as the IVF-Flat indexes written by training, with
+    # 12 or 8 dimensions per sub-quantizer after an OPQ rotation.
+    n_ivf = min(int(16 * np.sqrt(big_npy.shape[0])), big_npy.shape[0] // 39)
+    m = big_npy.shape[1] // 12 if big_npy.shape[1] % 12 == 0 else big_npy.shape[1] // 8
+    index = faiss.index_factory(big_npy.shape[1], f"OPQ{m},IVF{n_ivf},PQ{m}")
+    index.train(big_npy)
+    index.add(big_npy)
+    return index
+
+
+def build_engine(engine, file_index, big_npy):
+    """
+    Builds the search index of a retrieval engine over an index's embeddings.
+
+    HNSW and IVF-PQ indexes are saved next to the source .index file and reused while
+    they are newer than it.
+
+    Args:
+        engine: "exact", "hnsw" or "ivfpq".
+        file_index: Path to the source .index file.
+        big_npy: The embeddings reconstructed from the source index.
+
+    Returns:
+        An object with a FAISS-style search(x, k, params=None) method.
+    """
+    if engine == "ivfpq" and big_npy.shape[0] < IVFPQ_MIN_VECTORS:
+        engine = "exact"
+    if engine == "exact":
+        return ExactSearch(big_npy)
+    path = f"{os.path.splitext(file_index)[0]}.{engine}.index"
+    if os.path.isfile(path) and os.path.getmtime(path) >= os.path.getmtime(file_index):
+        return faiss.read_index(path)
+    print(f"Building {engine} retrieval index for {file_index}...")
+    index = build_hnsw(big_npy) if engine == "hnsw" else build_ivfpq(big_npy)
+    faiss.write_index(index, path)
+    return index
+
+
+def search_params(index, nprobe, ef_search):
+    """
+    Returns the per-call FAISS search parameters for an index, so requests with different
+    settings can share it without changing its stored defaults.
+    """
+    if isinstance(index, faiss.IndexPreTransform):
+        index_params = search_params(
+            faiss.downcast_index(index.index), nprobe, ef_search
+        )
+        if index_params is None:
+            return None
+        params = faiss.SearchParametersPreTransform()
+        params.index_params = index_params
+        return params
+    if faiss.try_extract_index_ivf(index) is not None:
+        params = faiss.SearchParametersIVF()
+        params.nprobe = nprobe
+        return params
+    if isinstance(index, faiss.IndexHNSW):
+        params = faiss.SearchParametersHNSW()
+        params.efSearch = ef_search
+        return params
+    return None
+
+
+class Retriever:
+    """
+    Nearest-neighbour search over a voice's training embeddings with per-request parameters.
+
+    Args:
+        index: The search index (a FAISS index or ExactSearch).
+        k: Number of neighbours blended per frame.
+        nprobe: Inverted lists visited by IVF indexes.
+        ef_search: Candidate list size of HNSW indexes.
+    """
+
+    def __init__(self, index, k=8, nprobe=1, ef_search=64):
+        self.index = index
+        self.k = k
+        self.params = search_params(index, nprobe, ef_search)
+
+    def search(self, x):
+        if self.params is None:
+            return self.index.search(x, self.k)
+        return self.index.search(x, self.k, params=self.params)
+
+
+def blend_neighbors(big_npy, score, ix):
+    """
+    Averages the retrieved embeddings of every frame, weighted by inverse squared distance.
+
+    Neighbours are accumulated one rank at a time into a (frames, channels) buffer, so the
+    (frames, k, channels) array of all neighbours is never built.
+
+    Args:
+        big_npy: The embeddings the neighbour ids refer to (an array or IndexEmbeddings).
+        score: Squared distances of the neighbours, shape (frames, k).
+        ix: Neighbour ids, shape (frames, k), -1 where a search found fewer than k.
+
+    Returns:
+        np.ndarray: The blended embeddings, shape (frames, channels).
+    """
+    weight = np.square(1 / np.maximum(score, 1e-12))
+    weight[ix < 0] = 0
+    weight /= weight.sum(axis=1, keepdims=True)
+    if isinstance(big_npy, IndexEmbeddings):
+        # Reconstruct each retrieved embedding once and index into that subset.
+        ids, ix = np.unique(np.maximum(ix, 0), return_inverse=True)
+        ix = ix.reshape(weight.shape)
+        big_npy = big_npy.reconstruct(ids)
+    npy = np.zeros((ix.shape[0], big_npy.shape[1]), big_npy.dtype)
+    neighbours = np.empty_like(npy)
+    for rank in range(ix.shape[1]):
+        np.take(big_npy, ix[:, rank], axis=0, out=neighbours, mode="clip")
+        neighbours *= weight[:, rank : rank + 1]
+        npy += neighbours
+    return npy
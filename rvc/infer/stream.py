@@ -0,0 +1,279 @@
+import numpy as np
+import torch
+from scipy import signal
+
+from rvc.infer.pipeline import bh, ah
+
+STREAM_F0_METHODS = ["pm", "dio", "crepe", "crepe-tiny", "rmvpe", "fcpe"]
+
+
+class StreamingConverter:
+    """
+    Block-wise real-time voice conversion with bounded latency and constant memory.
+
+    Input PCM (16 kHz mono float) is appended to a fixed-size rolling buffer holding the
+    past context used by the feature extractor. Each processed block converts the whole
+    buffer, but only emits the audio of the newest block, delayed by the lookahead. Block
+    boundaries are joined with SOLA (synchronized overlap-add): the new output is shifted
+    by the offset that best matches the tail of the previous output, which keeps the NSF
+    excitation phase continuous, and then crossfaded into it.
+
+    Algorithmic latency is block_time + lookahead_time, 0.26 s with the defaults. The
+    lookahead must cover the crossfade plus two frames (crossfade_time + 0.02 s).
+    """
+
+    def __init__(
+        self,
+        vc,
+        model,
+        net_g,
+        sid,
+        version,
+        tgt_sr,
+        pitch_guidance=1,
+        f0_up_key=0,
+        f0_method="rmvpe",
+        filter_radius=3,
+        hop_length=128,
+        f0_autotune="False",
+        f0_autotune_strength=1.0,
+        f0_autotune_smoothing=0,
+        index=None,
+        big_npy=None,
+        index_rate=0,
+        protect=0.5,
+        block_time=0.2,
+        context_time=1.0,
+        f0_context_time=0.16,
+        lookahead_time=0.06,
+        crossfade_time=0.04,
+        sola_search_time=0.01,
+    ):
+        """
+        Initializes the streaming converter.
+
+        Args:
+            vc: The Pipeline instance of the loaded model.
+            model: The feature extractor model.
+            net_g: The generative model for synthesizing speech.
+            sid: Speaker ID for the target voice.
+            version: Model version ("v1" or "v2").
+            tgt_sr: Sampling rate of the model output.
+            pitch_guidance: Whether the model uses pitch guidance.
+            f0_up_key: Pitch shift value in semitones.
+            f0_method: F0 estimation method (one of STREAM_F0_METHODS).
+            filter_radius: Radius for median filtering of the F0 contour.
+            hop_length: Hop length for crepe F0 estimation.
+            f0_autotune: Whether to apply autotune to the F0 contour.
+            f0_autotune_strength: Fraction of the autotune correction applied (0.0 to 1.0).
+            f0_autotune_smoothing: Frames the autotune correction is averaged over (0 snaps every frame).
+            index: Retriever for speaker embedding retrieval.
+            big_npy: Speaker embeddings stored in a NumPy array.
+            index_rate: Blending rate for speaker embedding retrieval.
+            protect: Protection level for preserving the original pitch.
+            block_time: Duration in seconds of each processed block.
+            context_time: Duration in seconds of past audio given to the feature extractor.
+            f0_context_time: Duration in seconds of past audio given to the F0 estimator.
+            lookahead_time: Duration in seconds of future audio waited for before emitting a block,
+                at least crossfade_time + 0.02.
+            crossfade_time: Duration in seconds of the crossfade between blocks.
+            sola_search_time: Duration in seconds of the SOLA alignment search.
+        """
+        if pitch_guidance and f0_method not in STREAM_F0_METHODS:
+            raise ValueError(
+                f"F0 method {f0_method} is not supported for streaming, use one of {STREAM_F0_METHODS}"
+            )
+        self.vc = vc
+        self.model = model
+        self.net_g = net_g
+        self.sid = torch.tensor(sid, device=vc.device).unsqueeze(0).long()
+        self.version = version
+        self.tgt_sr = tgt_sr
+        self.pitch_guidance = pitch_guidance
+        self.f0_up_key = f0_up_key
+        self.f0_method = f0_method
+        self.filter_radius = filter_radius
+        self.hop_length = hop_length
+        self.f0_autotune = f0_autotune
+        self.f0_autotune_strength = f0_autotune_strength
+        self.f0_autotune_smoothing = f0_autotune_smoothing
+        self.index = index
+        self.big_npy = big_npy
+        self.index_rate = index_rate
+        self.protect = protect
+
+        # All sizes are whole F0 frames (window samples at 16 kHz).
+        window = vc.window
+
+        def frames(seconds):
+            return max(1, int(round(seconds * vc.sample_rate / window)))
+
+        self.block_frames = frames(block_time)
+        self.context_frames = frames(context_time)
+        self.f0_context_frames = frames(f0_context_time)
+        self.search_frames = frames(sola_search_time)
+        self.crossfade_frames = frames(crossfade_time)
+        # The crossfade tail of each block must already be converted when it is emitted;
+        # two extra frames cover the feature extractor dropping frames at the buffer end.
+        self.lookahead_frames = frames(lookahead_time)
+        if self.lookahead_frames < self.crossfade_frames + 2:
+            raise ValueError(
+                f"lookahead_time {lookahead_time} is shorter than crossfade_time + 0.02 "
+                f"({(self.crossfade_frames + 2) * window / vc.sample_rate:.2f})"
+            )
+        self.buffer_frames = (
+            self.context_frames
+            + self.search_frames
+            + self.block_frames
+            + self.lookahead_frames
+        )
+        self.upp = tgt_sr // 100
+        self.block = self.block_frames * window
+        self.crossfade = self.crossfade_frames * self.upp
+        self.search = self.search_frames * self.upp
+        self.block_out = self.block_frames * self.upp
+        fade = np.sin(0.5 * np.pi * np.linspace(0, 1, self.crossfade)) ** 2
+        self.fade_in = fade.astype(np.float32)
+        self.fade_out = 1 - self.fade_in
+        self.reset()
+
+    @property
+    def latency(self):
+        """
+        The algorithmic latency in seconds (block plus lookahead).
+        """
+        return (
+            (self.block_frames + self.lookahead_frames)
+            * self.vc.window
+            / self.vc.sample_rate
+        )
+
+    def reset(self):
+        """
+        Clears all streaming state (audio context, filter state, F0 history and SOLA buffer).
+        """
+        window = self.vc.window
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.audio = np.zeros(self.buffer_frames * window, dtype=np.float32)
+        self.zi = np.zeros(max(len(ah), len(bh)) - 1)
+        self.pitch = np.ones(self.buffer_frames, dtype=np.int64)
+        self.pitchf = np.zeros(self.buffer_frames, dtype=np.float32)
+        self.sola_buffer = None
+
+    def process(self, pcm):
+        """
+        Feeds PCM samples and returns the converted audio available so far.
+
+        Args:
+            pcm: 16 kHz mono audio samples of any length.
+
+        Returns:
+            The converted audio at tgt_sr as float32, a multiple of the block size long (possibly empty).
+        """
+        self.pending = np.concatenate([self.pending, np.asarray(pcm, np.float32)])
+        outputs = []
+        while self.pending.shape[0] >= self.block:
+            block, self.pending = (
+                self.pending[: self.block],
+                self.pending[self.block :],
+            )
+            outputs.append(self.process_block(block))
+        if not outputs:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(outputs)
+
+    def flush(self):
+        """
+        Pushes silence through the converter so the last input samples are emitted.
+
+        Returns:
+            The remaining converted audio at tgt_sr as float32.
+        """
+        remaining = self.pending.shape[0] + self.lookahead_frames * self.vc.window
+        blocks = -(-remaining // self.block)
+        output = self.process(np.zeros(blocks * self.block - self.pending.shape[0]))
+        return output
+
+    def process_block(self, block):
+        block, self.zi = signal.lfilter(bh, ah, block, zi=self.zi)
+        self.audio = np.roll(self.audio, -self.block)
+        self.audio[-self.block :] = block
+
+        pitch = pitchf = None
+        if self.pitch_guidance:
+            self.update_f0()
+            pitch = torch.from_numpy(self.pitch).to(self.vc.device).unsqueeze(0)
+            pitchf = torch.from_numpy(self.pitchf).to(self.vc.device).unsqueeze(0)
+
+        audio1 = self.vc.voice_conversion(
+            self.model,
+            self.net_g,
+            self.sid,
+            self.audio,
+            pitch,
+            pitchf,
+            self.index,
+            self.big_npy,
+            self.index_rate,
+            self.version,
+            self.protect,
+            use_cache=False,
+        )
+        end = (self.buffer_frames - self.lookahead_frames) * self.upp + self.crossfade
+        start = end - self.crossfade - self.block_out - self.search
+        if audio1.shape[0] < end:
+            audio1 = np.pad(audio1, (0, end - audio1.shape[0]))
+        return self.sola(audio1[start:end])
+
+    def update_f0(self):
+        # Only the newest block (plus a short context) goes through the F0 estimator,
+        # older frames are kept from previous calls.
+        window = self.vc.window
+        x = self.audio[-(self.f0_context_frames + self.block_frames) * window :]
+        p_len = x.shape[0] // window
+        pitch, pitchf = self.vc.get_f0(
+            None,
+            x,
+            p_len,
+            self.f0_up_key,
+            self.f0_method,
+            self.filter_radius,
+            self.hop_length,
+            self.f0_autotune,
+            use_cache=False,
+            f0_autotune_strength=self.f0_autotune_strength,
+            f0_autotune_smoothing=self.f0_autotune_smoothing,
+        )
+        self.pitch = np.roll(self.pitch, -self.block_frames)
+        self.pitchf = np.roll(self.pitchf, -self.block_frames)
+        self.pitch[-self.block_frames :] = pitch[:p_len][-self.block_frames :]
+        self.pitchf[-self.block_frames :] = pitchf[:p_len][-self.block_frames :]
+
+    def sola(self, audio):
+        """
+        Aligns a converted block to the previous one and crossfades them.
+
+        Args:
+            audio: Converted audio of length search + block + crossfade (at tgt_sr).
+
+        Returns:
+            The block of audio to emit.
+        """
+        offset = 0
+        if self.sola_buffer is not None and self.search > 0:
+            head = audio[: self.search + self.crossfade]
+            correlation = np.correlate(head, self.sola_buffer, mode="valid")
+            energy = np.sqrt(
+                np.convolve(head**2, np.ones(self.crossfade), mode="valid") + 1e-8
+            )
+            offset = int(np.argmax(correlation / energy))
+        output = audio[offset : offset + self.block_out].astype(np.float32)
+        if self.sola_buffer is not None:
+            output[: self.crossfade] = (
+                output[: self.crossfade] * self.fade_in
+                + self.sola_buffer * self.fade_out
+            )
+        self.sola_buffer = audio[
+            offset + self.block_out : offset + self.block_out + self.crossfade
+        ].astype(np.float32)
+        return output
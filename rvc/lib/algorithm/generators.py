@@ -188,44 +188,32 @@ class SineGen(torch.nn.Module):
             noise (torch.Tensor): Noise tensor with shape (batch_size, length, dim).
         """
         with torch.no_grad():
-            f0 = f0[:, None].transpose(1, 2)
-            f0_buf = torch.zeros(f0.shape[0], f0.shape[1], self.dim, device=f0.device)
-            # fundamental component
-            f0_buf[:, :, 0] = f0[:, :, 0]
-            for idx in range(self.harmonic_num):
-                f0_buf[:, :, idx + 1] = f0_buf[:, :, 0] * (
-                    idx + 2
-                )  # idx + 2: the (idx+1)-th overtone, (idx+2)-th harmonic
-            rad_values = (f0_buf / float(self.sampling_rate)) % 1
+            f0 = f0.unsqueeze(-1).float()
+            harmonics = torch.arange(1, self.dim + 1, device=f0.device).float()
+            rad_values = (f0 * harmonics / float(self.sampling_rate)) % 1
             rand_ini = torch.rand(
-                f0_buf.shape[0], f0_buf.shape[2], device=f0_buf.device
+                rad_values.shape[0], rad_values.shape[2], device=f0.device
             )
             rand_ini[:, 0] = 0
-            rad_values[:, 0, :] = rad_values[:, 0, :] + rand_ini
-            tmp_over_one = torch.cumsum(rad_values, 1)
-            tmp_over_one *= upp
-            tmp_over_one = torch.nn.functional.interpolate(
-                tmp_over_one.transpose(2, 1),
-                scale_factor=float(upp),
-                mode="linear",
-                align_corners=True,
-            ).transpose(2, 1)
-            rad_values = torch.nn.functional.interpolate(
-                rad_values.transpose(2, 1), scale_factor=float(upp), mode="nearest"
-            ).transpose(2, 1)
-            tmp_over_one %= 1
-            tmp_over_one_idx = (tmp_over_one[:, 1:, :] - tmp_over_one[:, :-1, :]) < 0
-            cumsum_shift = torch.zeros_like(rad_values)
-            cumsum_shift[:, 1:, :] = tmp_over_one_idx * -1.0
-            sine_waves = torch.sin(
-                torch.cumsum(rad_values + cumsum_shift, dim=1) * 2 * torch.pi
+            rad_values[:, 0, :] += rand_ini
+            # Phase at the start of every frame, accumulated at frame rate (in double
+            # precision where available) and wrapped to one period.
+            phase_dtype = torch.float32 if f0.device.type == "mps" else torch.float64
+            rad_frames = rad_values.to(phase_dtype)
+            frame_phase = ((torch.cumsum(rad_frames, 1) - rad_frames) * upp % 1).float()
+            # Sample phases within a frame advance by one increment per sample,
+            # computed as (batch, frames, upp, dim) so no frame-rate tensor is upsampled.
+            steps = torch.arange(1, upp + 1, device=f0.device).float().view(-1, 1)
+            sine_waves = torch.addcmul(
+                frame_phase.unsqueeze(2), steps, rad_values.unsqueeze(2)
             )
-            sine_waves = sine_waves * self.sine_amp
-            uv = self._f02uv(f0)
-            uv = torch.nn.functional.interpolate(
-                uv.transpose(2, 1), scale_factor=float(upp), mode="nearest"
-            ).transpose(2, 1)
+            sine_waves.mul_(2 * torch.pi).sin_().mul_(self.sine_amp)
+            uv = self._f02uv(f0).unsqueeze(2)
             noise_amp = uv * self.noise_std + (1 - uv) * self.sine_amp / 3
-            noise = noise_amp * torch.randn_like(sine_waves)
-            sine_waves = sine_waves * uv + noise
+            noise = torch.randn_like(sine_waves).mul_(noise_amp)
+            sine_waves.mul_(uv).add_(noise)
+            shape = (f0.shape[0], f0.shape[1] * upp, self.dim)
+            sine_waves = sine_waves.view(shape)
+            noise = noise.view(shape)
+            uv = uv.expand(-1, -1, upp, -1).reshape(f0.shape[0], -1, 1)
         return sine_waves, uv, noise
@@ -742,3 +742,11 @@ class SynthesizerV2_NoF0(torch.nn.Module):
         z = self.flow(z_p, x_mask, g=g, reverse=True)
         o = self.dec(z * x_mask, g=g)
         return o, x_mask, (z, z_p, m_p, logs_p)
+
+
+synthesizer_classes = {
+    ("v1", 0): SynthesizerV1_NoF0,
+    ("v1", 1): SynthesizerV1_F0,
+    ("v2", 0): SynthesizerV2_NoF0,
+    ("v2", 1): SynthesizerV2_F0,
+}
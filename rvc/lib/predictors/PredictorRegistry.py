@@ -0,0 +1,119 @@
+import os
+import threading
+from collections import OrderedDict
+
+import torch
+
+from rvc.lib.predictors.RMVPE import RMVPE0Predictor
+from rvc.lib.predictors.FCPE import FCPEF0Predictor
+
+predictors_dir = os.path.join("rvc", "models", "predictors")
+
+
+class PredictorRegistry:
+    """
+    A process-wide registry of loaded neural F0 predictors (RMVPE, FCPE).
+
+    Predictors are loaded lazily on first use and reused afterwards, keyed by method,
+    device, precision and constructor options.
+
+    Args:
+        max_predictors (int, optional): Maximum number of predictors kept loaded. Defaults to 4.
+    """
+
+    def __init__(self, max_predictors=4):
+        self.max_predictors = max_predictors
+        self.predictors = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, method, device, is_half=False, **kwargs):
+        """
+        Returns a loaded predictor, loading it on first use.
+
+        Args:
+            method (str): "rmvpe" or "fcpe".
+            device (str): Device to run the predictor on.
+            is_half (bool, optional): Whether to use half precision. Defaults to False.
+            **kwargs: Extra constructor options (e.g. max_frames for RMVPE, f0_min, f0_max,
+                threshold for FCPE).
+
+        Returns:
+            RMVPE0Predictor or FCPEF0Predictor: The shared predictor instance.
+        """
+        key = (method, str(device), bool(is_half), tuple(sorted(kwargs.items())))
+        with self.lock:
+            predictor = self.predictors.get(key)
+            if predictor is None:
+                predictor = self.load(method, device, is_half, **kwargs)
+                self.predictors[key] = predictor
+                while len(self.predictors) > self.max_predictors:
+                    self.predictors.popitem(last=False)
+            self.predictors.move_to_end(key)
+            return predictor
+
+    @staticmethod
+    def load(method, device, is_half, **kwargs):
+        if method == "rmvpe":
+            return RMVPE0Predictor(
+                os.path.join(predictors_dir, "rmvpe.pt"),
+                is_half=is_half,
+                device=device,
+                **kwargs,
+            )
+        elif method == "fcpe":
+            return FCPEF0Predictor(
+                os.path.join(predictors_dir, "fcpe.pt"),
+                dtype=torch.float16 if is_half else torch.float32,
+                device=device,
+                **kwargs,
+            )
+        raise ValueError(f"Unknown predictor method: {method}")
+
+    def unload(self, method=None, device=None):
+        """
+        Unloads predictors, optionally only those of a given method and/or device.
+
+        Args:
+            method (str, optional): Only unload predictors of this method.
+            device (str, optional): Only unload predictors on this device.
+        """
+        with self.lock:
+            for key in list(self.predictors):
+                if (method is None or key[0] == method) and (
+                    device is None or key[1] == str(device)
+                ):
+                    del self.predictors[key]
+        self.empty_cache()
+
+    def evict_for_memory(self, min_free_bytes, device):
+        """
+        Unloads least recently used predictors until the device has at least min_free_bytes available.
+
+        Args:
+            min_free_bytes (int): Required free memory in bytes.
+            device (str): Device whose memory is checked.
+        """
+        with self.lock:
+            while self.predictors and available_memory(device) < min_free_bytes:
+                self.predictors.popitem(last=False)
+                self.empty_cache()
+
+    @staticmethod
+    def empty_cache():
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+def available_memory(device):
+    """
+    Returns the free memory in bytes of a CUDA device, or the available system RAM otherwise.
+    """
+    if str(device).startswith("cuda") and torch.cuda.is_available():
+        return torch.cuda.mem_get_info(torch.device(device))[0]
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return float("inf")
+
+
+predictor_registry = PredictorRegistry()
@@ -467,6 +467,10 @@ class RMVPE0Predictor:
         model_path (str): Path to the RMVPE0 model file.
         is_half (bool): Whether to use half-precision floating-point numbers.
         device (str, optional): Device to use for computation. Defaults to None, which uses CUDA if available.
+        max_frames (int, optional): Frame budget above which inputs are processed in chunks. Defaults to 32000 (320 s).
+        chunk_frames (int, optional): Frames per chunk in chunked mode (rounded down to a multiple of 32). Defaults to 4096.
+        overlap_frames (int, optional): Frames shared, and crossfaded, by consecutive chunks. Defaults to 64.
+        chunk_batch_size (int, optional): Number of chunks run per forward pass. Defaults to 1.
 
     Attributes:
         model (nn.Module): The RMVPE0 model.
@@ -475,7 +479,16 @@ class RMVPE0Predictor:
         device (str): Device used for computation.
     """
 
-    def __init__(self, model_path, is_half, device=None):
+    def __init__(
+        self,
+        model_path,
+        is_half,
+        device=None,
+        max_frames=32000,
+        chunk_frames=4096,
+        overlap_frames=64,
+        chunk_batch_size=1,
+    ):
         self.resample_kernel = {}
         model = E2E(4, 1, (2, 2))
         ckpt = torch.load(model_path, map_location="cpu")
@@ -495,6 +508,11 @@ class RMVPE0Predictor:
         self.model = self.model.to(device)
         cents_mapping = 20 * np.arange(N_CLASS) + 1997.3794084376191
         self.cents_mapping = np.pad(cents_mapping, (4, 4))
+        self.max_frames = max_frames
+        self.chunk_frames = max(32, chunk_frames // 32 * 32)
+        # At least one shared frame, the crossfade slices hidden[-overlap:].
+        self.overlap_frames = max(1, min(overlap_frames, self.chunk_frames // 2))
+        self.chunk_batch_size = chunk_batch_size
 
     def mel2hidden(self, mel):
         """
@@ -530,26 +548,111 @@ class RMVPE0Predictor:
         f0[f0 == 10] = 0
         return f0
 
-    def infer_from_audio(self, audio, thred=0.03):
+    def infer_from_audio(self, audio, thred=0.03, decode_on_device=False):
         """
         Infers F0 from audio.
 
         Args:
             audio (np.ndarray): Audio signal.
             thred (float, optional): Threshold for salience. Defaults to 0.03.
+            decode_on_device (bool, optional): Decode the salience on the model device instead of
+                copying it to NumPy first. Defaults to False.
 
         Returns:
             np.ndarray: F0 values.
         """
+        n_frames = audio.shape[0] // self.mel_extractor.hop_length + 1
+        if self.max_frames is not None and n_frames > self.max_frames:
+            return self.infer_from_audio_chunked(audio, thred=thred)
         audio = torch.from_numpy(audio).float().to(self.device).unsqueeze(0)
         mel = self.mel_extractor(audio, center=True)
         hidden = self.mel2hidden(mel)
+        if decode_on_device:
+            return self.decode_torch(hidden.squeeze(0).float(), thred=thred)
         hidden = hidden.squeeze(0).cpu().numpy()
         if self.is_half == True:
             hidden = hidden.astype("float32")
         f0 = self.decode(hidden, thred=thred)
         return f0
 
+    def infer_from_audio_chunked(self, audio, thred=0.03):
+        """
+        Infers F0 from long audio in overlapping chunks with bounded memory.
+
+        The mel-spectrogram and the network activations are computed for chunk_frames frames
+        at a time (chunk_batch_size chunks per forward pass). Consecutive chunks share
+        overlap_frames frames whose salience is linearly crossfaded, and finished frames are
+        decoded right away, so memory does not grow with the input length. The last chunk is
+        moved back to end on the last frame, so it is never shorter than the others; the
+        frames it shares with the previous chunk beyond the overlap are dropped.
+
+        Args:
+            audio (np.ndarray): Audio signal.
+            thred (float, optional): Threshold for salience. Defaults to 0.03.
+
+        Returns:
+            np.ndarray: F0 values, frame-aligned with infer_from_audio.
+        """
+        hop = self.mel_extractor.hop_length
+        n_fft = self.mel_extractor.n_fft
+        chunk, overlap = self.chunk_frames, self.overlap_frames
+        n_frames = audio.shape[0] // hop + 1
+        # Same framing as the centered STFT of infer_from_audio.
+        padded = np.pad(audio, (n_fft // 2, n_fft // 2), mode="reflect")
+        starts = list(range(0, max(n_frames - overlap, 1), chunk - overlap))
+        if len(starts) > 1:
+            starts[-1] = n_frames - chunk
+        ramp = torch.linspace(0, 1, overlap + 2, device=self.device)[1:-1, None]
+
+        f0 = []
+        tail = None
+        emitted = 0
+        for i in range(0, len(starts), self.chunk_batch_size):
+            group = starts[i : i + self.chunk_batch_size]
+            for start, hidden in zip(group, self.chunk_hidden(padded, group, n_frames)):
+                # Frames before emitted are already decoded (or held in tail).
+                hidden = hidden[emitted - start :].float()
+                if tail is not None:
+                    hidden[:overlap] = tail * (1 - ramp) + hidden[:overlap] * ramp
+                if start + chunk >= n_frames:
+                    tail = None
+                else:
+                    tail = hidden[-overlap:]
+                    hidden = hidden[:-overlap]
+                emitted += hidden.shape[0]
+                f0.append(self.decode(hidden.cpu().numpy(), thred=thred))
+        return np.concatenate(f0)
+
+    def chunk_hidden(self, padded, starts, n_frames):
+        """
+        Runs the network on the chunks beginning at the given frames.
+
+        Args:
+            padded (np.ndarray): Audio reflect-padded by n_fft // 2 on both sides.
+            starts (list): First frame of each chunk.
+            n_frames (int): Total number of frames of the input.
+
+        Returns:
+            list: Hidden representation (frames, N_CLASS) of each chunk.
+        """
+        hop = self.mel_extractor.hop_length
+        n_fft = self.mel_extractor.n_fft
+        mels = []
+        for start in starts:
+            end = min(start + self.chunk_frames, n_frames)
+            segment = padded[start * hop : (end - 1) * hop + n_fft]
+            segment = torch.from_numpy(segment).float().to(self.device).unsqueeze(0)
+            mels.append(self.mel_extractor(segment, center=False))
+        full = [mel for mel in mels if mel.shape[-1] == self.chunk_frames]
+        hiddens = []
+        with torch.no_grad():
+            if full:
+                hiddens.extend(self.model(torch.cat(full)))
+        # A chunk is only shorter when the whole input is; it goes through the padded single path.
+        if len(full) < len(mels):
+            hiddens.append(self.mel2hidden(mels[-1])[0])
+        return hiddens
+
     def to_local_average_cents(self, salience, thred=0.05):
         """
         Converts salience to local average cents.
@@ -564,15 +667,10 @@ class RMVPE0Predictor:
         center = np.argmax(salience, axis=1)
         salience = np.pad(salience, ((0, 0), (4, 4)))
         center += 4
-        todo_salience = []
-        todo_cents_mapping = []
-        starts = center - 4
-        ends = center + 5
-        for idx in range(salience.shape[0]):
-            todo_salience.append(salience[:, starts[idx] : ends[idx]][idx])
-            todo_cents_mapping.append(self.cents_mapping[starts[idx] : ends[idx]])
-        todo_salience = np.array(todo_salience)
-        todo_cents_mapping = np.array(todo_cents_mapping)
+        # (frames, 9) indices of the bins around each frame's peak
+        window = center[:, None] + np.arange(-4, 5)
+        todo_salience = np.take_along_axis(salience, window, axis=1)
+        todo_cents_mapping = self.cents_mapping[window]
         product_sum = np.sum(todo_salience * todo_cents_mapping, 1)
         weight_sum = np.sum(todo_salience, 1)
         devided = product_sum / weight_sum
@@ -580,6 +678,30 @@ class RMVPE0Predictor:
         devided[maxx <= thred] = 0
         return devided
 
+    def decode_torch(self, hidden, thred=0.03):
+        """
+        Decodes hidden representation to F0 on the tensor's device.
+
+        Args:
+            hidden (torch.Tensor): Hidden representation of shape (frames, bins).
+            thred (float, optional): Threshold for salience. Defaults to 0.03.
+
+        Returns:
+            np.ndarray: F0 values.
+        """
+        cents_mapping = torch.as_tensor(
+            self.cents_mapping, dtype=hidden.dtype, device=hidden.device
+        )
+        maxx, center = torch.max(hidden, dim=1)
+        salience = F.pad(hidden, (4, 4))
+        window = center[:, None] + 4 + torch.arange(-4, 5, device=hidden.device)
+        todo_salience = torch.gather(salience, 1, window)
+        devided = (todo_salience * cents_mapping[window]).sum(1) / todo_salience.sum(1)
+        devided[maxx <= thred] = 0
+        f0 = 10 * (2 ** (devided / 1200))
+        f0[f0 == 10] = 0
+        return f0.cpu().numpy()
+
 
 # Define a class for BiGRU (bidirectional GRU)
 class BiGRU(nn.Module):
@@ -0,0 +1,164 @@
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import torch
+import torchcrepe
+
+from rvc.lib.predictors.PredictorRegistry import predictor_registry
+from rvc.lib.predictors.World import available_cpus
+
+
+def crepe_f0(x, f0_min, f0_max, p_len, hop_length, model="full", device="cpu"):
+    """
+    Estimates the F0 contour of a 16 kHz signal with Crepe.
+
+    Args:
+        x (np.ndarray): The input audio signal.
+        f0_min (float): Minimum F0 value to consider.
+        f0_max (float): Maximum F0 value to consider.
+        p_len (int): Desired length of the F0 output.
+        hop_length (int): Hop length for the Crepe model.
+        model (str, optional): Crepe model size to use ("full" or "tiny").
+        device (str, optional): Device to run the model on.
+
+    Returns:
+        np.ndarray: The F0 contour, interpolated to p_len frames.
+    """
+    x = x.astype(np.float32)
+    x /= np.quantile(np.abs(x), 0.999)
+    audio = torch.from_numpy(x).to(device, copy=True)
+    audio = torch.unsqueeze(audio, dim=0)
+    if audio.ndim == 2 and audio.shape[0] > 1:
+        audio = torch.mean(audio, dim=0, keepdim=True).detach()
+    audio = audio.detach()
+    pitch = torchcrepe.predict(
+        audio,
+        16000,
+        hop_length,
+        f0_min,
+        f0_max,
+        model,
+        batch_size=hop_length * 2,
+        device=device,
+        pad=True,
+    )
+    p_len = p_len or x.shape[0] // hop_length
+    source = np.array(pitch.squeeze(0).cpu().float().numpy())
+    source[source < 0.001] = np.nan
+    target = np.interp(
+        np.arange(0, len(source) * p_len, len(source)) / p_len,
+        np.arange(0, len(source)),
+        source,
+    )
+    return np.nan_to_num(target)
+
+
+def torch_f0(method, x, f0_min, f0_max, p_len, hop_length, rmvpe_options):
+    """
+    Runs one neural estimator of a hybrid F0 method on CPU.
+
+    Args:
+        method (str): "crepe", "crepe-tiny", "rmvpe" or "fcpe".
+        x (np.ndarray): The normalized input audio signal.
+        f0_min (float): Minimum F0 value to consider.
+        f0_max (float): Maximum F0 value to consider.
+        p_len (int): Desired length of the F0 output.
+        hop_length (int): Hop length for Crepe.
+        rmvpe_options (dict): Constructor options of the RMVPE predictor.
+
+    Returns:
+        tuple: The F0 contour and the time taken in seconds.
+    """
+    start = time.perf_counter()
+    if method in ["crepe", "crepe-tiny"]:
+        model = "tiny" if method == "crepe-tiny" else "full"
+        f0 = crepe_f0(x, f0_min, f0_max, p_len, int(hop_length), model)
+    elif method == "rmvpe":
+        model_rmvpe = predictor_registry.get("rmvpe", "cpu", **rmvpe_options)
+        f0 = model_rmvpe.infer_from_audio(x, thred=0.03)[1:]
+    else:
+        model_fcpe = predictor_registry.get(
+            "fcpe",
+            "cpu",
+            f0_min=int(f0_min),
+            f0_max=int(f0_max),
+            sampling_rate=16000,
+            threshold=0.03,
+        )
+        f0 = model_fcpe.compute_f0(x, p_len=p_len)
+    return f0, time.perf_counter() - start
+
+
+def set_num_threads(threads):
+    torch.set_num_threads(threads)
+
+
+class TorchF0Workers:
+    """
+    Worker processes running the neural estimators of a hybrid F0 method side by side on CPU.
+
+    Torch intra-op threads are shared by a whole process, so estimators running on threads of
+    one process would oversubscribe the CPUs. Each estimator instead gets a single-worker
+    process whose intra-op thread count is its share of the available CPUs. Workers keep their
+    models loaded between calls and are created once per (method, thread count).
+
+    Args:
+        cpus (int, optional): CPUs split between the estimators. Defaults to the CPUs available
+            to this process.
+    """
+
+    def __init__(self, cpus=None):
+        self.cpus = cpus or available_cpus()
+        self.pools = {}
+        self.lock = threading.Lock()
+
+    def threads_per_method(self, n_methods):
+        """
+        Returns the intra-op thread budget of each of n_methods concurrent estimators.
+        """
+        return max(1, self.cpus // n_methods)
+
+    def enabled(self, n_methods):
+        """
+        Whether n_methods neural estimators should run in worker processes.
+        """
+        return (
+            n_methods > 1
+            and self.cpus > 1
+            # Pool workers cannot start children.
+            and not multiprocessing.current_process().daemon
+        )
+
+    def get_pool(self, method, threads):
+        with self.lock:
+            pool = self.pools.get((method, threads))
+            if pool is None:
+                # Workers are not forked from a process already running torch/OpenMP threads.
+                start_method = (
+                    "forkserver"
+                    if "forkserver" in multiprocessing.get_all_start_methods()
+                    else "spawn"
+                )
+                pool = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context(start_method),
+                    initializer=set_num_threads,
+                    initargs=(threads,),
+                )
+                self.pools[(method, threads)] = pool
+            return pool
+
+    def submit(self, method, threads, *args):
+        """
+        Runs torch_f0(method, *args) in the worker of method with the given thread budget.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the (f0, elapsed) tuple.
+        """
+        return self.get_pool(method, threads).submit(torch_f0, method, *args)
+
+
+torch_f0_workers = TorchF0Workers()
@@ -0,0 +1,132 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyworld
+
+
+def world_f0(method, x, fs, f0_min, f0_max, frame_period):
+    """
+    Estimates the F0 contour of a signal with WORLD Harvest or Dio, refined by StoneMask.
+
+    Args:
+        method (str): "harvest" or "dio".
+        x (np.ndarray): The input audio signal as float64.
+        fs (int): Sampling rate of the signal.
+        f0_min (float): Minimum F0 value to consider.
+        f0_max (float): Maximum F0 value to consider.
+        frame_period (float): Frame period in milliseconds.
+
+    Returns:
+        np.ndarray: The F0 contour, one frame every frame_period starting at 0.
+    """
+    estimate = pyworld.harvest if method == "harvest" else pyworld.dio
+    f0, t = estimate(
+        x, fs=fs, f0_ceil=f0_max, f0_floor=f0_min, frame_period=frame_period
+    )
+    return pyworld.stonemask(x, f0, t, fs)
+
+
+def available_cpus():
+    # CPUs this process may run on, which can be fewer than os.cpu_count() under
+    # taskset or container CPU limits.
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class WorldF0Extractor:
+    """
+    Harvest/Dio F0 estimation of long signals split into overlapping windows on a process pool.
+
+    Each window is analysed with a margin of context on both sides, which is discarded when the
+    contours are stitched, so every output frame comes from the window where it is furthest from
+    an edge. Windows start on frame boundaries, so the result has the same frames as analysing the
+    whole signal at once.
+
+    Args:
+        processes (int, optional): Number of worker processes. Defaults to the CPUs available to
+            this process.
+        chunk_seconds (float, optional): Length of the part of each window that is kept. Defaults to 20.
+        margin_seconds (float, optional): Context analysed on each side of a window and then discarded. Defaults to 1.
+    """
+
+    def __init__(self, processes=None, chunk_seconds=20, margin_seconds=1):
+        self.processes = processes or available_cpus()
+        self.chunk_seconds = chunk_seconds
+        self.margin_seconds = margin_seconds
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def get_pool(self):
+        # Created once under a lock, concurrent first calls from API workers share it.
+        with self.lock:
+            if self.pool is None:
+                # Workers are not forked from a process already running torch/OpenMP threads.
+                method = (
+                    "forkserver"
+                    if "forkserver" in multiprocessing.get_all_start_methods()
+                    else "spawn"
+                )
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context(method),
+                )
+            return self.pool
+
+    def compute_f0(self, method, x, fs, f0_min, f0_max, frame_period):
+        """
+        Estimates the F0 contour of a signal, in parallel when it is long enough.
+
+        Args:
+            method (str): "harvest" or "dio".
+            x (np.ndarray): The input audio signal.
+            fs (int): Sampling rate of the signal.
+            f0_min (float): Minimum F0 value to consider.
+            f0_max (float): Maximum F0 value to consider.
+            frame_period (float): Frame period in milliseconds.
+
+        Returns:
+            np.ndarray: The F0 contour, with int(len(x) / hop) + 1 frames.
+        """
+        x = np.ascontiguousarray(x, dtype=np.double)
+        hop = fs * frame_period / 1000
+        chunk = int(self.chunk_seconds * fs / hop)
+        margin = int(self.margin_seconds * fs / hop)
+        n_frames = int(x.shape[0] / hop) + 1
+        if (
+            self.processes < 2
+            or hop != int(hop)
+            or n_frames < 2 * chunk
+            # Pool workers (e.g. per-file training extraction) cannot start children.
+            or multiprocessing.current_process().daemon
+        ):
+            return world_f0(method, x, fs, f0_min, f0_max, frame_period)
+
+        hop = int(hop)
+        starts = list(range(0, n_frames, chunk))
+        offsets = [max(0, start - margin) for start in starts]
+        futures = [
+            self.get_pool().submit(
+                world_f0,
+                method,
+                x[offset * hop : (start + chunk + margin) * hop],
+                fs,
+                f0_min,
+                f0_max,
+                frame_period,
+            )
+            for start, offset in zip(starts, offsets)
+        ]
+        f0 = np.zeros(n_frames)
+        for start, offset, future in zip(starts, offsets, futures):
+            end = min(start + chunk, n_frames)
+            f0[start:end] = future.result()[start - offset : end - offset]
+        return f0
+
+
+world_extractor = WorldF0Extractor(
+    processes=int(os.environ.get("RVC_WORLD_PROCESSES", "0")) or None
+)
@@ -0,0 +1,586 @@
+import os
+import sys
+import time
+import numpy as np
+
+now_dir = os.getcwd()
+sys.path.append(now_dir)
+
+# Timing only: each benchmark runs the legacy implementation and the optimized one on the
+# same input. Their outputs are compared by the tests (tests/), which import the legacy_*
+# functions below as references.
+
+
+def best_time(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(name, reference_time, optimized_time):
+    print(
+        f"{name}: reference {reference_time * 1000:.2f} ms, optimized {optimized_time * 1000:.2f} ms, "
+        f"speedup {reference_time / max(optimized_time, 1e-9):.1f}x"
+    )
+
+
+def legacy_autotune(note_dict, f0):
+    autotuned_f0 = np.zeros_like(f0)
+    for i, freq in enumerate(f0):
+        autotuned_f0[i] = min(note_dict, key=lambda x: abs(x - freq))
+    return autotuned_f0
+
+
+def legacy_local_average_cents(salience, cents_mapping, thred=0.03):
+    center = np.argmax(salience, axis=1)
+    salience = np.pad(salience, ((0, 0), (4, 4)))
+    center += 4
+    todo_salience = []
+    todo_cents_mapping = []
+    starts = center - 4
+    ends = center + 5
+    for idx in range(salience.shape[0]):
+        todo_salience.append(salience[:, starts[idx] : ends[idx]][idx])
+        todo_cents_mapping.append(cents_mapping[starts[idx] : ends[idx]])
+    todo_salience = np.array(todo_salience)
+    todo_cents_mapping = np.array(todo_cents_mapping)
+    devided = np.sum(todo_salience * todo_cents_mapping, 1) / np.sum(todo_salience, 1)
+    devided[np.max(salience, axis=1) <= thred] = 0
+    return devided
+
+
+def legacy_split_points(pipeline, audio):
+    audio_pad = np.pad(audio, (80, 80), mode="reflect")
+    audio_sum = np.zeros_like(audio)
+    for i in range(pipeline.window):
+        audio_sum += audio_pad[i : i - pipeline.window]
+    opt_ts = []
+    for t in range(pipeline.t_center, audio.shape[0], pipeline.t_center):
+        window = np.abs(audio_sum[t - pipeline.t_query : t + pipeline.t_query])
+        opt_ts.append(t - pipeline.t_query + np.where(window == window.min())[0][0])
+    return opt_ts
+
+
+def legacy_change_rms(source_audio, target_audio, rate):
+    import librosa
+    import torch
+    import torch.nn.functional as F
+
+    rms1 = librosa.feature.rms(y=source_audio, frame_length=16000, hop_length=8000)
+    rms2 = librosa.feature.rms(y=target_audio, frame_length=40000, hop_length=20000)
+    size = target_audio.shape[0]
+    rms1 = F.interpolate(
+        torch.from_numpy(rms1).float().unsqueeze(0), size=size, mode="linear"
+    ).squeeze()
+    rms2 = F.interpolate(
+        torch.from_numpy(rms2).float().unsqueeze(0), size=size, mode="linear"
+    ).squeeze()
+    rms2 = torch.maximum(rms2, torch.zeros_like(rms2) + 1e-6)
+    return (
+        target_audio * (torch.pow(rms1, 1 - rate) * torch.pow(rms2, rate - 1)).numpy()
+    )
+
+
+def legacy_sine_gen(sine_gen, f0, upp):
+    import torch
+    import torch.nn.functional as F
+
+    f0 = f0[:, None].transpose(1, 2)
+    f0_buf = torch.zeros(f0.shape[0], f0.shape[1], sine_gen.dim)
+    f0_buf[:, :, 0] = f0[:, :, 0]
+    for idx in range(sine_gen.harmonic_num):
+        f0_buf[:, :, idx + 1] = f0_buf[:, :, 0] * (idx + 2)
+    rad_values = (f0_buf / float(sine_gen.sampling_rate)) % 1
+    rand_ini = torch.rand(f0_buf.shape[0], f0_buf.shape[2])
+    rand_ini[:, 0] = 0
+    rad_values[:, 0, :] = rad_values[:, 0, :] + rand_ini
+    tmp_over_one = torch.cumsum(rad_values, 1) * upp
+    tmp_over_one = F.interpolate(
+        tmp_over_one.transpose(2, 1),
+        scale_factor=float(upp),
+        mode="linear",
+        align_corners=True,
+    ).transpose(2, 1)
+    rad_values = F.interpolate(
+        rad_values.transpose(2, 1), scale_factor=float(upp), mode="nearest"
+    ).transpose(2, 1)
+    tmp_over_one %= 1
+    tmp_over_one_idx = (tmp_over_one[:, 1:, :] - tmp_over_one[:, :-1, :]) < 0
+    cumsum_shift = torch.zeros_like(rad_values)
+    cumsum_shift[:, 1:, :] = tmp_over_one_idx * -1.0
+    sine_waves = torch.sin(
+        torch.cumsum(rad_values + cumsum_shift, dim=1) * 2 * torch.pi
+    )
+    sine_waves = sine_waves * sine_gen.sine_amp
+    uv = sine_gen._f02uv(f0)
+    uv = F.interpolate(
+        uv.transpose(2, 1), scale_factor=float(upp), mode="nearest"
+    ).transpose(2, 1)
+    noise_amp = uv * sine_gen.noise_std + (1 - uv) * sine_gen.sine_amp / 3
+    noise = noise_amp * torch.randn_like(sine_waves)
+    return sine_waves * uv + noise
+
+
+def legacy_blend(big_npy, score, ix):
+    weight = np.square(1 / score)
+    weight /= weight.sum(axis=1, keepdims=True)
+    return np.sum(big_npy[ix] * np.expand_dims(weight, axis=2), axis=1)
+
+
+def legacy_post_process(audio, sr, path, export_format):
+    # WAV write, re-read for denoising and re-decode for encoding.
+    import librosa
+    import noisereduce as nr
+    import soundfile as sf
+    from scipy.io import wavfile
+    from rvc.infer.postprocess import COMMON_SAMPLE_RATES
+
+    sf.write(path, audio, sr, format="WAV")
+    rate, data = wavfile.read(path)
+    sf.write(path, nr.reduce_noise(y=data, sr=rate, prop_decrease=0.7), sr)
+    audio, sample_rate = librosa.load(path, sr=None)
+    target_sr = min(COMMON_SAMPLE_RATES, key=lambda x: abs(x - sample_rate))
+    audio = librosa.resample(audio, orig_sr=sample_rate, target_sr=target_sr)
+    output_path = path.replace(".wav", f".{export_format.lower()}")
+    sf.write(output_path, audio, target_sr, format=export_format.lower())
+    return output_path
+
+
+def glide(seconds, sr=16000):
+    # A voiced glide with pauses, the test signal of the F0 benchmarks.
+    t = np.arange(int(seconds * sr)) / sr
+    f0 = 150 + 50 * np.sin(2 * np.pi * 0.3 * t)
+    return np.sin(2 * np.pi * np.cumsum(f0) / sr) * (np.sin(2 * np.pi * 0.5 * t) > -0.3)
+
+
+def noisy_tone(seconds, sr):
+    # A modulated tone with a noise floor, as int16 PCM, the post-processing test signal.
+    rng = np.random.default_rng(0)
+    t = np.arange(seconds * sr) / sr
+    audio = np.sin(2 * np.pi * 220 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 0.5 * t))
+    return ((audio * 0.5 + rng.standard_normal(t.shape[0]) * 0.01) * 32767).astype(
+        np.int16
+    )
+
+
+def load_reference_voice():
+    # Model-level benchmarks and tests need a voice model and reference clips from the environment.
+    model_path = os.environ.get("RVC_REFERENCE_MODEL")
+    audio_paths = os.environ.get("RVC_REFERENCE_AUDIO", "").split(os.pathsep)
+    audio_paths = [path for path in audio_paths if path]
+    if not model_path or not audio_paths:
+        print(
+            "Set RVC_REFERENCE_MODEL to a .pth model and RVC_REFERENCE_AUDIO to reference clips "
+            f"(separated by '{os.pathsep}')."
+        )
+        return None, None
+    return model_path, audio_paths
+
+
+def load_voice(converter, model_path):
+    # Loads the embedder and the voice model with the converter's current options.
+    converter.load_hubert("contentvec", None)
+    converter.get_vc(model_path, 0)
+
+
+def convert_clips(converter, clips):
+    # Converts 16 kHz clips with the loaded voice and fixed settings.
+    import torch
+
+    outputs = []
+    for audio in clips:
+        torch.manual_seed(0)
+        outputs.append(
+            converter.vc.pipeline(
+                converter.hubert_model,
+                converter.net_g,
+                0,
+                audio,
+                None,
+                0,
+                "rmvpe",
+                "",
+                0,
+                converter.cpt.get("f0", 1),
+                3,
+                converter.tgt_sr,
+                0,
+                1,
+                converter.version,
+                0.5,
+                128,
+                "False",
+                None,
+            )
+        )
+    return outputs
+
+
+# Autotune: per-frame Python nearest-note search vs. searchsorted snapping
+def benchmark_autotune(frames=30000):
+    from rvc.infer.pipeline import Autotune
+
+    ref_freqs = [65.41, 82.41, 110.0, 146.83, 196.0, 246.94, 329.63, 440.0]
+    ref_freqs += [587.33, 783.99, 1046.5]
+    autotune = Autotune(ref_freqs)
+    f0 = np.random.default_rng(0).uniform(0, 1100, frames)
+    f0[::7] = 0
+    reference_time, _ = best_time(legacy_autotune, autotune.note_dict, f0, repeat=1)
+    optimized_time, _ = best_time(autotune.autotune_f0, f0)
+    report("autotune_f0", reference_time, optimized_time)
+
+
+# RMVPE decoding: per-frame window slicing vs. gathered index arrays
+def benchmark_rmvpe_decode(frames=20000):
+    import types
+    import torch
+    from rvc.lib.predictors.RMVPE import RMVPE0Predictor, N_CLASS
+
+    cents_mapping = np.pad(20 * np.arange(N_CLASS) + 1997.3794084376191, (4, 4))
+    predictor = types.SimpleNamespace(cents_mapping=cents_mapping)
+    salience = np.random.default_rng(0).random((frames, N_CLASS), np.float32) ** 8
+    reference_time, _ = best_time(
+        legacy_local_average_cents, salience, cents_mapping, repeat=1
+    )
+    optimized_time, _ = best_time(
+        RMVPE0Predictor.to_local_average_cents, predictor, salience, 0.03
+    )
+    report("to_local_average_cents", reference_time, optimized_time)
+    torch_time, _ = best_time(
+        RMVPE0Predictor.decode_torch, predictor, torch.from_numpy(salience), 0.03
+    )
+    report("decode_torch", reference_time, torch_time)
+
+
+# Harvest/Dio: whole-signal analysis vs. overlapping windows on a process pool
+def benchmark_world(seconds=120, method="harvest"):
+    from rvc.lib.predictors.World import world_f0, world_extractor
+
+    args = (method, glide(seconds), 16000, 50, 1100, 10)
+    reference_time, _ = best_time(world_f0, *args, repeat=1)
+    optimized_time, _ = best_time(world_extractor.compute_f0, *args, repeat=1)
+    report(
+        f"{method} ({world_extractor.processes} processes)",
+        reference_time,
+        optimized_time,
+    )
+
+
+# Hybrid F0: neural estimators one after another vs. in worker processes with a thread share each
+def benchmark_hybrid_f0(seconds=30, methods=("crepe-tiny", "rmvpe", "fcpe")):
+    import types
+    from rvc.infer.pipeline import Pipeline
+
+    config = types.SimpleNamespace(
+        x_pad=1,
+        x_query=6,
+        x_center=38,
+        x_max=41,
+        is_half=False,
+        device="cpu",
+        cpu_precision="fp32",
+        rmvpe_options={},
+    )
+    pipeline = Pipeline(40000, config)
+    x = glide(seconds).astype(np.float32)
+    p_len = x.shape[0] // pipeline.window
+    args = (f"hybrid[{'+'.join(methods)}]", x, 50, 1100, p_len, 160)
+
+    def serial():
+        return [
+            pipeline.get_f0_hybrid_method(method, x, 50, 1100, p_len, 160, 3)
+            for method in methods
+        ]
+
+    pipeline.get_f0_hybrid(*args)  # Model loading and worker start-up
+    reference_time, _ = best_time(serial, repeat=1)
+    optimized_time, _ = best_time(pipeline.get_f0_hybrid, *args, repeat=1)
+    report(f"hybrid[{'+'.join(methods)}]", reference_time, optimized_time)
+
+
+# Split-point search: 160 shifted-slice additions and per-window np.where vs. cumsum + strided argmin
+def benchmark_split_points(seconds=600):
+    import types
+    from scipy import signal
+    from rvc.infer.pipeline import Pipeline, bh, ah
+
+    pipeline = types.SimpleNamespace(
+        window=160, t_max=16000 * 41, t_center=16000 * 38, t_query=16000 * 6
+    )
+    audio = np.random.default_rng(0).standard_normal(seconds * 16000)
+    audio = signal.filtfilt(bh, ah, audio)
+    reference_time, _ = best_time(legacy_split_points, pipeline, audio, repeat=1)
+    optimized_time, _ = best_time(Pipeline.split_points, pipeline, audio)
+    report("split_points", reference_time, optimized_time)
+
+
+# RMS matching: full-length interpolated envelopes vs. chunked envelope-domain gains
+def benchmark_change_rms(seconds=600, rate=0.25):
+    from rvc.infer.pipeline import AudioProcessor
+
+    rng = np.random.default_rng(0)
+    source_audio = rng.standard_normal(seconds * 16000) * 0.3
+    target_audio = (rng.standard_normal(seconds * 40000) * 0.3).astype(np.float32)
+    reference_time, _ = best_time(
+        legacy_change_rms, source_audio, target_audio, rate, repeat=1
+    )
+    optimized_time, _ = best_time(
+        AudioProcessor.change_rms, source_audio, 16000, target_audio, 40000, rate
+    )
+    report("change_rms", reference_time, optimized_time)
+
+
+# NSF source: per-harmonic loop, full-rate interpolations and cumsum vs. frame-rate phase accumulation
+def benchmark_sine_gen(seconds=38, sr=48000, upp=480):
+    import torch
+    from rvc.lib.algorithm.generators import SineGen
+
+    def run(func, *args):
+        with torch.no_grad():
+            return func(*args)
+
+    frames = seconds * sr // upp
+    t = torch.arange(frames) / (sr / upp)
+    f0 = (200 + 150 * torch.sin(2 * torch.pi * 0.2 * t)).unsqueeze(0)
+    for harmonic_num in (0, 8):
+        sine_gen = SineGen(sr, harmonic_num=harmonic_num, noise_std=0)
+        reference_time, _ = best_time(run, legacy_sine_gen, sine_gen, f0, upp)
+        optimized_time, _ = best_time(run, sine_gen, f0, upp)
+        report(f"sine_gen ({harmonic_num} harmonics)", reference_time, optimized_time)
+
+
+# Retrieval: recall@k and latency of each engine against exact search, and 3-D gather vs. rank-wise blending
+def benchmark_retrieval(n_vectors=50000, n_queries=3000, dim=768, k=8):
+    import faiss
+    from rvc.infer.retrieval import (
+        IVFPQ_MIN_VECTORS,
+        ExactSearch,
+        Retriever,
+        blend_neighbors,
+        build_hnsw,
+        build_ivfpq,
+    )
+
+    rng = np.random.default_rng(0)
+    file_index = os.environ.get("RVC_BENCHMARK_INDEX")
+    if file_index:
+        index = faiss.read_index(file_index)
+        big_npy = index.reconstruct_n(0, index.ntotal)
+    else:
+        # Clustered embeddings indexed the way training does.
+        centers = rng.standard_normal((256, dim)).astype(np.float32)
+        big_npy = centers[rng.integers(0, 256, n_vectors)]
+        big_npy += 0.3 * rng.standard_normal(big_npy.shape).astype(np.float32)
+        n_ivf = min(int(16 * np.sqrt(n_vectors)), n_vectors // 39)
+        index = faiss.index_factory(dim, f"IVF{n_ivf},Flat")
+        index.train(big_npy)
+        index.add(big_npy)
+    queries = big_npy[rng.integers(0, big_npy.shape[0], n_queries)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    exact_time, (score, expected) = best_time(
+        ExactSearch(big_npy).search, queries, k, repeat=1
+    )
+    print(
+        f"retrieval over {big_npy.shape[0]} vectors, exact: {exact_time * 1000:.1f} ms"
+    )
+    # Recall is the engines' tuning trade-off (nprobe / ef_search), not a pass/fail check.
+    engines = [
+        ("index", index, "nprobe", [1, 4, 16, 64]),
+        ("hnsw", build_hnsw(big_npy), "ef_search", [16, 64, 256]),
+    ]
+    if big_npy.shape[0] >= IVFPQ_MIN_VECTORS:
+        engines.append(("ivfpq", build_ivfpq(big_npy), "nprobe", [1, 4, 16, 64]))
+    for name, search_index, param, values in engines:
+        for value in values:
+            retriever = Retriever(search_index, k, **{param: value})
+            elapsed, (_, ix) = best_time(retriever.search, queries)
+            recall = (ix[:, :, None] == expected[:, None, :]).any(axis=2).mean()
+            print(
+                f"{name} {param}={value}: recall@{k} {recall:.3f}, "
+                f"{elapsed * 1000:.1f} ms ({exact_time / max(elapsed, 1e-9):.1f}x exact)"
+            )
+
+    reference_time, _ = best_time(legacy_blend, big_npy, score, expected)
+    optimized_time, _ = best_time(blend_neighbors, big_npy, score, expected)
+    report("retrieval blend", reference_time, optimized_time)
+
+
+# CPU precision: fp32 vs. int8 dynamic quantization and bf16 autocast on reference clips
+def benchmark_cpu_precision():
+    model_path, audio_paths = load_reference_voice()
+    if model_path is None:
+        return
+    from rvc.infer.infer import VoiceConverter
+    from rvc.infer.precision import bf16_supported
+    from rvc.lib.utils import load_audio
+
+    converter = VoiceConverter()
+    if converter.config.device != "cpu":
+        print("cpu_precision: only meaningful when inference runs on the CPU.")
+        return
+    clips = [load_audio(path, 16000) for path in audio_paths]
+    precisions = ["fp32", "int8"] + (["bf16"] if bf16_supported() else [])
+    times = {}
+    for precision in precisions:
+        converter.configure(cpu_precision=precision)
+        load_voice(converter, model_path)
+        convert_clips(converter, clips)  # Warm-up
+        times[precision], _ = best_time(convert_clips, converter, clips, repeat=1)
+    for precision in precisions[1:]:
+        report(f"{precision} inference", times["fp32"], times[precision])
+
+
+# ONNX: torch vs. onnxruntime embedder and end-to-end inference on reference clips
+def benchmark_onnx():
+    model_path, audio_paths = load_reference_voice()
+    if model_path is None:
+        return
+    import torch
+    from rvc.infer.infer import VoiceConverter
+    from rvc.infer.onnx_backend import OnnxEmbedder
+    from rvc.lib.utils import load_audio, load_embedding
+
+    converter = VoiceConverter()
+    clips = [load_audio(path, 16000) for path in audio_paths]
+    hubert = load_embedding("contentvec", None)[0][0].float().eval()
+    embedder = OnnxEmbedder(
+        VoiceConverter.embedder_onnx_base("contentvec", None), lambda: hubert, "cpu"
+    )
+    source = torch.from_numpy(clips[0]).float().view(1, -1)
+
+    def embed_torch():
+        with torch.no_grad():
+            return hubert.extract_features(
+                source=source, padding_mask=None, output_layer=12
+            )[0]
+
+    def embed_onnx():
+        return embedder.extract_features(source, output_layer=12)[0]
+
+    embed_onnx()  # Export and warm-up
+    reference_time, _ = best_time(embed_torch)
+    optimized_time, _ = best_time(embed_onnx)
+    report("onnx embedder", reference_time, optimized_time)
+
+    times = {}
+    for backend in ["torch", "onnx"]:
+        converter.configure(backend=backend)
+        load_voice(converter, model_path)
+        convert_clips(converter, clips)  # Warm-up
+        times[backend], _ = best_time(convert_clips, converter, clips, repeat=1)
+    report("onnx inference", times["torch"], times["onnx"])
+
+
+def load_synthesizer(cpt):
+    # A fresh eager fp32 synthesizer of a checkpoint, with weight-norm hooks.
+    from rvc.lib.algorithm.synthesizers import synthesizer_classes
+
+    net_g = synthesizer_classes[(cpt.get("version", "v1"), cpt.get("f0", 1))](
+        *cpt["config"], is_half=False
+    )
+    del net_g.enc_q
+    net_g.load_state_dict(cpt["weight"], strict=False)
+    return net_g.eval().float()
+
+
+def synthesizer_inputs(cpt, seconds):
+    # Random phone features, pitch and speaker inputs of infer for a segment of the given length.
+    import torch
+
+    frames = seconds * 100
+    channels = 256 if cpt.get("version", "v1") == "v1" else 768
+    generator = torch.Generator().manual_seed(0)
+    phone = torch.randn(1, frames, channels, generator=generator)
+    args = [phone, torch.tensor([frames]).long()]
+    if cpt.get("f0", 1):
+        pitchf = torch.rand(1, frames, generator=generator) * 300 + 100
+        args += [torch.randint(1, 255, (1, frames), generator=generator), pitchf]
+    args.append(torch.tensor([0]).long())
+    return args
+
+
+def compiled_variants(model_path):
+    # Synthesizer preparations of each execution mode. Scripted graphs are cached next
+    # to a copy of the model, not the reference .pth.
+    import tempfile
+    from rvc.infer.compiled import script_network, compile_network
+
+    cache_path = os.path.join(tempfile.mkdtemp(), "model.pth")
+    os.symlink(os.path.abspath(model_path), cache_path)
+    return {
+        "folded": lambda net_g: net_g,
+        "script": lambda net_g: script_network(net_g, cache_path, "cpu", False),
+        "compile": lambda net_g: compile_network(net_g, cache_path),
+    }
+
+
+# Compiled inference: eager with weight-norm hooks vs. folded eager, TorchScript and torch.compile
+def benchmark_compile(seconds=10):
+    model_path, _ = load_reference_voice()
+    if model_path is None:
+        return
+    import torch
+    from rvc.infer.compiled import fold_weight_norm, warm_up
+
+    cpt = torch.load(model_path, map_location="cpu")
+    cpt["config"][-3] = cpt["weight"]["emb_g.weight"].shape[0]
+    args = synthesizer_inputs(cpt, seconds)
+
+    def segment(net_g):
+        with torch.no_grad():
+            return net_g.infer(*args)[0]
+
+    reference_time, _ = best_time(segment, load_synthesizer(cpt))
+    for name, prepare in compiled_variants(model_path).items():
+        try:
+            net_g = prepare(fold_weight_norm(load_synthesizer(cpt)))
+            warm_up(net_g, cpt, "cpu", False, [seconds])
+        except Exception as error:
+            print(f"{name}: unavailable ({error})")
+            continue
+        optimized_time, _ = best_time(segment, net_g)
+        report(f"{name} synthesizer", reference_time, optimized_time)
+
+
+# Post-processing: WAV write, re-read for denoising and re-decode for encoding vs. one in-memory pass
+def benchmark_post_process(seconds=180, sr=40000, export_format="FLAC"):
+    import tempfile
+    from rvc.infer.postprocess import post_process_audio
+
+    audio = noisy_tone(seconds, sr)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "output.wav")
+        single_path = os.path.join(directory, f"single.{export_format.lower()}")
+        reference_time, _ = best_time(
+            legacy_post_process, audio, sr, path, export_format, repeat=1
+        )
+        optimized_time, _ = best_time(
+            post_process_audio, audio, sr, single_path, True, 0.7, export_format
+        )
+    report("post_process", reference_time, optimized_time)
+
+
+benchmarks = {
+    "autotune": benchmark_autotune,
+    "rmvpe_decode": benchmark_rmvpe_decode,
+    "world": benchmark_world,
+    "hybrid_f0": benchmark_hybrid_f0,
+    "split_points": benchmark_split_points,
+    "change_rms": benchmark_change_rms,
+    "sine_gen": benchmark_sine_gen,
+    "retrieval": benchmark_retrieval,
+    "cpu_precision": benchmark_cpu_precision,
+    "onnx": benchmark_onnx,
+    "compile": benchmark_compile,
+    "post_process": benchmark_post_process,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(benchmarks)
+    for name in names:
+        benchmarks[name]()
@@ -1,107 +1,111 @@
-from pydub.silence import detect_nonsilent
-from pydub import AudioSegment
 import numpy as np
-import re
-import os
 
-from rvc.lib.utils import format_title
 
-
-def process_audio(file_path):
-    try:
-        # load audio file
-        song = AudioSegment.from_file(file_path)
-
-        # set silence threshold and duration
-        silence_thresh = -70  # dB
-        min_silence_len = 750  # ms, adjust as needed
-
-        # detect nonsilent parts
-        nonsilent_parts = detect_nonsilent(
-            song, min_silence_len=min_silence_len, silence_thresh=silence_thresh
-        )
-
-        # Create a new directory to store chunks
-        file_dir = os.path.dirname(file_path)
-        file_name = os.path.basename(file_path).split(".")[0]
-        file_name = format_title(file_name)
-        new_dir_path = os.path.join(file_dir, file_name)
-        os.makedirs(new_dir_path, exist_ok=True)
-
-        # Check if timestamps file exists, if so delete it
-        timestamps_file = os.path.join(file_dir, f"{file_name}_timestamps.txt")
-        if os.path.isfile(timestamps_file):
-            os.remove(timestamps_file)
-
-        # export chunks and save start times
-        segment_count = 0
-        for i, (start_i, end_i) in enumerate(nonsilent_parts):
-            chunk = song[start_i:end_i]
-            chunk_file_path = os.path.join(new_dir_path, f"chunk{i}.wav")
-            chunk.export(chunk_file_path, format="wav")
-
-            print(f"Segment {i} created!")
-            segment_count += 1
-
-            # write start times to file
-            with open(timestamps_file, "a", encoding="utf-8") as f:
-                f.write(f"{chunk_file_path} starts at {start_i} ms\n")
-
-        print(f"Total segments created: {segment_count}")
-        print(f"Split all chunks for {file_path} successfully!")
-
-        return "Finish", new_dir_path
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return "Error", None
-
-
-def merge_audio(timestamps_file):
-    try:
-        # Extract prefix from the timestamps filename
-        prefix = os.path.basename(timestamps_file).replace("_timestamps.txt", "")
-        timestamps_dir = os.path.dirname(timestamps_file)
-
-        # Open the timestamps file
-        with open(timestamps_file, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        # Initialize empty list to hold audio segments
-        audio_segments = []
-        last_end_time = 0
-
-        print(f"Processing file: {timestamps_file}")
-
-        for line in lines:
-            # Extract filename and start time from line
-            match = re.search(r"(chunk\d+.wav) starts at (\d+) ms", line)
-            if match:
-                filename, start_time = match.groups()
-                start_time = int(start_time)
-
-                # Construct the complete path to the chunk file
-                chunk_file = os.path.join(timestamps_dir, prefix, filename)
-
-                # Add silence from last_end_time to start_time
-                silence_duration = max(start_time - last_end_time, 0)
-                silence = AudioSegment.silent(duration=silence_duration)
-                audio_segments.append(silence)
-
-                # Load audio file and append to list
-                audio = AudioSegment.from_wav(chunk_file)
-                audio_segments.append(audio)
-
-                # Update last_end_time
-                last_end_time = start_time + len(audio)
-
-                print(f"Processed chunk: {chunk_file}")
-
-        # Concatenate all audio_segments and export
-        merged_audio = sum(audio_segments)
-        merged_audio_np = np.array(merged_audio.get_array_of_samples())
-        # print(f"Exported merged file: {merged_filename}\n")
-        return merged_audio.frame_rate, merged_audio_np
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
+def detect_nonsilent(audio, sr, min_silence_len=750, silence_thresh=-70, seek_step=1):
+    """
+    Finds the non-silent ranges of a signal, following pydub.silence.detect_nonsilent.
+
+    A range is silent where every window of min_silence_len ms, moved by seek_step ms, has an
+    RMS level at or below silence_thresh dBFS. Window levels come from per-millisecond energies,
+    so the whole search is a handful of vectorized passes over the signal.
+
+    Args:
+        audio (np.ndarray): The mono signal, with full scale at 1.0.
+        sr (int): Sampling rate of the signal.
+        min_silence_len (int, optional): Minimum silence length in ms. Defaults to 750.
+        silence_thresh (float, optional): Silence threshold in dBFS. Defaults to -70.
+        seek_step (int, optional): Step between tested windows in ms. Defaults to 1.
+
+    Returns:
+        list: [start, end] ranges in ms.
+    """
+    seg_len = int(round(audio.shape[0] * 1000 / sr))
+    if seg_len < min_silence_len:
+        return [[0, seg_len]]
+    bounds = np.minimum(np.arange(seg_len + 1) * sr // 1000, audio.shape[0])
+    energy = np.zeros(seg_len + 1)
+    energy[1:] = np.add.reduceat(
+        np.square(audio, dtype=np.float64),
+        np.minimum(bounds[:-1], audio.shape[0] - 1),
+    )
+    # reduceat yields the element at an index for empty blocks, those hold no samples.
+    energy[1:][bounds[1:] == bounds[:-1]] = 0
+    energy = np.cumsum(energy)
+
+    last_slice_start = seg_len - min_silence_len
+    starts = np.arange(0, last_slice_start + 1, seek_step)
+    if last_slice_start % seek_step:
+        starts = np.append(starts, last_slice_start)
+    ends = starts + min_silence_len
+    samples = np.maximum(bounds[ends] - bounds[starts], 1)
+    rms = np.sqrt((energy[ends] - energy[starts]) / samples)
+    silence_starts = starts[rms <= 10 ** (silence_thresh / 20)]
+    if silence_starts.shape[0] == 0:
+        return [[0, seg_len]]
+
+    # Windows further apart than min_silence_len start a new silent range.
+    breaks = np.flatnonzero(np.diff(silence_starts) > min_silence_len)
+    range_starts = silence_starts[np.concatenate([[0], breaks + 1])]
+    range_ends = silence_starts[np.append(breaks, -1)] + min_silence_len
+    if range_starts[0] == 0 and range_ends[0] == seg_len:
+        return []
+    nonsilent_ranges = [[0, int(range_starts[0])]]
+    nonsilent_ranges += [
+        [int(start), int(end)] for start, end in zip(range_ends[:-1], range_starts[1:])
+    ]
+    if range_ends[-1] != seg_len:
+        nonsilent_ranges.append([int(range_ends[-1]), seg_len])
+    if nonsilent_ranges[0] == [0, 0]:
+        nonsilent_ranges.pop(0)
+    return nonsilent_ranges
+
+
+def process_audio(audio, sr, min_silence_len=750, silence_thresh=-70):
+    """
+    Splits a signal at its silences.
+
+    Args:
+        audio (np.ndarray): The mono signal.
+        sr (int): Sampling rate of the signal.
+        min_silence_len (int, optional): Minimum silence length in ms. Defaults to 750.
+        silence_thresh (float, optional): Silence threshold in dBFS. Defaults to -70.
+
+    Returns:
+        list: (start, end) sample ranges of the non-silent segments, to be sliced as views.
+    """
+    nonsilent_parts = detect_nonsilent(audio, sr, min_silence_len, silence_thresh)
+    segments = [
+        (start * sr // 1000, min(end * sr // 1000, audio.shape[0]))
+        for start, end in nonsilent_parts
+    ]
+    print(f"Total segments created: {len(segments)}")
+    return segments
+
+
+def merge_audio(segments, outputs, sr, out_sr):
+    """
+    Places converted segments at their original start times in one preallocated buffer.
+
+    Gaps between segments are left silent. A segment that comes out longer than the gap
+    before the next one pushes the following segments back instead of overlapping them.
+
+    Args:
+        segments (list): (start, end) sample ranges returned by process_audio.
+        outputs (list): The converted audio of every segment.
+        sr (int): Sampling rate of the segment ranges.
+        out_sr (int): Sampling rate of the converted audio.
+
+    Returns:
+        np.ndarray: The merged signal.
+    """
+    positions = []
+    end = 0
+    for (start, _), output in zip(segments, outputs):
+        position = max(start * out_sr // sr, end)
+        positions.append(position)
+        end = position + output.shape[0]
+    dtype = outputs[0].dtype if outputs else np.int16
+    merged = np.zeros(end, dtype=dtype)
+    for position, output in zip(positions, outputs):
+        merged[position : position + output.shape[0]] = output
+    return merged
@@ -2,7 +2,13 @@ import os, sys
 import ffmpeg
 import numpy as np
 import re
+import threading
 import unicodedata
+import soundfile as sf
+from collections import OrderedDict
+from functools import lru_cache
+from math import gcd
+from scipy import signal
 from fairseq import checkpoint_utils
 import wget
 
@@ -14,18 +20,125 @@ now_dir = os.getcwd()
 sys.path.append(now_dir)
 
 
+# Containers decoded in-process by libsndfile; anything else goes through ffmpeg.
+SOUNDFILE_FORMATS = [".wav", ".flac", ".ogg", ".aiff", ".aif"]
+
+
+class AudioCache:
+    """
+    A thread-safe LRU cache of decoded audio, keyed by path, modification time and sampling rate.
+    """
+
+    def __init__(self, max_entries=0, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.nbytes = 0
+
+    def get(self, key):
+        if self.max_entries <= 0:
+            return None
+        with self.lock:
+            audio = self.entries.get(key)
+            if audio is None:
+                return None
+            self.entries.move_to_end(key)
+            # Callers normalize in place, the cached array itself is never handed out.
+            return audio.copy()
+
+    def put(self, key, audio):
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = audio.copy()
+            self.nbytes += audio.nbytes
+            self.evict()
+
+    def evict(self):
+        # The most recently added entry is always kept, even if it alone exceeds the budget.
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_entries
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def resize(self, max_entries):
+        """
+        Changes the maximum number of decoded files kept (0 disables the cache).
+        """
+        with self.lock:
+            self.max_entries = max_entries
+            self.evict()
+            if max_entries <= 0:
+                self.entries.clear()
+                self.nbytes = 0
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+
+# Off by default: training preprocessing and batch runs decode each file once, so caching
+# would only hold memory. Set RVC_AUDIO_CACHE_SIZE (or --audio_cache_size) for repeated
+# conversions of the same inputs, e.g. behind the API.
+audio_cache_mb = os.environ.get("RVC_AUDIO_CACHE_MB", "512")
+audio_cache = AudioCache(
+    max_entries=int(os.environ.get("RVC_AUDIO_CACHE_SIZE", "0")),
+    max_bytes=int(float(audio_cache_mb) * 1024**2) if audio_cache_mb else None,
+)
+
+
+@lru_cache(maxsize=32)
+def resampling_filter(up, down):
+    # Kaiser-windowed sinc low-pass for polyphase resampling, designed once per rate pair.
+    max_rate = max(up, down)
+    return signal.firwin(32 * max_rate + 1, 1 / max_rate, window=("kaiser", 8.0))
+
+
+def resample_audio(audio, orig_sr, target_sr):
+    if orig_sr == target_sr:
+        return audio
+    divisor = gcd(int(orig_sr), int(target_sr))
+    up, down = int(target_sr) // divisor, int(orig_sr) // divisor
+    audio = signal.resample_poly(audio, up, down, window=resampling_filter(up, down))
+    return audio.astype(np.float32)
+
+
+def decode_audio(file, sampling_rate):
+    if os.path.splitext(file)[1].lower() in SOUNDFILE_FORMATS:
+        try:
+            audio, sr = sf.read(file, dtype="float32", always_2d=True)
+        except RuntimeError:
+            # Unsupported encoding inside a known container, let ffmpeg handle it.
+            pass
+        else:
+            audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+            return resample_audio(np.ascontiguousarray(audio), sr, sampling_rate)
+    out, _ = (
+        ffmpeg.input(file, threads=0)
+        .output("-", format="f32le", acodec="pcm_f32le", ac=1, ar=sampling_rate)
+        .run(cmd=["ffmpeg", "-nostdin"], capture_stdout=True, capture_stderr=True)
+    )
+    return np.frombuffer(out, np.float32).flatten()
+
+
 def load_audio(file, sampling_rate):
     try:
         file = file.strip(" ").strip('"').strip("\n").strip('"').strip(" ")
-        out, _ = (
-            ffmpeg.input(file, threads=0)
-            .output("-", format="f32le", acodec="pcm_f32le", ac=1, ar=sampling_rate)
-            .run(cmd=["ffmpeg", "-nostdin"], capture_stdout=True, capture_stderr=True)
-        )
+        key = (os.path.abspath(file), os.path.getmtime(file), sampling_rate)
+        audio = audio_cache.get(key)
+        if audio is None:
+            audio = decode_audio(file, sampling_rate)
+            audio_cache.put(key, audio)
     except Exception as error:
         raise RuntimeError(f"Failed to load audio: {error}")
 
-    return np.frombuffer(out, np.float32).flatten()
+    return audio
 
 
 def format_title(title):
@@ -3,7 +3,6 @@ import sys
 import time
 import tqdm
 import torch
-import pyworld
 import torchcrepe
 import parselmouth
 import numpy as np
@@ -13,8 +12,8 @@ current_directory = os.getcwd()
 sys.path.append(current_directory)
 
 from rvc.lib.utils import load_audio
-from rvc.lib.predictors.RMVPE import RMVPE0Predictor
-
+from rvc.lib.predictors.PredictorRegistry import predictor_registry
+from rvc.lib.predictors.World import world_extractor
 
 exp_dir = sys.argv[1]
 f0_method = sys.argv[2]
@@ -102,31 +101,17 @@ class FeatureInput:
         )
 
     def get_harvest(self, x):
-        f0_spectral = pyworld.harvest(
-            x.astype(np.double),
-            fs=self.fs,
-            f0_ceil=self.f0_max,
-            f0_floor=self.f0_min,
-            frame_period=1000 * self.hop / self.fs,
+        return world_extractor.compute_f0(
+            "harvest", x, self.fs, self.f0_min, self.f0_max, 1000 * self.hop / self.fs
         )
-        return pyworld.stonemask(x.astype(np.double), *f0_spectral, self.fs)
 
     def get_dio(self, x):
-        f0_spectral = pyworld.dio(
-            x.astype(np.double),
-            fs=self.fs,
-            f0_ceil=self.f0_max,
-            f0_floor=self.f0_min,
-            frame_period=1000 * self.hop / self.fs,
+        return world_extractor.compute_f0(
+            "dio", x, self.fs, self.f0_min, self.f0_max, 1000 * self.hop / self.fs
         )
-        return pyworld.stonemask(x.astype(np.double), *f0_spectral, self.fs)
 
     def get_rmvpe(self, x):
-        model_rmvpe = RMVPE0Predictor(
-            os.path.join("rvc", "models", "predictors", "rmvpe.pt"),
-            is_half=False,
-            device="cpu",
-        )
+        model_rmvpe = predictor_registry.get("rmvpe", "cpu", is_half=False)
         return model_rmvpe.infer_from_audio(x, thred=0.03)
 
     # Helper function to get f0 method dictionary
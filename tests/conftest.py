@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Tests import the rvc package and the top-level scripts from the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def reference_voice():
+    # Model-level accuracy tests run on a voice model and clips given by the environment.
+    from rvc.lib.tools.benchmark import load_reference_voice
+
+    model_path, audio_paths = load_reference_voice()
+    if model_path is None:
+        pytest.skip("RVC_REFERENCE_MODEL and RVC_REFERENCE_AUDIO are not set")
+    return model_path, audio_paths
+
+
+@pytest.fixture
+def mel_distance():
+    librosa = pytest.importorskip("librosa")
+
+    def distance(reference, output, sr):
+        # Mean absolute log-mel difference in dB of two int16-scaled signals.
+        n = min(reference.shape[0], output.shape[0])
+        mels = [
+            librosa.power_to_db(
+                librosa.feature.melspectrogram(
+                    y=audio[:n].astype(np.float32) / 32768, sr=sr, n_mels=80
+                )
+            )
+            for audio in (reference, output)
+        ]
+        return float(np.mean(np.abs(mels[0] - mels[1])))
+
+    return distance
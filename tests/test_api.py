@@ -0,0 +1,92 @@
+import importlib
+import types
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("torch")
+
+from fastapi.testclient import TestClient
+
+INFER_ARGUMENTS = [
+    "--input_path",
+    "input.wav",
+    "--output_path",
+    "output.wav",
+    "--pth_path",
+    "model.pth",
+    "--index_path",
+    "",
+]
+
+
+@pytest.fixture
+def in_process_api(monkeypatch):
+    monkeypatch.setenv("RVC_API_IN_PROCESS", "True")
+    import api
+
+    api = importlib.reload(api)
+    yield api
+    api.executor.shutdown()
+
+
+def fake_converter(result):
+    calls = []
+
+    def configure(*args):
+        calls.append(("configure", args))
+
+    def infer_pipeline(*args, **kwargs):
+        calls.append(("infer_pipeline", args))
+        return result
+
+    converter = types.SimpleNamespace(
+        configure=configure, infer_pipeline=infer_pipeline
+    )
+    return converter, calls
+
+
+def test_in_process_infer(in_process_api, monkeypatch):
+    converter, calls = fake_converter("output.flac")
+    monkeypatch.setattr(
+        in_process_api.load_cli(), "get_voice_converter", lambda: converter
+    )
+
+    response = TestClient(in_process_api.app).post("/infer", json=INFER_ARGUMENTS)
+
+    assert response.status_code == 200
+    assert response.json()["error"] == ""
+    assert response.json()["output"][1] == "output.flac"
+    assert [name for name, _ in calls] == ["configure", "infer_pipeline"]
+
+
+def test_in_process_infer_failure(in_process_api, monkeypatch):
+    converter, _ = fake_converter(None)
+    monkeypatch.setattr(
+        in_process_api.load_cli(), "get_voice_converter", lambda: converter
+    )
+
+    response = TestClient(in_process_api.app).post("/infer", json=INFER_ARGUMENTS)
+
+    assert response.status_code == 200
+    assert "failed" in response.json()["error"]
+    assert "output" not in response.json()
+
+
+def test_in_process_infer_options(in_process_api, monkeypatch):
+    converter, calls = fake_converter("output.flac")
+    monkeypatch.setattr(
+        in_process_api.load_cli(), "get_voice_converter", lambda: converter
+    )
+    arguments = INFER_ARGUMENTS + [
+        "--cpu_precision",
+        "int8",
+        "--compile_mode",
+        "script",
+    ]
+
+    TestClient(in_process_api.app).post("/infer", json=arguments)
+
+    _, options = calls[0]
+    assert options[0] == "int8"
+    assert options[2] == "script"
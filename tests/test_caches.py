@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from rvc.infer.f0_cache import F0Cache
+from rvc.infer.feature_cache import FeatureCache
+
+
+def contour(audio):
+    return np.abs(np.fft.rfft(audio))[:100]
+
+
+def test_feature_cache_hit_matches_computed(tmp_path):
+    audio = np.random.default_rng(0).standard_normal(16000).astype(np.float32)
+    cache = FeatureCache(cache_dir=str(tmp_path))
+
+    computed = cache.get_or_compute("f0", audio, ("rmvpe", 160), contour, audio)
+    cached = cache.get_or_compute("f0", audio, ("rmvpe", 160), contour, audio)
+
+    np.testing.assert_array_equal(cached, computed)
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_feature_cache_keys_on_parameters(tmp_path):
+    audio = np.random.default_rng(0).standard_normal(16000).astype(np.float32)
+    cache = FeatureCache(cache_dir=str(tmp_path))
+
+    cache.get_or_compute("f0", audio, ("rmvpe", 160), contour, audio)
+    cache.get_or_compute("f0", audio, ("rmvpe", 128), lambda: contour(audio) * 2)
+
+    assert cache.stats()["misses"] == 2
+
+
+def test_f0_cache_hit_matches_computed():
+    audio = np.random.default_rng(1).standard_normal(16000).astype(np.float32)
+    cache = F0Cache(max_entries=4)
+
+    computed = cache.get_or_compute(audio, ("rmvpe",), contour, audio)
+    cached = cache.get_or_compute(audio, ("rmvpe",), contour, audio)
+
+    np.testing.assert_array_equal(cached, contour(audio))
+    assert cached is computed and not cached.flags.writeable
+    assert cache.stats()["hits"] == 1
+
+
+def test_f0_cache_resize_to_zero_disables_memo():
+    audio = np.random.default_rng(1).standard_normal(16000).astype(np.float32)
+    cache = F0Cache(max_entries=4)
+    cache.get_or_compute(audio, ("rmvpe",), contour, audio)
+
+    cache.resize(0)
+    result = cache.get_or_compute(audio, ("rmvpe",), contour, audio)
+
+    np.testing.assert_array_equal(result, contour(audio))
+    assert cache.stats()["entries"] == 0 and cache.stats()["hits"] == 0
+
+
+def test_audio_cache_returns_copies():
+    pytest.importorskip("ffmpeg")
+    from rvc.lib.utils import AudioCache
+
+    audio = np.random.default_rng(2).standard_normal(16000).astype(np.float32)
+    cache = AudioCache(max_entries=2)
+    cache.put(("clip.wav", 0, 16000), audio)
+
+    cached = cache.get(("clip.wav", 0, 16000))
+    cached *= 2
+
+    np.testing.assert_array_equal(cache.get(("clip.wav", 0, 16000)), audio)
+    cache.resize(0)
+    assert cache.get(("clip.wav", 0, 16000)) is None
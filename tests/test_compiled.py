@@ -0,0 +1,39 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from rvc.infer.compiled import fold_weight_norm, warm_up
+from rvc.lib.tools.benchmark import (
+    compiled_variants,
+    load_synthesizer,
+    synthesizer_inputs,
+)
+
+
+@pytest.mark.parametrize("mode", ["folded", "script", "compile"])
+def test_compiled_synthesizer_matches_eager(mode, reference_voice, mel_distance):
+    model_path, _ = reference_voice
+    cpt = torch.load(model_path, map_location="cpu")
+    cpt["config"][-3] = cpt["weight"]["emb_g.weight"].shape[0]
+    args = synthesizer_inputs(cpt, 5)
+    with torch.no_grad():
+        torch.manual_seed(0)
+        expected = load_synthesizer(cpt).infer(*args)[0]
+    try:
+        net_g = compiled_variants(model_path)[mode](
+            fold_weight_norm(load_synthesizer(cpt))
+        )
+        warm_up(net_g, cpt, "cpu", False, [5])
+    except Exception as error:
+        pytest.skip(f"{mode} is unavailable: {error}")
+
+    with torch.no_grad():
+        torch.manual_seed(0)
+        result = net_g.infer(*args)[0]
+
+    distance = mel_distance(
+        expected.flatten().numpy() * 32768,
+        result.flatten().numpy() * 32768,
+        cpt["config"][-1],
+    )
+    assert distance <= 1.0
@@ -0,0 +1,39 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from rvc.lib.algorithm.generators import SineGen
+from rvc.lib.tools.benchmark import legacy_sine_gen
+
+SR = 48000
+UPP = 480
+
+
+def exact_sine(sine_gen, f0):
+    # Float64 phase of the same excitation, the initial phases are drawn first in both.
+    torch.manual_seed(0)
+    rand_ini = torch.rand(f0.shape[0], sine_gen.dim).double()
+    rand_ini[:, 0] = 0
+    harmonics = torch.arange(1, sine_gen.dim + 1).double()
+    rad_values = (f0.double().unsqueeze(-1) * harmonics / SR) % 1
+    rad_values[:, 0, :] += rand_ini
+    phase = torch.cumsum(rad_values.repeat_interleave(UPP, 1), 1) % 1
+    return torch.sin(phase * 2 * torch.pi) * sine_gen.sine_amp
+
+
+@pytest.mark.parametrize("harmonic_num", [0, 8])
+def test_sine_gen_phase_no_less_accurate_than_legacy(harmonic_num):
+    t = torch.arange(10 * SR // UPP) / (SR / UPP)
+    # Fully voiced glides, so the excitation has no noise component to compare.
+    f0 = (200 + 150 * torch.sin(2 * torch.pi * 0.2 * t)).unsqueeze(0)
+    sine_gen = SineGen(SR, harmonic_num=harmonic_num, noise_std=0)
+    expected = exact_sine(sine_gen, f0)
+
+    with torch.no_grad():
+        torch.manual_seed(0)
+        legacy = legacy_sine_gen(sine_gen, f0, UPP)
+        torch.manual_seed(0)
+        result = sine_gen(f0, UPP)[0]
+
+    legacy_error = (legacy - expected).abs().max().item()
+    assert (result - expected).abs().max().item() <= max(legacy_error, 1e-4)
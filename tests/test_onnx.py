@@ -0,0 +1,43 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("onnxruntime")
+
+from rvc.infer.infer import VoiceConverter
+from rvc.infer.onnx_backend import OnnxEmbedder
+from rvc.lib.tools.benchmark import convert_clips, load_voice
+from rvc.lib.utils import load_audio, load_embedding
+
+
+@pytest.mark.parametrize("output_layer", [9, 12])
+def test_onnx_embedder_matches_torch(output_layer, reference_voice):
+    _, audio_paths = reference_voice
+    hubert = load_embedding("contentvec", None)[0][0].float().eval()
+    embedder = OnnxEmbedder(
+        VoiceConverter.embedder_onnx_base("contentvec", None), lambda: hubert, "cpu"
+    )
+    source = torch.from_numpy(load_audio(audio_paths[0], 16000)).float().view(1, -1)
+
+    with torch.no_grad():
+        expected = hubert.extract_features(
+            source=source, padding_mask=None, output_layer=output_layer
+        )[0]
+    result = embedder.extract_features(source, output_layer=output_layer)[0]
+
+    assert (result - expected).abs().max().item() <= 1e-3
+
+
+def test_onnx_inference_matches_torch(reference_voice, mel_distance):
+    model_path, audio_paths = reference_voice
+    converter = VoiceConverter()
+    clips = [load_audio(path, 16000) for path in audio_paths]
+    converter.configure(backend="torch")
+    load_voice(converter, model_path)
+    references = convert_clips(converter, clips)
+
+    converter.configure(backend="onnx")
+    load_voice(converter, model_path)
+    outputs = convert_clips(converter, clips)
+
+    for reference, output in zip(references, outputs):
+        assert mel_distance(reference, output, converter.tgt_sr) <= 1.0
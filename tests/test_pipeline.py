@@ -0,0 +1,106 @@
+import types
+
+import numpy as np
+import pytest
+from scipy import signal
+
+torch = pytest.importorskip("torch")
+
+from rvc.infer.pipeline import AudioProcessor, Pipeline, ah, bh
+from rvc.lib.tools.benchmark import (
+    legacy_autotune,
+    legacy_change_rms,
+    legacy_split_points,
+)
+
+
+@pytest.fixture(scope="module")
+def hubert():
+    # A small randomly initialized HuBERT with the GroupNorm front-end of the real embedders.
+    pytest.importorskip("fairseq")
+    from fairseq.data import Dictionary
+    from fairseq.models.hubert.hubert import HubertConfig, HubertModel
+    from fairseq.tasks.hubert_pretraining import HubertPretrainingConfig
+
+    torch.manual_seed(0)
+    cfg = HubertConfig(
+        extractor_mode="default",
+        conv_feature_layers="[(32, 10, 5)] + [(32, 3, 2)] * 4 + [(32, 2, 2)] * 2",
+        encoder_layers=12,
+        encoder_embed_dim=64,
+        encoder_ffn_embed_dim=128,
+        encoder_attention_heads=2,
+        final_dim=16,
+    )
+    task_cfg = HubertPretrainingConfig(label_rate=50, sample_rate=16000)
+    return HubertModel(cfg, task_cfg, [Dictionary()]).eval()
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    config = types.SimpleNamespace(
+        x_pad=1,
+        x_query=6,
+        x_center=38,
+        x_max=41,
+        is_half=False,
+        device="cpu",
+        cpu_precision="fp32",
+        rmvpe_options={},
+    )
+    return Pipeline(40000, config)
+
+
+@pytest.mark.parametrize("version", ["v1", "v2"])
+def test_embed_batch_matches_embed_for_padded_inputs(pipeline, hubert, version):
+    rng = np.random.default_rng(0)
+    audios = [
+        rng.standard_normal(length).astype(np.float32) * 0.1
+        for length in (8000, 6400, 8000, 4800)
+    ]
+
+    with torch.no_grad():
+        feats, n_frames = pipeline.embed_batch(hubert, audios, version)
+        expected = [pipeline.embed(hubert, audio0, version)[0] for audio0 in audios]
+
+    for i, single in enumerate(expected):
+        assert n_frames[i] == single.shape[0]
+        np.testing.assert_allclose(
+            feats[i, : n_frames[i]].numpy(), single.numpy(), atol=1e-4
+        )
+        assert not feats[i, n_frames[i] :].any()
+
+
+def test_autotune_matches_nearest_note_search(pipeline):
+    f0 = np.random.default_rng(0).uniform(0, 1100, 3000)
+    f0[::7] = 0
+
+    result = pipeline.autotune.autotune_f0(f0)
+
+    np.testing.assert_array_equal(
+        result, legacy_autotune(pipeline.autotune.note_dict, f0)
+    )
+
+
+def test_split_points_match_shifted_sums():
+    segments = types.SimpleNamespace(
+        window=160, t_max=16000 * 5, t_center=16000 * 4, t_query=16000
+    )
+    audio = np.random.default_rng(0).standard_normal(30 * 16000)
+    audio = signal.filtfilt(bh, ah, audio)
+
+    result = Pipeline.split_points(segments, audio)
+
+    assert result == legacy_split_points(segments, audio)
+
+
+def test_change_rms_matches_interpolated_envelopes():
+    pytest.importorskip("librosa")
+    rng = np.random.default_rng(0)
+    source_audio = rng.standard_normal(20 * 16000) * 0.3
+    target_audio = (rng.standard_normal(20 * 40000) * 0.3).astype(np.float32)
+
+    result = AudioProcessor.change_rms(source_audio, 16000, target_audio, 40000, 0.25)
+
+    expected = legacy_change_rms(source_audio, target_audio, 0.25)
+    np.testing.assert_allclose(result, expected, rtol=1e-4, atol=1e-5)
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+pytest.importorskip("noisereduce")
+pytest.importorskip("librosa")
+
+import soundfile as sf
+
+from rvc.infer.postprocess import post_process_audio
+from rvc.lib.tools.benchmark import legacy_post_process, noisy_tone
+
+
+def test_single_pass_matches_wav_round_trips(tmp_path, mel_distance):
+    audio = noisy_tone(10, 40000)
+
+    legacy_path = legacy_post_process(
+        audio, 40000, os.path.join(tmp_path, "legacy.wav"), "FLAC"
+    )
+    path = post_process_audio(
+        audio, 40000, os.path.join(tmp_path, "output.flac"), True, 0.7, "FLAC"
+    )
+
+    reference, reference_sr = sf.read(legacy_path, dtype="int16")
+    output, sr = sf.read(path, dtype="int16")
+    assert sr == reference_sr
+    assert mel_distance(reference, output, sr) <= 1.0
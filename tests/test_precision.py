@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("torch")
+
+from rvc.infer.infer import VoiceConverter
+from rvc.infer.precision import bf16_supported
+from rvc.lib.tools.benchmark import convert_clips, load_voice
+from rvc.lib.utils import load_audio
+
+
+def precisions():
+    return ["int8"] + (["bf16"] if bf16_supported() else [])
+
+
+@pytest.mark.parametrize("precision", precisions())
+def test_cpu_precision_matches_fp32(precision, reference_voice, mel_distance):
+    model_path, audio_paths = reference_voice
+    converter = VoiceConverter()
+    if converter.config.device != "cpu":
+        pytest.skip("CPU precisions only apply when inference runs on the CPU")
+    clips = [load_audio(path, 16000) for path in audio_paths]
+    converter.configure(cpu_precision="fp32")
+    load_voice(converter, model_path)
+    references = convert_clips(converter, clips)
+
+    converter.configure(cpu_precision=precision)
+    load_voice(converter, model_path)
+    outputs = convert_clips(converter, clips)
+
+    for reference, output in zip(references, outputs):
+        assert mel_distance(reference, output, converter.tgt_sr) <= 1.0
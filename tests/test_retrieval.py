@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from rvc.infer.index_cache import IndexCache
+from rvc.infer.retrieval import ExactSearch, IndexEmbeddings, blend_neighbors
+from rvc.lib.tools.benchmark import legacy_blend
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    rng = np.random.default_rng(0)
+    big_npy = rng.standard_normal((2000, 32)).astype(np.float32)
+    index = faiss.index_factory(32, "IVF16,Flat")
+    index.train(big_npy)
+    index.add(big_npy)
+    path = str(tmp_path / "voice.index")
+    faiss.write_index(index, path)
+    return path
+
+
+def test_exact_search_matches_flat_index():
+    rng = np.random.default_rng(1)
+    big_npy = rng.standard_normal((3000, 32)).astype(np.float32)
+    queries = rng.standard_normal((200, 32)).astype(np.float32)
+    flat = faiss.IndexFlatL2(32)
+    flat.add(big_npy)
+    expected_score, expected_ix = flat.search(queries, 8)
+    score, ix = ExactSearch(big_npy, block_elements=1 << 16).search(queries, 8)
+    np.testing.assert_array_equal(ix, expected_ix)
+    np.testing.assert_allclose(score, expected_score, rtol=1e-4, atol=1e-3)
+
+
+def test_mmap_embeddings_blend_like_reconstructed(index_path):
+    index, big_npy = IndexCache().get(index_path)
+    mapped_index, embeddings = IndexCache(mmap=True).get(index_path)
+    assert isinstance(embeddings, IndexEmbeddings)
+
+    queries = big_npy[:100] + 0.01
+    score, ix = index.search(queries, 8)
+    expected = blend_neighbors(big_npy, score, ix)
+    np.testing.assert_allclose(blend_neighbors(embeddings, score, ix), expected)
+
+
+def test_blend_matches_gathered_weights():
+    rng = np.random.default_rng(2)
+    big_npy = rng.standard_normal((500, 32)).astype(np.float32)
+    score = rng.uniform(0.1, 2, (300, 8)).astype(np.float32)
+    ix = rng.integers(0, 500, (300, 8))
+
+    result = blend_neighbors(big_npy, score, ix)
+
+    np.testing.assert_allclose(
+        result, legacy_blend(big_npy, score, ix), rtol=1e-5, atol=1e-6
+    )
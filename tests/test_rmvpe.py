@@ -0,0 +1,82 @@
+import os
+import types
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("librosa")
+
+from rvc.lib.predictors.RMVPE import E2E, N_CLASS, RMVPE0Predictor
+from rvc.lib.tools.benchmark import legacy_local_average_cents
+
+RMVPE_PATH = os.path.join(
+    os.path.dirname(__file__), os.pardir, "rvc", "models", "predictors", "rmvpe.pt"
+)
+HOP = 160
+
+
+def sweep(n_frames):
+    t = np.arange((n_frames - 1) * HOP) / 16000
+    f0 = 150 + 50 * np.sin(2 * np.pi * 0.5 * t)
+    return (0.5 * np.sin(2 * np.pi * np.cumsum(f0) / 16000)).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def random_model_path(tmp_path_factory):
+    torch.manual_seed(0)
+    path = str(tmp_path_factory.mktemp("rmvpe") / "rmvpe.pt")
+    torch.save(E2E(4, 1, (2, 2)).state_dict(), path)
+    return path
+
+
+@pytest.mark.parametrize("overlap", [1, 8])
+@pytest.mark.parametrize("extra_frames", [1, 2, 3])
+def test_chunked_short_last_chunk(random_model_path, overlap, extra_frames):
+    rmvpe = RMVPE0Predictor(
+        random_model_path,
+        is_half=False,
+        device="cpu",
+        max_frames=None,
+        chunk_frames=64,
+        overlap_frames=overlap,
+    )
+    # Just past the end of the second chunk.
+    audio = sweep(2 * 64 - overlap + extra_frames)
+
+    expected = rmvpe.infer_from_audio(audio)
+    result = rmvpe.infer_from_audio_chunked(audio)
+
+    assert result.shape == expected.shape
+
+
+@pytest.mark.skipif(not os.path.isfile(RMVPE_PATH), reason="RMVPE weights not found")
+@pytest.mark.parametrize("extra_frames", [1, 5])
+def test_chunked_matches_unchunked(extra_frames):
+    rmvpe = RMVPE0Predictor(
+        RMVPE_PATH, is_half=False, device="cpu", max_frames=None, chunk_frames=1024
+    )
+    audio = sweep(2 * 1024 - rmvpe.overlap_frames + extra_frames)
+
+    expected = rmvpe.infer_from_audio(audio)
+    result = rmvpe.infer_from_audio_chunked(audio)
+
+    voiced = (expected > 0) & (result > 0)
+    assert result.shape == expected.shape
+    assert np.mean((expected > 0) == (result > 0)) > 0.99
+    np.testing.assert_allclose(result[voiced], expected[voiced], rtol=0.01)
+
+
+def test_decoding_matches_per_frame_windows():
+    cents_mapping = np.pad(20 * np.arange(N_CLASS) + 1997.3794084376191, (4, 4))
+    predictor = types.SimpleNamespace(cents_mapping=cents_mapping)
+    salience = np.random.default_rng(0).random((2000, N_CLASS), np.float32) ** 8
+    expected = legacy_local_average_cents(salience, cents_mapping)
+    expected_f0 = 10 * (2 ** (expected / 1200))
+    expected_f0[expected_f0 == 10] = 0
+
+    cents = RMVPE0Predictor.to_local_average_cents(predictor, salience, 0.03)
+    f0 = RMVPE0Predictor.decode_torch(predictor, torch.from_numpy(salience), 0.03)
+
+    np.testing.assert_array_equal(cents, expected)
+    np.testing.assert_allclose(f0, expected_f0, rtol=1e-4)
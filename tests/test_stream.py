@@ -0,0 +1,33 @@
+import types
+
+import pytest
+
+pytest.importorskip("torch")
+
+from rvc.infer.stream import StreamingConverter
+
+# End-to-end latency target for live use on CPU.
+LATENCY_BUDGET = 0.3
+
+
+def converter(**kwargs):
+    vc = types.SimpleNamespace(device="cpu", window=160, sample_rate=16000)
+    return StreamingConverter(vc, None, None, 0, "v2", 40000, **kwargs)
+
+
+def test_default_latency_within_budget():
+    stream = converter()
+
+    assert stream.latency == pytest.approx(0.26)
+    assert stream.latency <= LATENCY_BUDGET
+
+
+def test_lookahead_shorter_than_crossfade_is_rejected():
+    with pytest.raises(ValueError, match="lookahead_time"):
+        converter(lookahead_time=0.02, crossfade_time=0.05)
+
+
+def test_lookahead_is_not_overridden():
+    stream = converter(lookahead_time=0.1)
+
+    assert stream.latency == pytest.approx(0.3)
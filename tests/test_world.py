@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pyworld")
+
+from rvc.lib.predictors.World import WorldF0Extractor, world_f0
+from rvc.lib.tools.benchmark import glide
+
+
+@pytest.mark.parametrize("method", ["harvest", "dio"])
+def test_windowed_f0_matches_whole_signal(method):
+    extractor = WorldF0Extractor(processes=2, chunk_seconds=2, margin_seconds=1)
+    args = (method, glide(8), 16000, 50, 1100, 10)
+
+    expected = world_f0(*args)
+    result = extractor.compute_f0(*args)
+    extractor.get_pool().shutdown()
+
+    voiced = (expected > 0) & (result > 0)
+    assert result.shape == expected.shape
+    assert np.mean((expected > 0) == (result > 0)) > 0.99
+    np.testing.assert_allclose(result[voiced], expected[voiced], rtol=1e-3)